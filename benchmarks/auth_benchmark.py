@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Auth hot-path benchmark for get_current_user / ClerkAuth.verify_clerk_token.
+
+Runs fully offline: RSA keys are generated locally and the JWKS is served by an
+in-process stand-in issuer (httpx.MockTransport), so no Clerk instance is needed.
+
+Usage:
+    python -m benchmarks.auth_benchmark
+    python -m benchmarks.auth_benchmark --workloads warm distinct --algs RS256 --iterations 5000
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Settings require these at import time; the benchmark never connects to them
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("API_PORT", "8000")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx  # noqa: E402
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import rsa  # noqa: E402
+from fastapi.security import HTTPAuthorizationCredentials  # noqa: E402
+from jose import jwk, jwt  # noqa: E402
+
+from src.config import auth as auth_module  # noqa: E402
+from src.config.auth import ClerkAuth, get_current_user  # noqa: E402
+
+
+ISSUER = "https://bench-issuer.local"
+WORKLOADS = ("cold", "warm", "rotation", "distinct")
+ALGORITHMS = ("RS256", "RS512")
+
+
+class SigningKey:
+    def __init__(self, kid: str):
+        private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.kid = kid
+        self.private_pem = private.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode()
+        public_pem = private.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        ).decode()
+        self.public_jwk = {**jwk.construct(public_pem, algorithm="RS256").to_dict(), "kid": kid, "use": "sig"}
+
+    def sign(self, alg: str, sub: str, ttl_seconds: int = 3600) -> str:
+        now = int(time.time())
+        claims = {"sub": sub, "iss": ISSUER, "iat": now, "nbf": now - 5, "exp": now + ttl_seconds}
+        return jwt.encode(claims, self.private_pem, algorithm=alg, headers={"kid": self.kid})
+
+
+class StandInIssuer:
+    """Serves /.well-known/jwks.json for the current key set and counts fetches."""
+
+    def __init__(self, keys: List[SigningKey]):
+        self.keys = list(keys)
+        self.fetches = 0
+        # One stand-in transport shared by every client of this issuer
+        self.transport = httpx.MockTransport(self.handler)
+
+    def rotate(self, new_key: SigningKey, keep_previous: bool = True) -> None:
+        self.keys = ([self.keys[-1]] if keep_previous and self.keys else []) + [new_key]
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path != "/.well-known/jwks.json":
+            return httpx.Response(404)
+        self.fetches += 1
+        return httpx.Response(200, json={"keys": [k.public_jwk for k in self.keys]})
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=self.transport)
+
+
+def new_clerk_auth(issuer: StandInIssuer) -> ClerkAuth:
+    instance = ClerkAuth(http_client=issuer.client())
+    instance.expected_issuer = ISSUER
+    instance.expected_audience = None
+    return instance
+
+
+async def call_get_current_user(token: str) -> Dict[str, Any]:
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    return await get_current_user(credentials)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+async def timed_run(
+    iterations: int,
+    concurrency: int,
+    make_call: Callable[[int], Any],
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(i: int) -> None:
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            await make_call(i)
+        except Exception:
+            errors += 1
+        latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    for offset in range(0, iterations, concurrency):
+        batch = range(offset, min(iterations, offset + concurrency))
+        await asyncio.gather(*(one(i) for i in batch))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "ops": len(latencies),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 4),
+        "ops_per_s": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 4),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 4),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 4) if latencies else 0.0,
+    }
+
+
+async def run_workload(name: str, alg: str, iterations: int, concurrency: int, distinct_tokens: int, rotate_every: int) -> Dict[str, Any]:
+    key = SigningKey("bench-key-0")
+    issuer = StandInIssuer([key])
+    clerk = new_clerk_auth(issuer)
+    auth_module.clerk_auth = clerk
+    # Every ClerkAuth the workload uses: closed afterwards, cache stats summed over all of them
+    instances = [clerk]
+
+    if name == "cold":
+        # Fresh ClerkAuth per call: JWKS fetch + key construction + RSA verify every time
+        token = key.sign(alg, "user_cold")
+        cold = [new_clerk_auth(issuer) for _ in range(iterations)]
+        instances.extend(cold)
+
+        async def call(i: int):
+            auth_module.clerk_auth = cold[i]
+            return await call_get_current_user(token)
+
+    elif name == "warm":
+        # Same bearer token over and over: the verified-token cache path
+        token = key.sign(alg, "user_warm")
+        await call_get_current_user(token)
+
+        async def call(i: int):
+            return await call_get_current_user(token)
+
+    elif name == "rotation":
+        # The issuer rotates its signing key every `rotate_every` calls; tokens use the newest kid.
+        # Rotations are far closer together than the unknown-kid rate limit allows, so lift it.
+        clerk._get_key_store(ISSUER).unknown_kid_refresh_interval = 0
+        rotations = max(1, iterations // rotate_every + 1)
+        keys = [key] + [SigningKey(f"bench-key-{n}") for n in range(1, rotations)]
+        tokens = [k.sign(alg, f"user_rot_{n}") for n, k in enumerate(keys)]
+
+        async def call(i: int):
+            generation = i // rotate_every
+            if i % rotate_every == 0 and generation > 0:
+                issuer.rotate(keys[generation])
+            return await call_get_current_user(tokens[generation])
+
+    elif name == "distinct":
+        # Many distinct users/tokens cycling through: token cache misses dominate
+        tokens = [key.sign(alg, f"user_{n}") for n in range(distinct_tokens)]
+
+        async def call(i: int):
+            return await call_get_current_user(tokens[i % len(tokens)])
+
+    else:
+        raise ValueError(f"Unknown workload: {name}")
+
+    result = await timed_run(iterations, concurrency, call)
+    hits = misses = 0
+    for instance in instances:
+        token_cache = instance.get_cache_stats()["token_cache"]
+        hits += token_cache["hits"]
+        misses += token_cache["misses"]
+        await instance.aclose()
+    return {
+        "workload": name,
+        "alg": alg,
+        **result,
+        "token_cache_hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+        "jwks_fetches": issuer.fetches,
+    }
+
+
+def print_table(rows: List[Dict[str, Any]]) -> None:
+    columns = ["workload", "alg", "ops", "errors", "ops_per_s", "p50_ms", "p99_ms", "token_cache_hit_rate", "jwks_fetches"]
+    widths = {c: max(len(c), *(len(str(r[c])) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(str(row[c]).ljust(widths[c]) for c in columns))
+
+
+async def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workloads", nargs="+", choices=WORKLOADS, default=list(WORKLOADS))
+    parser.add_argument("--algs", nargs="+", choices=ALGORITHMS, default=list(ALGORITHMS))
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--cold-iterations", type=int, default=200, help="iterations for the cold workload")
+    parser.add_argument("--concurrency", type=int, default=1, help="calls awaited together per round")
+    parser.add_argument("--distinct-tokens", type=int, default=5000)
+    parser.add_argument("--rotate-every", type=int, default=500)
+    parser.add_argument("--json", action="store_true", help="print JSON lines instead of a table")
+    args = parser.parse_args(argv)
+
+    # Per-request auth logging would dominate the measurement
+    for name in ("src.config.auth", "src.config.jwks"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    rows = []
+    for alg in args.algs:
+        for workload in args.workloads:
+            iterations = args.cold_iterations if workload == "cold" else args.iterations
+            rows.append(await run_workload(workload, alg, iterations, args.concurrency, args.distinct_tokens, args.rotate_every))
+
+    if args.json:
+        for row in rows:
+            print(json.dumps(row))
+    else:
+        print_table(rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+WebSocket broadcast fan-out benchmark for ConnectionManager.broadcast.
+
+Runs fully in-process against stand-in sockets (no server, no network): measures how
+long queuing one frame to every socket takes and how long until every responsive
+socket has been handed the frame, with a share of stalled clients that must not
+delay the rest.
+
+Usage:
+    python -m benchmarks.broadcast_benchmark
+    python -m benchmarks.broadcast_benchmark --sockets 50000 --users 10000 --stalled 0.01
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+# Settings require these at import time; the benchmark never connects to them
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("API_PORT", "8000")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from starlette.datastructures import State  # noqa: E402
+
+from src.presentation.websocket.connection_manager import ConnectionManager  # noqa: E402
+
+
+class StandInSocket:
+    def __init__(self, stalled: bool, on_receive):
+        self.state = State()
+        self.stalled = stalled
+        self.on_receive = on_receive
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_text(self, text: str) -> None:
+        if self.stalled:
+            await asyncio.Event().wait()
+        self.on_receive()
+
+    async def close(self, code: Optional[int] = None, reason: Optional[str] = None) -> None:
+        pass
+
+
+async def run(sockets: int, users: int, stalled_share: float, chunk_size: int, rounds: int) -> List[dict]:
+    manager = ConnectionManager(broadcast_chunk_size=chunk_size)
+    stalled_every = int(1 / stalled_share) if stalled_share > 0 else 0
+    received = 0
+    all_received = asyncio.Event()
+    responsive = 0
+
+    def on_receive():
+        nonlocal received
+        received += 1
+        if received >= responsive:
+            all_received.set()
+
+    for i in range(sockets):
+        stalled = bool(stalled_every) and i % stalled_every == 0
+        responsive += not stalled
+        await manager.connect(StandInSocket(stalled, on_receive), f"user{i % users}")
+
+    rows = []
+    for round_number in range(rounds):
+        received = 0
+        all_received.clear()
+        started = time.perf_counter()
+        result = await manager.broadcast({"type": "announcement", "message": "maintenance at 02:00 UTC", "round": round_number})
+        await all_received.wait()
+        rows.append({
+            "round": round_number,
+            "sockets": result.recipients,
+            "queued": result.queued,
+            "failed": result.failed,
+            "queue_ms": result.duration_ms,
+            "delivered_ms": round((time.perf_counter() - started) * 1000, 3),
+        })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sockets", type=int, default=50000)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--stalled", type=float, default=0.01, help="share of clients that never read")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="print JSON lines instead of a table")
+    args = parser.parse_args(argv)
+
+    rows = asyncio.run(run(args.sockets, args.users, args.stalled, args.chunk_size, args.rounds))
+    if args.json:
+        for row in rows:
+            print(json.dumps(row))
+        return
+    print(f"{'round':>5} {'sockets':>8} {'failed':>7} {'queue_ms':>10} {'delivered_ms':>13}")
+    for row in rows:
+        print(f"{row['round']:>5} {row['sockets']:>8} {row['failed']:>7} {row['queue_ms']:>10} {row['delivered_ms']:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,7 @@ Celery worker script for processing AI jobs
 """
 import os
 import sys
-import asyncio
 from src.infrastructure.queue.celery_queue_service import celery_app
-from src.infrastructure.database.mongodb import MongoDB
 from src.config.settings import settings
 import logging
 
@@ -14,25 +12,26 @@ import logging
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 
-async def init_database():
-    """Initialize database connection for worker"""
-    await MongoDB.ensure_connection(settings.mongodb_url, settings.database_name)
-
-
 if __name__ == '__main__':
     # Configure logging
     if settings.debug:
         logging.basicConfig(level=logging.DEBUG, format="%(asctime)s %(levelname)s %(name)s - %(message)s")
         logging.debug("[celery_worker] Debug logging configured")
 
-    # Initialize database connection
-    asyncio.run(init_database())
+    # Database connections are created per worker process at worker_process_init
+    # (see src/infrastructure/queue/worker_runtime.py), never in the parent before fork.
 
     # Prepare Celery worker argv (no explicit -Q; use app config)
+    if settings.worker_mode == "async":
+        # Threads are only concurrency slots; the jobs themselves share one event loop
+        # per process (see src/infrastructure/queue/worker_runtime.py)
+        pool_args = ["--pool", "threads", "--concurrency", str(settings.worker_async_concurrency)]
+    else:
+        pool_args = ["--pool", "prefork", "--concurrency", os.getenv("CELERY_CONCURRENCY", "1")]
     argv = [
         "worker",
         "-l", "INFO" if not settings.debug else "DEBUG",
-        "--concurrency", os.getenv("CELERY_CONCURRENCY", "1"),
+        *pool_args,
         # Explicitly bind worker to the configured queue
         "-Q", getattr(celery_app.conf, "task_default_queue", settings.celery_queue_name),
         # Fair scheduling across queues (when multiple)
@@ -43,7 +42,8 @@ if __name__ == '__main__':
     except Exception:
         configured_queues = []
     logging.info(
-        "[celery_worker] Starting Celery worker argv=%s default_queue=%s queues=%s broker=%s",
+        "[celery_worker] Starting Celery worker mode=%s argv=%s default_queue=%s queues=%s broker=%s",
+        settings.worker_mode,
         argv,
         getattr(celery_app.conf, "task_default_queue", None),
         configured_queues,
@@ -1,19 +1,30 @@
 // MongoDB initialization script
+// Indexes are also ensured by the API at startup; src/infrastructure/repositories/indexes.py is the source of truth.
 db = db.getSiblingDB('ai_backend');
 
 // Create users collection with indexes
 db.createCollection('users');
 db.users.createIndex({ "clerk_id": 1 }, { unique: true });
 db.users.createIndex({ "email": 1 }, { unique: true });
-db.users.createIndex({ "created_at": 1 });
+// Keyset pagination: (created_at, _id) descending
+db.users.createIndex({ "created_at": -1, "_id": -1 });
 
 // Create jobs collection with indexes
 db.createCollection('jobs');
 db.jobs.createIndex({ "user_id": 1 });
 db.jobs.createIndex({ "status": 1 });
 db.jobs.createIndex({ "job_type": 1 });
-db.jobs.createIndex({ "created_at": 1 });
-db.jobs.createIndex({ "user_id": 1, "created_at": -1 });
+// Keyset pagination: equality prefix + (created_at, _id) descending
+db.jobs.createIndex({ "created_at": -1, "_id": -1 });
+db.jobs.createIndex({ "user_id": 1, "created_at": -1, "_id": -1 });
+db.jobs.createIndex({ "status": 1, "created_at": -1, "_id": -1 });
+// Stale job reaper
+db.jobs.createIndex({ "status": 1, "updated_at": 1 });
+// Single active (pending/processing) job per user session, enforced on insert
+db.jobs.createIndex(
+  { "user_id": 1, "session_id": 1 },
+  { unique: true, partialFilterExpression: { "session_id": { "$type": "string" }, "status": { "$in": ["pending", "processing"] } } }
+);
 
 // Create a user for the application
 db.createUser({
@@ -7,9 +7,14 @@ from src.presentation.api.user_routes import router as user_router
 from src.presentation.api.job_routes import router as job_router
 from src.presentation.websocket.websocket_routes import router as websocket_router
 from src.infrastructure.events.redis_notification_subscriber import RedisNotificationSubscriber
+from src.infrastructure.queue.celery_queue_service import task_publisher
+from src.infrastructure.queue.queue_metrics import queue_metrics_collector
+from src.infrastructure.queue.stale_job_reaper import stale_job_reaper
+from src.infrastructure.database.redis_client import RedisClient
+from src.infrastructure.repositories.indexes import ensure_indexes, missing_constraint_indexes
 from src.config.settings import settings
 import logging
-from src.config.auth import security
+from src.config.auth import security, clerk_auth
 from fastapi.responses import JSONResponse
 import traceback
 
@@ -29,10 +34,26 @@ async def lifespan(app: FastAPI):
         logging.getLogger("uvicorn").setLevel(logging.INFO)
         logging.debug("[main.lifespan] Debug logging configured")
     await MongoDB.connect_to_mongo(settings.mongodb_url, settings.database_name)
+    # Unique indexes are invariants (one active job per session lives only in an index):
+    # refuse to serve without them rather than accept duplicate active jobs unnoticed
+    if settings.mongo_ensure_indexes:
+        await ensure_indexes(MongoDB.get_database())
+    else:
+        missing = await missing_constraint_indexes(MongoDB.get_database())
+        if missing:
+            raise RuntimeError(f"Required MongoDB unique indexes are missing: {', '.join(missing)}")
     await notification_subscriber.start()
+    await queue_metrics_collector.start()
+    if settings.reaper_enabled:
+        await stale_job_reaper.start()
     yield
     # Shutdown
     await notification_subscriber.stop()
+    await queue_metrics_collector.stop()
+    await stale_job_reaper.stop()
+    await task_publisher.stop()
+    await clerk_auth.aclose()
+    await RedisClient.close()
     await MongoDB.close_mongo_connection()
 
 
@@ -1,11 +1,28 @@
-from .user_dto import UserResponse, UserCreateRequest, UserUpdateRequest
-from .job_dto import JobCreateRequest, JobResponse, JobStatusUpdate
+from .user_dto import UserResponse, UserPageResponse, UserCreateRequest, UserUpdateRequest
+from .job_dto import (
+    JobCreateRequest,
+    JobBatchCreateRequest,
+    JobResponse,
+    JobBatchItemResult,
+    JobBatchCreateResponse,
+    JobPageResponse,
+    JobSummaryResponse,
+    JobSummaryPageResponse,
+    JobStatusUpdate,
+)
 
 __all__ = [
     "UserResponse",
+    "UserPageResponse",
     "UserCreateRequest", 
     "UserUpdateRequest",
     "JobCreateRequest",
+    "JobBatchCreateRequest",
+    "JobBatchItemResult",
+    "JobBatchCreateResponse",
     "JobResponse",
+    "JobPageResponse",
+    "JobSummaryResponse",
+    "JobSummaryPageResponse",
     "JobStatusUpdate"
 ]
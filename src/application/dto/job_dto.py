@@ -1,4 +1,4 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 from src.domain.entities import JobType, JobStatus
@@ -10,6 +10,10 @@ class JobCreateRequest(BaseModel):
     input_data: Dict[str, Any]
 
 
+class JobBatchCreateRequest(BaseModel):
+    jobs: List[JobCreateRequest]
+
+
 class JobResponse(BaseModel):
     id: str
     user_id: str
@@ -26,6 +30,44 @@ class JobResponse(BaseModel):
     completed_at: Optional[datetime] = None
 
 
+class JobBatchItemResult(BaseModel):
+    index: int
+    job: Optional[JobResponse] = None
+    error: Optional[str] = None  # "active_job_exists" | "enqueue_failed" | "create_failed"
+    detail: Optional[str] = None
+    existing_job_id: Optional[str] = None
+
+
+class JobBatchCreateResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[JobBatchItemResult]
+
+
+class JobPageResponse(BaseModel):
+    items: List[JobResponse]
+    next_cursor: Optional[str] = None
+
+
+class JobSummaryResponse(BaseModel):
+    id: str
+    user_id: str
+    session_id: str | None = None
+    job_type: JobType
+    status: JobStatus
+    artifact_url: Optional[str] = None
+    error_message: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+
+class JobSummaryPageResponse(BaseModel):
+    items: List[JobSummaryResponse]
+    next_cursor: Optional[str] = None
+
+
 class JobStatusUpdate(BaseModel):
     job_id: str
     status: JobStatus
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -13,6 +13,11 @@ class UserResponse(BaseModel):
     is_active: bool
 
 
+class UserPageResponse(BaseModel):
+    items: List[UserResponse]
+    next_cursor: Optional[str] = None
+
+
 class UserCreateRequest(BaseModel):
     clerk_id: str
     email: str
@@ -1,15 +1,9 @@
-class ActiveJobExistsError(Exception):
-    """Raised when there's already an active job for the same user session."""
-    def __init__(self, existing_job_id: str):
-        super().__init__(f"Active job already exists: {existing_job_id}")
-        self.existing_job_id = existing_job_id
-
-from typing import Optional, List
+from typing import Any, Awaitable, Callable, Dict, Optional, List, Sequence, Union
 from datetime import datetime, timezone
-from src.domain.repositories import JobRepository
-from src.domain.entities import Job, JobCreate, JobUpdate, JobStatus
-from src.domain.services import QueueService, AIService
-from src.application.dto import JobCreateRequest, JobResponse
+from src.domain.repositories import JobRepository, ActiveJobExistsError  # re-exported for the API layer
+from src.domain.entities import Job, JobSummary, JobCreate, JobUpdate, JobStatus, PageCursor, ALLOWED_PRIOR_STATUSES
+from src.domain.services import QueueService, AIService, ResultCache, JobNotifier
+from src.application.dto import JobCreateRequest, JobResponse, JobPageResponse, JobSummaryResponse, JobSummaryPageResponse
 # Removed manual event publishing - using Celery's built-in events instead
 import logging
 
@@ -19,16 +13,24 @@ class EnqueueJobError(Exception):
     pass
 
 
+# Receives partial generation events ({"progress": ..., "delta": ...}) while a job runs
+ProgressCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
 class JobUseCases:
     def __init__(
         self, 
         job_repository: JobRepository, 
         queue_service: QueueService,
-        ai_service: AIService
+        ai_service: AIService,
+        result_cache: Optional[ResultCache] = None,
+        notifier: Optional[JobNotifier] = None
     ):
         self.job_repository = job_repository
         self.queue_service = queue_service
         self.ai_service = ai_service
+        self.result_cache = result_cache
+        self.notifier = notifier
         self.logger = logging.getLogger(__name__)
 
     async def create_job(self, user_id: str, job_request: JobCreateRequest) -> JobResponse:
@@ -38,39 +40,41 @@ class JobUseCases:
             job_request.job_type,
             list(job_request.input_data.keys()) if job_request.input_data else [],
         )
-        # Enforce single active job per session if session_id is provided
-        session_id = getattr(job_request, "session_id", None)
-        if session_id:
-            existing = await self.job_repository.get_active_by_user_session(user_id, session_id)
-            if existing:
-                self.logger.debug(
-                    "[JobUseCases.create_job] active job exists user_id=%s session_id=%s job_id=%s",
-                    user_id,
-                    session_id,
-                    str(existing.id),
-                )
-                raise ActiveJobExistsError(str(existing.id))
         job_data = JobCreate(
             user_id=user_id,
-            session_id=session_id,
+            session_id=job_request.session_id,
             job_type=job_request.job_type,
             input_data=job_request.input_data
         )
         
+        # Single active job per session is enforced by the insert (raises ActiveJobExistsError);
+        # it runs first so a conflict costs no cache lookup and is not counted as one
         job = await self.job_repository.create(job_data)
         self.logger.debug("[JobUseCases.create_job] created job id=%s", str(job.id))
 
+        cached = await self._cached_result(job_request.job_type, job_request.input_data)
+        if cached is not None:
+            # Identical request already answered: complete now, no queue or AI call
+            now = datetime.now(timezone.utc)
+            completed = await self.job_repository.update(
+                str(job.id),
+                JobUpdate(
+                    status=JobStatus.COMPLETED,
+                    output_data=cached.get("output_data"),
+                    artifact_url=cached.get("artifact_url"),
+                    started_at=now,
+                    completed_at=now
+                ),
+                expected_statuses=(JobStatus.PENDING,),
+            )
+            if completed:
+                self.logger.debug("[JobUseCases.create_job] completed from result cache job_id=%s", str(job.id))
+                # Same COMPLETED event (sockets, event log) a worker would have sent
+                await self._notify(completed)
+                return self._to_response(completed)
+
         # Enqueue job for processing - include user_id and session_id for event monitoring
-        enqueue_ok = await self.queue_service.enqueue_job(
-            str(job.id), 
-            {
-                "job_id": str(job.id),
-                "job_type": job.job_type.value,
-                "input_data": job.input_data,
-                "user_id": user_id,
-                "session_id": session_id
-            }
-        )
+        enqueue_ok = await self.queue_service.enqueue_job(str(job.id), self._queue_payload(job))
         self.logger.debug("[JobUseCases.create_job] enqueue_ok=%s job_id=%s", enqueue_ok, str(job.id))
         if not enqueue_ok:
             # Mark job as failed and raise a domain error so the API returns a non-201 status
@@ -81,25 +85,88 @@ class JobUseCases:
                     status=JobStatus.FAILED,
                     error_message="Failed to enqueue job for processing"
                 ),
+                expected_statuses=ALLOWED_PRIOR_STATUSES[JobStatus.FAILED],
             )
             raise EnqueueJobError(f"Failed to enqueue job {str(job.id)}")
         
         return self._to_response(job)
 
+    async def create_jobs(
+        self, user_id: str, job_requests: Sequence[JobCreateRequest]
+    ) -> List[Union[JobResponse, Exception]]:
+        """Create and enqueue several jobs with one insert and one batched publish.
+
+        Returns, per request and in order, the created job or the error that stopped
+        it (ActiveJobExistsError, EnqueueJobError, or the insert error); other items
+        are unaffected. Session conflicts, including two items for the same session,
+        are resolved by the insert itself.
+        """
+        self.logger.debug("[JobUseCases.create_jobs] user_id=%s count=%s", user_id, len(job_requests))
+        results: List[Optional[Union[JobResponse, Exception]]] = [None] * len(job_requests)
+
+        created = await self.job_repository.create_many([
+            JobCreate(
+                user_id=user_id,
+                session_id=request.session_id,
+                job_type=request.job_type,
+                input_data=request.input_data
+            )
+            for request in job_requests
+        ])
+        jobs: Dict[int, Job] = {}
+        for index, outcome in enumerate(created):
+            if isinstance(outcome, Exception):
+                results[index] = outcome
+            else:
+                jobs[index] = outcome
+
+        enqueued = await self.queue_service.enqueue_jobs(
+            [(str(job.id), self._queue_payload(job)) for job in jobs.values()]
+        )
+        for (index, job), enqueue_ok in zip(jobs.items(), enqueued):
+            if enqueue_ok:
+                results[index] = self._to_response(job)
+                continue
+            self.logger.error("[JobUseCases.create_jobs] failed to enqueue job id=%s", str(job.id))
+            await self.job_repository.update(
+                str(job.id),
+                JobUpdate(status=JobStatus.FAILED, error_message="Failed to enqueue job for processing"),
+                expected_statuses=ALLOWED_PRIOR_STATUSES[JobStatus.FAILED],
+            )
+            results[index] = EnqueueJobError(f"Failed to enqueue job {str(job.id)}")
+
+        self.logger.debug(
+            "[JobUseCases.create_jobs] user_id=%s created=%s failed=%s",
+            user_id,
+            sum(isinstance(r, JobResponse) for r in results),
+            sum(not isinstance(r, JobResponse) for r in results),
+        )
+        return results
+
     async def get_job_by_id(self, job_id: str) -> Optional[JobResponse]:
         self.logger.debug("[JobUseCases.get_job_by_id] job_id=%s", job_id)
         job = await self.job_repository.get_by_id(job_id)
         return self._to_response(job) if job else None
 
-    async def get_user_jobs(self, user_id: str, skip: int = 0, limit: int = 100) -> List[JobResponse]:
-        self.logger.debug("[JobUseCases.get_user_jobs] user_id=%s skip=%s limit=%s", user_id, skip, limit)
-        jobs = await self.job_repository.get_by_user_id(user_id, skip, limit)
-        return [self._to_response(job) for job in jobs]
+    async def get_user_jobs(self, user_id: str, limit: int = 100, cursor: Optional[str] = None) -> JobPageResponse:
+        """Raises InvalidCursorError for a malformed cursor token."""
+        self.logger.debug("[JobUseCases.get_user_jobs] user_id=%s limit=%s has_cursor=%s", user_id, limit, bool(cursor))
+        page = await self.job_repository.get_by_user_id(user_id, limit, PageCursor.decode(cursor) if cursor else None)
+        return JobPageResponse(items=[self._to_response(job) for job in page.items], next_cursor=page.next_cursor)
 
-    async def get_jobs_by_status(self, status: JobStatus, skip: int = 0, limit: int = 100) -> List[JobResponse]:
-        self.logger.debug("[JobUseCases.get_jobs_by_status] status=%s skip=%s limit=%s", status, skip, limit)
-        jobs = await self.job_repository.get_by_status(status, skip, limit)
-        return [self._to_response(job) for job in jobs]
+    async def get_user_job_summaries(
+        self, user_id: str, limit: int = 100, cursor: Optional[str] = None
+    ) -> JobSummaryPageResponse:
+        """Like get_user_jobs without input/output payloads. Raises InvalidCursorError for a malformed cursor token."""
+        self.logger.debug("[JobUseCases.get_user_job_summaries] user_id=%s limit=%s has_cursor=%s", user_id, limit, bool(cursor))
+        page = await self.job_repository.get_summaries_by_user_id(user_id, limit, PageCursor.decode(cursor) if cursor else None)
+        return JobSummaryPageResponse(items=[self._to_summary_response(job) for job in page.items], next_cursor=page.next_cursor)
+
+    async def get_jobs_by_status(self, status: JobStatus, limit: int = 100, cursor: Optional[str] = None) -> JobPageResponse:
+        """Raises InvalidCursorError for a malformed cursor token."""
+        self.logger.debug("[JobUseCases.get_jobs_by_status] status=%s limit=%s has_cursor=%s", status, limit, bool(cursor))
+        page = await self.job_repository.get_by_status(status, limit, PageCursor.decode(cursor) if cursor else None)
+        return JobPageResponse(items=[self._to_response(job) for job in page.items], next_cursor=page.next_cursor)
 
     async def update_job_status(
         self, 
@@ -109,6 +176,22 @@ class JobUseCases:
         artifact_url: Optional[str] = None,
         error_message: Optional[str] = None
     ) -> Optional[JobResponse]:
+        """Move a job to `status` if its current status allows it (see ALLOWED_PRIOR_STATUSES).
+
+        Returns None if the job does not exist or the transition is not allowed, e.g. a
+        duplicate task delivery trying to reprocess a finished job.
+        """
+        job = await self._transition(job_id, status, output_data, artifact_url, error_message)
+        return self._to_response(job) if job else None
+
+    async def _transition(
+        self,
+        job_id: str,
+        status: JobStatus,
+        output_data: Optional[dict] = None,
+        artifact_url: Optional[str] = None,
+        error_message: Optional[str] = None
+    ) -> Optional[Job]:
         self.logger.debug(
             "[JobUseCases.update_job_status] job_id=%s status=%s has_output=%s has_artifact=%s has_error=%s",
             job_id,
@@ -129,27 +212,48 @@ class JobUseCases:
         elif status in [JobStatus.COMPLETED, JobStatus.FAILED]:
             update_data.completed_at = datetime.now(timezone.utc)
         
-        job = await self.job_repository.update(job_id, update_data)
+        job = await self.job_repository.update(
+            job_id, update_data, expected_statuses=ALLOWED_PRIOR_STATUSES.get(status)
+        )
         if job:
             self.logger.debug("[JobUseCases.update_job_status] updated job_id=%s new_status=%s", job_id, job.status)
             # Events are now automatically handled by Celery's built-in event system
-        return self._to_response(job) if job else None
+        else:
+            self.logger.debug("[JobUseCases.update_job_status] not updated (missing or transition not allowed) job_id=%s status=%s", job_id, status)
+        return job
+
+    async def process_job(self, job_id: str, on_progress: Optional[ProgressCallback] = None) -> Optional[JobResponse]:
+        """Process a job using AI service.
+
+        Claims the job with a guarded PENDING -> PROCESSING update (which also returns it),
+        so a duplicate or late delivery is a no-op; PROCESSING is announced only after a
+        successful claim, so such a delivery emits no event either. Returns the job in its final status as
+        written by this call, or None if the job was not claimed (missing, already taken)
+        or another actor finalized it first.
 
-    async def process_job(self, job_id: str) -> bool:
-        """Process a job using AI service"""
+        With `on_progress`, the AI service is streamed and every partial event is passed
+        to the callback before the final result is stored.
+        """
         self.logger.debug("[JobUseCases.process_job] start job_id=%s", job_id)
-        job = await self.job_repository.get_by_id(job_id)
+        job = await self._transition(job_id, JobStatus.PROCESSING)
         if not job:
-            self.logger.warning("[JobUseCases.process_job] job not found job_id=%s", job_id)
-            return False
+            self.logger.warning("[JobUseCases.process_job] job not found or not pending; skipping job_id=%s", job_id)
+            return None
+        await self._notify(job)
 
         try:
-            # Update status to processing
-            await self.update_job_status(job_id, JobStatus.PROCESSING)
-            
-            # Generate AI content
-            self.logger.debug("[JobUseCases.process_job] calling AI service job_type=%s", job.job_type)
-            result = await self.ai_service.generate(job.job_type, job.input_data)
+            # An identical request may have completed since this job was created
+            result = await self._cached_result(job.job_type, job.input_data)
+            if result is not None:
+                self.logger.debug("[JobUseCases.process_job] result cache hit job_id=%s", job_id)
+            else:
+                # Generate AI content
+                self.logger.debug("[JobUseCases.process_job] calling AI service job_type=%s", job.job_type)
+                if on_progress is None:
+                    result = await self.ai_service.generate(job.job_type, job.input_data)
+                else:
+                    result = await self._generate_streaming(job, on_progress)
+                await self._store_result(job, result)
             self.logger.debug(
                 "[JobUseCases.process_job] AI result received job_id=%s keys=%s",
                 job_id,
@@ -157,24 +261,93 @@ class JobUseCases:
             )
             
             # Update job with results
-            await self.update_job_status(
+            return await self.update_job_status(
                 job_id, 
                 JobStatus.COMPLETED,
                 output_data=result.get("output_data"),
                 artifact_url=result.get("artifact_url")
             )
             
-            return True
-            
         except Exception as e:
             # Update job with error
             self.logger.exception("[JobUseCases.process_job] error job_id=%s error=%s", job_id, e)
-            await self.update_job_status(
+            return await self.update_job_status(
                 job_id, 
                 JobStatus.FAILED,
                 error_message=str(e)
             )
-            return False
+
+    async def _generate_streaming(self, job: Job, on_progress: ProgressCallback) -> Dict[str, Any]:
+        result = None
+        async for event in self.ai_service.generate_stream(job.job_type, job.input_data):
+            if "result" in event:
+                result = event["result"]
+                continue
+            try:
+                await on_progress(event)
+            except Exception:
+                # Progress is best-effort; never fail the job because an update could not be sent
+                self.logger.debug("[JobUseCases._generate_streaming] progress callback failed job_id=%s", str(job.id), exc_info=True)
+        if result is None:
+            raise RuntimeError("AI stream ended without a result")
+        return result
+
+    async def _notify(self, job: Job, message: Optional[str] = None) -> None:
+        if self.notifier is None:
+            return
+        try:
+            await self.notifier.notify_job_status(
+                user_id=job.user_id,
+                job_id=str(job.id),
+                status=job.status.value.upper(),
+                session_id=job.session_id,
+                message=message,
+            )
+        except Exception:
+            # Clients resync from the API; a notification outage must never fail a job
+            self.logger.warning("[JobUseCases._notify] failed job_id=%s status=%s", str(job.id), job.status, exc_info=True)
+
+    async def _cached_result(self, job_type, input_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if self.result_cache is None:
+            return None
+        try:
+            return await self.result_cache.get(job_type, input_data)
+        except Exception:
+            # A cache outage must never fail a job; fall back to the AI service
+            self.logger.debug("[JobUseCases._cached_result] lookup failed job_type=%s", job_type, exc_info=True)
+            return None
+
+    async def _store_result(self, job: Job, result: Dict[str, Any]) -> None:
+        if self.result_cache is None:
+            return
+        try:
+            await self.result_cache.put(job.job_type, job.input_data, result)
+        except Exception:
+            self.logger.debug("[JobUseCases._store_result] store failed job_id=%s", str(job.id), exc_info=True)
+
+    def _queue_payload(self, job: Job) -> Dict[str, Any]:
+        return {
+            "job_id": str(job.id),
+            "job_type": job.job_type.value,
+            "input_data": job.input_data,
+            "user_id": job.user_id,
+            "session_id": job.session_id
+        }
+
+    def _to_summary_response(self, job: JobSummary) -> JobSummaryResponse:
+        return JobSummaryResponse(
+            id=str(job.id),
+            user_id=job.user_id,
+            session_id=job.session_id,
+            job_type=job.job_type,
+            status=job.status,
+            artifact_url=job.artifact_url,
+            error_message=job.error_message,
+            created_at=job.created_at,
+            updated_at=job.updated_at,
+            started_at=job.started_at,
+            completed_at=job.completed_at
+        )
 
     def _to_response(self, job: Job) -> JobResponse:
         return JobResponse(
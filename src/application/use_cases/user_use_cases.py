@@ -1,7 +1,7 @@
 from typing import Optional, List
 from src.domain.repositories import UserRepository
-from src.domain.entities import User, UserCreate, UserUpdate
-from src.application.dto import UserResponse, UserCreateRequest, UserUpdateRequest
+from src.domain.entities import User, UserCreate, UserUpdate, PageCursor
+from src.application.dto import UserResponse, UserPageResponse, UserCreateRequest, UserUpdateRequest
 
 
 class UserUseCases:
@@ -41,9 +41,10 @@ class UserUseCases:
         user = await self.user_repository.update(user_id, user_data)
         return self._to_response(user) if user else None
 
-    async def list_users(self, skip: int = 0, limit: int = 100) -> List[UserResponse]:
-        users = await self.user_repository.list_users(skip, limit)
-        return [self._to_response(user) for user in users]
+    async def list_users(self, limit: int = 100, cursor: Optional[str] = None) -> UserPageResponse:
+        """Raises InvalidCursorError for a malformed cursor token."""
+        page = await self.user_repository.list_users(limit, PageCursor.decode(cursor) if cursor else None)
+        return UserPageResponse(items=[self._to_response(user) for user in page.items], next_cursor=page.next_cursor)
 
     def _to_response(self, user: User) -> UserResponse:
         return UserResponse(
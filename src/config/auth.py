@@ -1,10 +1,13 @@
 from fastapi import HTTPException, Depends, Security, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt, jwk
+from jose import JWTError, jwt
 from jose.utils import base64url_decode
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+from collections import OrderedDict
+import hashlib
 import httpx
 from .settings import settings
+from .jwks import JWKSKeyStore
 import logging
 import time
 
@@ -31,52 +34,159 @@ logger.propagate = False
 security = HTTPBearer(auto_error=False)
 
 
+class VerifiedTokenCache:
+    """Bounded LRU of already-verified tokens: { sha256(token): (claims, expires_at) }.
+
+    Entries expire at the token's `exp` (capped by `max_ttl_seconds`), so a hit can
+    return the claims without re-parsing the JWT or re-checking the RSA signature.
+    """
+
+    def __init__(self, max_size: int, max_ttl_seconds: int):
+        self.max_size = max_size
+        self.max_ttl_seconds = max_ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        # Never keep raw bearer tokens in memory longer than the request needs them
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        if self.max_size <= 0:
+            return None
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        claims, expires_at = entry
+        if time.time() >= expires_at:
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        # Hand out a copy so callers can't mutate the cached claims
+        return dict(claims)
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        if self.max_size <= 0:
+            return
+        now = time.time()
+        expires_at = now + self.max_ttl_seconds
+        exp = claims.get("exp")
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        if expires_at <= now:
+            return
+        key = self._key(token)
+        self._entries[key] = (dict(claims), expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+        }
+
+
 class ClerkAuth:
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
         self.clerk_secret_key = settings.clerk_secret_key
         # Optional overrides from settings; if unset, derive from token claims
         self.expected_issuer: Optional[str] = getattr(settings, "clerk_issuer", None)
         self.expected_audience: Optional[str] = getattr(settings, "clerk_audience", None)
-        # Simple in-memory JWKS cache: { issuer: {"keys": [...], "ts": epoch_seconds} }
-        self._jwks_cache: Dict[str, Dict[str, Any]] = {}
-        self._jwks_ttl_seconds: int = 600
+        # Parsed public keys per issuer: { issuer: JWKSKeyStore }
+        self._key_stores: Dict[str, JWKSKeyStore] = {}
+        # Pooled HTTP client for JWKS fetches (created lazily on the running loop)
+        self._http_client: Optional[httpx.AsyncClient] = http_client
+        # Verified-token cache so repeat requests with the same bearer token skip RSA verification
+        self.token_cache = VerifiedTokenCache(
+            max_size=settings.auth_token_cache_size,
+            max_ttl_seconds=settings.auth_token_cache_max_ttl_seconds,
+        )
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the verification caches."""
+        return {
+            "token_cache": self.token_cache.stats(),
+            "jwks": {issuer: store.stats() for issuer, store in self._key_stores.items()},
+        }
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                timeout=5.0,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+            )
+        return self._http_client
+
+    def _get_key_store(self, issuer: str) -> JWKSKeyStore:
+        store = self._key_stores.get(issuer)
+        if store is None:
+            store = JWKSKeyStore(
+                issuer,
+                self._fetch_jwks,
+                ttl_seconds=settings.jwks_ttl_seconds,
+                refresh_ahead_seconds=settings.jwks_refresh_ahead_seconds,
+                max_stale_seconds=settings.jwks_max_stale_seconds,
+                unknown_kid_refresh_interval=settings.jwks_unknown_kid_refresh_interval_seconds,
+            )
+            self._key_stores[issuer] = store
+        return store
+
+    async def aclose(self) -> None:
+        """Cancel in-flight JWKS refreshes and close the pooled HTTP client."""
+        for store in self._key_stores.values():
+            await store.close()
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
 
     async def _fetch_jwks(self, issuer: str) -> Dict[str, Any]:
         """Fetch JWKS from issuer's well-known endpoint."""
         jwks_url = issuer.rstrip("/") + "/.well-known/jwks.json"
         logger.debug("[ClerkAuth._fetch_jwks] Fetching JWKS | url=%s", jwks_url)
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(jwks_url, timeout=5.0)
-            if resp.status_code != 200:
-                logger.warning(
-                    "[ClerkAuth._fetch_jwks] Failed to fetch JWKS | status=%s body=%s",
-                    resp.status_code,
-                    resp.text,
-                )
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Unable to fetch JWKS for issuer",
-                )
-            return resp.json()
-
-    async def _get_jwks(self, issuer: str) -> Dict[str, Any]:
-        now = int(time.time())
-        cached = self._jwks_cache.get(issuer)
-        if cached and (now - cached.get("ts", 0) < self._jwks_ttl_seconds):
-            return cached["jwks"]
-        jwks = await self._fetch_jwks(issuer)
-        self._jwks_cache[issuer] = {"jwks": jwks, "ts": now}
-        return jwks
+        resp = await self._get_http_client().get(jwks_url, timeout=5.0)
+        if resp.status_code != 200:
+            logger.warning(
+                "[ClerkAuth._fetch_jwks] Failed to fetch JWKS | status=%s body=%s",
+                resp.status_code,
+                resp.text,
+            )
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Unable to fetch JWKS for issuer",
+            )
+        return resp.json()
 
     async def verify_clerk_token(self, token: str) -> dict:
         """Verify Clerk JWT token locally using JWKS (no network call to Clerk per request).
 
         - Extract unverified header/claims to determine issuer and key id (kid)
-        - Fetch and cache JWKS from issuer
-        - Verify signature with matching JWK
+        - Look up the parsed public key for kid in the issuer's key store
+        - Verify signature with matching key
         - Validate exp/nbf and issuer; optionally validate audience if configured
         - Return a user dict with at least 'user_id' (mapped from 'sub')
+
+        Successfully verified tokens are cached until their `exp`; a cache hit skips
+        straight to the claims dict.
         """
+        if token:
+            cached = self.token_cache.get(token)
+            if cached is not None:
+                return cached
         try:
             logger.debug(
                 "[ClerkAuth.verify_clerk_token] Start | token_present=%s token_prefix=%s",
@@ -108,24 +218,14 @@ class ClerkAuth:
                 logger.warning("[ClerkAuth.verify_clerk_token] Missing/invalid issuer: %s", issuer)
                 raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token issuer")
 
-            # Get JWKS and find the matching key
-            jwks = await self._get_jwks(issuer)
-            keys = jwks.get("keys", []) if isinstance(jwks, dict) else []
-            rsa_key = next((k for k in keys if k.get("kid") == kid), None)
-            if not rsa_key:
-                # Refresh once in case of rotation
-                logger.info("[ClerkAuth.verify_clerk_token] kid not found; refreshing JWKS")
-                jwks = await self._fetch_jwks(issuer)
-                self._jwks_cache[issuer] = {"jwks": jwks, "ts": int(time.time())}
-                keys = jwks.get("keys", []) if isinstance(jwks, dict) else []
-                rsa_key = next((k for k in keys if k.get("kid") == kid), None)
-            if not rsa_key:
+            # Find the matching key (store refreshes once, rate-limited, on unknown kid)
+            public_key = await self._get_key_store(issuer).get_key(kid, alg)
+            if public_key is None:
                 logger.warning("[ClerkAuth.verify_clerk_token] kid %s not present in JWKS", kid)
                 raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token key")
 
             # Verify signature
             try:
-                public_key = jwk.construct(rsa_key, algorithm=alg)
                 signing_input, encoded_sig = str(token).rsplit(".", 1)
                 decoded_sig = base64url_decode(encoded_sig.encode("utf-8"))
                 if not public_key.verify(signing_input.encode("utf-8"), decoded_sig):
@@ -171,6 +271,7 @@ class ClerkAuth:
                 raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token claims")
 
             user_data = {**claims, "user_id": user_id}
+            self.token_cache.put(token, user_data)
             logger.debug(
                 "[ClerkAuth.verify_clerk_token] Verification OK | user_id=%s keys=%s",
                 user_id,
@@ -190,6 +291,38 @@ class ClerkAuth:
 clerk_auth = ClerkAuth()
 
 
+async def authenticate_token(token: Optional[str]) -> dict:
+    """Verify a raw bearer token (HTTP header or WebSocket handshake) and return the user dict.
+
+    Shares the dev bypass and the cached JWKS verification path with get_current_user.
+    """
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing authentication token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    logger.debug(
+        "[authenticate_token] Received token | prefix=%s length=%s",
+        token[:12] + "...",
+        len(token),
+    )
+    # Dev auth bypass: only when DEBUG and explicitly enabled via env
+    try:
+        if settings.debug and getattr(settings, "dev_auth_bypass", False) and getattr(settings, "dev_bearer_token", None):
+            if token == settings.dev_bearer_token:
+                fake_user_id = getattr(settings, "dev_fake_user_id", None) or "dev-user"
+                logger.debug("[authenticate_token] DEV AUTH BYPASS active | user_id=%s", fake_user_id)
+                return {"user_id": fake_user_id, "provider": "dev_bypass"}
+            else:
+                logger.debug("[authenticate_token] Dev bypass enabled but token mismatch")
+    except Exception as e:
+        # Never fail auth due to bypass branch errors; proceed to normal verification
+        logger.debug("[authenticate_token] Dev bypass check error: %s", e)
+
+    return await clerk_auth.verify_clerk_token(token)
+
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Security(security)) -> dict:
     """Get current user from Clerk token"""
     try:
@@ -201,26 +334,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Security(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        token = credentials.credentials
-        logger.debug(
-            "[get_current_user] Received token | prefix=%s length=%s",
-            (token[:12] + "...") if token else None,
-            len(token) if token else 0,
-        )
-        # Dev auth bypass: only when DEBUG and explicitly enabled via env
-        try:
-            if settings.debug and getattr(settings, "dev_auth_bypass", False) and getattr(settings, "dev_bearer_token", None):
-                if token == settings.dev_bearer_token:
-                    fake_user_id = getattr(settings, "dev_fake_user_id", None) or "dev-user"
-                    logger.debug("[get_current_user] DEV AUTH BYPASS active | user_id=%s", fake_user_id)
-                    return {"user_id": fake_user_id, "provider": "dev_bypass"}
-                else:
-                    logger.debug("[get_current_user] Dev bypass enabled but token mismatch")
-        except Exception as e:
-            # Never fail auth due to bypass branch errors; proceed to normal verification
-            logger.debug("[get_current_user] Dev bypass check error: %s", e)
-
-        user_data = await clerk_auth.verify_clerk_token(token)
+        user_data = await authenticate_token(credentials.credentials)
         logger.debug(
             "[get_current_user] Verified user | keys=%s",
             list(user_data.keys()) if isinstance(user_data, dict) else type(user_data).__name__,
@@ -0,0 +1,163 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from jose import jwk
+
+
+logger = logging.getLogger(__name__)
+
+
+class JWKSKeyStore:
+    """Per-issuer store of ready-to-use public keys, indexed by `kid`.
+
+    - Refreshes are single-flight: concurrent callers share one in-flight fetch
+    - Keys are refreshed in the background shortly before the TTL runs out, while
+      the current (possibly stale) keys keep being served
+    - Each unknown `kid` forces at most one refresh per `unknown_kid_refresh_interval`,
+      so a bogus kid cannot use up the refresh a newly rotated key needs; all unknown
+      kids together force at most `unknown_kid_refresh_burst` refreshes per interval
+    """
+
+    def __init__(
+        self,
+        issuer: str,
+        fetch_jwks: Callable[[str], Awaitable[Dict[str, Any]]],
+        ttl_seconds: int = 600,
+        refresh_ahead_seconds: int = 60,
+        max_stale_seconds: int = 3600,
+        unknown_kid_refresh_interval: int = 30,
+        retry_interval_seconds: int = 10,
+        unknown_kid_refresh_burst: int = 5,
+        max_tracked_unknown_kids: int = 1024,
+    ):
+        self.issuer = issuer
+        self._fetch_jwks = fetch_jwks
+        self.ttl_seconds = ttl_seconds
+        self.refresh_ahead_seconds = refresh_ahead_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self.unknown_kid_refresh_interval = unknown_kid_refresh_interval
+        self.retry_interval_seconds = retry_interval_seconds
+        self.unknown_kid_refresh_burst = unknown_kid_refresh_burst
+        self.max_tracked_unknown_kids = max_tracked_unknown_kids
+
+        # Raw JWK dicts by kid; constructed key objects by (kid, alg), built on first use
+        self._jwks_by_kid: Dict[str, Dict[str, Any]] = {}
+        self._keys: Dict[Tuple[str, str], Any] = {}
+        self._fetched_at: float = 0.0
+        self._next_background_attempt: float = 0.0
+        # Last forced refresh per unknown kid (oldest first, bounded) and of all of them
+        self._unknown_kid_refreshes: "OrderedDict[str, float]" = OrderedDict()
+        self._recent_unknown_kid_refreshes: Deque[float] = deque()
+        self._inflight: Optional[asyncio.Task] = None
+        self.fetch_count = 0
+
+    def _age(self) -> float:
+        return time.monotonic() - self._fetched_at
+
+    async def get_key(self, kid: str, alg: str) -> Optional[Any]:
+        """Return the public key for `kid`, or None if the issuer does not publish it."""
+        if not self._fetched_at or self._age() >= self.max_stale_seconds:
+            # Nothing usable yet (or far too old to trust): wait for the shared refresh
+            await self.refresh()
+        elif self._age() >= self.ttl_seconds - self.refresh_ahead_seconds:
+            self._refresh_in_background()
+
+        key = self._construct(kid, alg)
+        if key is not None:
+            return key
+
+        if not self._allow_unknown_kid_refresh(kid):
+            logger.debug("[JWKSKeyStore.get_key] unknown kid=%s; refresh rate-limited", kid)
+            return None
+        logger.info("[JWKSKeyStore.get_key] kid=%s not found; refreshing JWKS | issuer=%s", kid, self.issuer)
+        await self.refresh()
+        return self._construct(kid, alg)
+
+    def _allow_unknown_kid_refresh(self, kid: str) -> bool:
+        now = time.monotonic()
+        last = self._unknown_kid_refreshes.get(kid)
+        if last is not None and now - last < self.unknown_kid_refresh_interval:
+            return False
+        recent = self._recent_unknown_kid_refreshes
+        while recent and now - recent[0] >= self.unknown_kid_refresh_interval:
+            recent.popleft()
+        if len(recent) >= self.unknown_kid_refresh_burst:
+            return False
+        recent.append(now)
+        self._unknown_kid_refreshes[kid] = now
+        self._unknown_kid_refreshes.move_to_end(kid)
+        while len(self._unknown_kid_refreshes) > self.max_tracked_unknown_kids:
+            self._unknown_kid_refreshes.popitem(last=False)
+        return True
+
+    def _construct(self, kid: str, alg: str) -> Optional[Any]:
+        key = self._keys.get((kid, alg))
+        if key is not None:
+            return key
+        raw = self._jwks_by_kid.get(kid)
+        if raw is None:
+            return None
+        key = jwk.construct(raw, algorithm=alg)
+        self._keys[(kid, alg)] = key
+        return key
+
+    async def refresh(self) -> None:
+        """Fetch the JWKS, collapsing concurrent callers onto one request."""
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.create_task(self._do_refresh())
+        # Shield so a cancelled caller does not cancel the fetch other callers wait on
+        await asyncio.shield(self._inflight)
+
+    def _refresh_in_background(self) -> None:
+        if self._inflight is not None and not self._inflight.done():
+            return
+        if time.monotonic() < self._next_background_attempt:
+            return
+        self._inflight = asyncio.create_task(self._do_refresh())
+        self._inflight.add_done_callback(self._log_background_failure)
+
+    def _log_background_failure(self, task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            self._next_background_attempt = time.monotonic() + self.retry_interval_seconds
+            logger.warning(
+                "[JWKSKeyStore] background refresh failed; serving stale keys | issuer=%s error=%s",
+                self.issuer,
+                exc,
+            )
+
+    async def _do_refresh(self) -> None:
+        self.fetch_count += 1
+        jwks = await self._fetch_jwks(self.issuer)
+        keys = jwks.get("keys", []) if isinstance(jwks, dict) else []
+        by_kid = {k["kid"]: k for k in keys if isinstance(k, dict) and k.get("kid")}
+        # Keep constructed keys whose JWK is unchanged so rotation only rebuilds new keys
+        self._keys = {
+            (kid, alg): key
+            for (kid, alg), key in self._keys.items()
+            if by_kid.get(kid) == self._jwks_by_kid.get(kid)
+        }
+        self._jwks_by_kid = by_kid
+        self._fetched_at = time.monotonic()
+        logger.debug("[JWKSKeyStore._do_refresh] refreshed | issuer=%s kids=%s", self.issuer, list(by_kid.keys()))
+
+    async def close(self) -> None:
+        if self._inflight is not None and not self._inflight.done():
+            self._inflight.cancel()
+            try:
+                await self._inflight
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._inflight = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "kids": list(self._jwks_by_kid.keys()),
+            "age_seconds": round(self._age(), 3) if self._fetched_at else None,
+            "fetch_count": self.fetch_count,
+        }
@@ -1,6 +1,9 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field, AliasChoices
-from typing import Optional
+from pydantic import Field, AliasChoices, model_validator
+from typing import Literal, Optional
+
+# Headroom over one enqueue attempt for the insert and Mongo retries
+IDEMPOTENCY_PENDING_TTL_MARGIN_SECONDS = 10
 
 
 class Settings(BaseSettings):
@@ -14,9 +17,53 @@ class Settings(BaseSettings):
     # Celery time limits (seconds)
     celery_soft_time_limit: int = Field(90, validation_alias=AliasChoices("CELERY_SOFT_TIME_LIMIT", "celery_soft_time_limit"))
     celery_time_limit: int = Field(120, validation_alias=AliasChoices("CELERY_TIME_LIMIT", "celery_time_limit"))
+    celery_broker_pool_limit: int = Field(10, validation_alias=AliasChoices("CELERY_BROKER_POOL_LIMIT", "celery_broker_pool_limit"))
+    # Non-blocking enqueue from the API (buffered publisher threads)
+    enqueue_buffer_size: int = Field(1000, validation_alias=AliasChoices("ENQUEUE_BUFFER_SIZE", "enqueue_buffer_size"))
+    enqueue_batch_size: int = Field(50, validation_alias=AliasChoices("ENQUEUE_BATCH_SIZE", "enqueue_batch_size"))
+    enqueue_publisher_threads: int = Field(4, validation_alias=AliasChoices("ENQUEUE_PUBLISHER_THREADS", "enqueue_publisher_threads"))
+    enqueue_timeout_seconds: float = Field(5.0, validation_alias=AliasChoices("ENQUEUE_TIMEOUT_SECONDS", "enqueue_timeout_seconds"))
+    # Queue status snapshot (sampled in the background from Redis + worker heartbeats)
+    queue_metrics_interval_seconds: float = Field(5.0, validation_alias=AliasChoices("QUEUE_METRICS_INTERVAL_SECONDS", "queue_metrics_interval_seconds"))
+    worker_heartbeat_timeout_seconds: float = Field(10.0, validation_alias=AliasChoices("WORKER_HEARTBEAT_TIMEOUT_SECONDS", "worker_heartbeat_timeout_seconds"))
+    # Worker execution mode: "prefork" (one job per process) or "async" (many jobs per process on one loop;
+    # the threads pool does not enforce CELERY_TIME_LIMIT, only the soft limit is applied on the loop)
+    worker_mode: Literal["prefork", "async"] = Field("prefork", validation_alias=AliasChoices("WORKER_MODE", "worker_mode"))
+    worker_async_concurrency: int = Field(64, validation_alias=AliasChoices("WORKER_ASYNC_CONCURRENCY", "worker_async_concurrency"))
+    worker_job_type_limits: str = Field("", validation_alias=AliasChoices("WORKER_JOB_TYPE_LIMITS", "worker_job_type_limits"))  # e.g. "audio_generation=8,image_generation=4"
+    # AI micro-batching (async worker mode): group same-type jobs into one backend call
+    ai_batch_max_size: int = Field(16, validation_alias=AliasChoices("AI_BATCH_MAX_SIZE", "ai_batch_max_size"))  # 1 disables batching
+    ai_batch_max_wait_ms: float = Field(20.0, validation_alias=AliasChoices("AI_BATCH_MAX_WAIT_MS", "ai_batch_max_wait_ms"))
+    fake_ai_batch_latency_seconds: Optional[float] = Field(None, validation_alias=AliasChoices("FAKE_AI_BATCH_LATENCY_SECONDS", "fake_ai_batch_latency_seconds"))
+    # Streamed progress/partial output over WebSocket
+    job_stream_job_types: str = Field("text_generation,audio_generation", validation_alias=AliasChoices("JOB_STREAM_JOB_TYPES", "job_stream_job_types"))  # empty disables streaming
+    job_progress_min_interval_ms: float = Field(250.0, validation_alias=AliasChoices("JOB_PROGRESS_MIN_INTERVAL_MS", "job_progress_min_interval_ms"))
+    # Max jobs per POST /jobs/batch request
+    job_batch_max_size: int = Field(100, validation_alias=AliasChoices("JOB_BATCH_MAX_SIZE", "job_batch_max_size"))
+    # Create registered MongoDB indexes at API startup (src/infrastructure/repositories/indexes.py);
+    # either way startup fails if a unique index (e.g. one active job per session) is missing
+    mongo_ensure_indexes: bool = Field(True, validation_alias=AliasChoices("MONGO_ENSURE_INDEXES", "mongo_ensure_indexes"))
+    # GET /jobs/{id} read-through cache (terminal jobs long-lived, active jobs briefly)
+    job_cache_max_entries: int = Field(10000, validation_alias=AliasChoices("JOB_CACHE_MAX_ENTRIES", "job_cache_max_entries"))
+    job_cache_terminal_ttl_seconds: float = Field(3600.0, validation_alias=AliasChoices("JOB_CACHE_TERMINAL_TTL_SECONDS", "job_cache_terminal_ttl_seconds"))
+    job_cache_active_ttl_seconds: float = Field(2.0, validation_alias=AliasChoices("JOB_CACHE_ACTIVE_TTL_SECONDS", "job_cache_active_ttl_seconds"))  # 0 disables caching active jobs
+    job_cache_redis_enabled: bool = Field(False, validation_alias=AliasChoices("JOB_CACHE_REDIS_ENABLED", "job_cache_redis_enabled"))
+    # AI result cache by (job_type, input_data) content hash, shared via Redis
+    result_cache_job_types: str = Field("audio_generation", validation_alias=AliasChoices("RESULT_CACHE_JOB_TYPES", "result_cache_job_types"))  # empty disables the cache
+    result_cache_ttl_seconds: int = Field(86400, validation_alias=AliasChoices("RESULT_CACHE_TTL_SECONDS", "result_cache_ttl_seconds"))
+    result_cache_max_entries: int = Field(100000, validation_alias=AliasChoices("RESULT_CACHE_MAX_ENTRIES", "result_cache_max_entries"))
+    # Idempotency-Key for POST /jobs (recorded responses live in Redis)
+    idempotency_key_ttl_seconds: int = Field(86400, validation_alias=AliasChoices("IDEMPOTENCY_KEY_TTL_SECONDS", "idempotency_key_ttl_seconds"))
+    idempotency_pending_ttl_seconds: int = Field(60, validation_alias=AliasChoices("IDEMPOTENCY_PENDING_TTL_SECONDS", "idempotency_pending_ttl_seconds"))  # reservation of an in-flight request
+    idempotency_wait_seconds: float = Field(10.0, validation_alias=AliasChoices("IDEMPOTENCY_WAIT_SECONDS", "idempotency_wait_seconds"))  # duplicate waits this long for the original
     # App-level timeouts (seconds)
-    processing_timeout_seconds: int = Field(120, validation_alias=AliasChoices("PROCESSING_TIMEOUT_SECONDS", "processing_timeout_seconds"))
+    processing_timeout_seconds: int = Field(180, validation_alias=AliasChoices("PROCESSING_TIMEOUT_SECONDS", "processing_timeout_seconds"))
     pending_timeout_seconds: int = Field(300, validation_alias=AliasChoices("PENDING_TIMEOUT_SECONDS", "pending_timeout_seconds"))
+    # Stale job reaper (requeues/fails jobs past the timeouts above; one active replica via a Redis lease)
+    reaper_enabled: bool = Field(True, validation_alias=AliasChoices("REAPER_ENABLED", "reaper_enabled"))
+    reaper_interval_seconds: float = Field(30.0, validation_alias=AliasChoices("REAPER_INTERVAL_SECONDS", "reaper_interval_seconds"))
+    reaper_batch_size: int = Field(200, validation_alias=AliasChoices("REAPER_BATCH_SIZE", "reaper_batch_size"))
+    reaper_max_requeues: int = Field(2, validation_alias=AliasChoices("REAPER_MAX_REQUEUES", "reaper_max_requeues"))  # then FAILED
     
     # Storage
     aws_access_key_id: Optional[str] = Field(None, validation_alias=AliasChoices("AWS_ACCESS_KEY_ID", "aws_access_key_id"))
@@ -29,6 +76,14 @@ class Settings(BaseSettings):
     clerk_secret_key: str = Field("", validation_alias=AliasChoices("CLERK_SECRET_KEY", "clerk_secret_key"))
     clerk_issuer: Optional[str] = Field(None, validation_alias=AliasChoices("CLERK_ISSUER", "clerk_issuer"))  # e.g. https://your-app.clerk.accounts.dev
     clerk_audience: Optional[str] = Field(None, validation_alias=AliasChoices("CLERK_AUDIENCE", "clerk_audience"))  # expected aud claim, optional
+    # Verified-token cache (skips signature verification for repeat bearer tokens)
+    auth_token_cache_size: int = Field(10000, validation_alias=AliasChoices("AUTH_TOKEN_CACHE_SIZE", "auth_token_cache_size"))  # 0 disables the cache
+    auth_token_cache_max_ttl_seconds: int = Field(300, validation_alias=AliasChoices("AUTH_TOKEN_CACHE_MAX_TTL_SECONDS", "auth_token_cache_max_ttl_seconds"))  # upper bound per entry, also used for tokens without exp
+    # JWKS key store (per issuer)
+    jwks_ttl_seconds: int = Field(600, validation_alias=AliasChoices("JWKS_TTL_SECONDS", "jwks_ttl_seconds"))
+    jwks_refresh_ahead_seconds: int = Field(60, validation_alias=AliasChoices("JWKS_REFRESH_AHEAD_SECONDS", "jwks_refresh_ahead_seconds"))  # background refresh this long before TTL
+    jwks_max_stale_seconds: int = Field(3600, validation_alias=AliasChoices("JWKS_MAX_STALE_SECONDS", "jwks_max_stale_seconds"))  # stop serving stale keys after this
+    jwks_unknown_kid_refresh_interval_seconds: int = Field(30, validation_alias=AliasChoices("JWKS_UNKNOWN_KID_REFRESH_INTERVAL_SECONDS", "jwks_unknown_kid_refresh_interval_seconds"))  # per unknown kid, at most 5 forced refreshes per interval overall
     # Dev auth bypass (DEBUG only)
     dev_auth_bypass: bool = Field(False, validation_alias=AliasChoices("DEV_AUTH_BYPASS", "dev_auth_bypass"))
     dev_bearer_token: Optional[str] = Field(None, validation_alias=AliasChoices("DEV_BEARER_TOKEN", "dev_bearer_token"))
@@ -45,6 +100,18 @@ class Settings(BaseSettings):
     # WebSocket
     websocket_host: str = Field("0.0.0.0", validation_alias=AliasChoices("WEBSOCKET_HOST", "websocket_host"))
     websocket_port: int = Field(8001, validation_alias=AliasChoices("WEBSOCKET_PORT", "websocket_port"))
+    # Per-connection outbound queue (slow clients never stall other sockets)
+    websocket_send_queue_size: int = Field(256, validation_alias=AliasChoices("WEBSOCKET_SEND_QUEUE_SIZE", "websocket_send_queue_size"))
+    websocket_overflow_policy: str = Field("coalesce", validation_alias=AliasChoices("WEBSOCKET_OVERFLOW_POLICY", "websocket_overflow_policy"))  # drop_oldest | drop_newest | coalesce
+    websocket_slow_consumer_max_drops: int = Field(64, validation_alias=AliasChoices("WEBSOCKET_SLOW_CONSUMER_MAX_DROPS", "websocket_slow_consumer_max_drops"))  # consecutive drops before disconnect
+    websocket_send_timeout_seconds: float = Field(10.0, validation_alias=AliasChoices("WEBSOCKET_SEND_TIMEOUT_SECONDS", "websocket_send_timeout_seconds"))
+    websocket_broadcast_chunk_size: int = Field(1000, validation_alias=AliasChoices("WEBSOCKET_BROADCAST_CHUNK_SIZE", "websocket_broadcast_chunk_size"))  # sockets queued per event-loop turn
+    # WebSocket delivery only: per job, each API node forwards at most one job_status_update per window to
+    # its sockets (latest wins; terminal states always delivered; 0 disables). Publishing is not reduced.
+    notification_coalesce_window_ms: float = Field(100.0, validation_alias=AliasChoices("NOTIFICATION_COALESCE_WINDOW_MS", "notification_coalesce_window_ms"))
+    # Durable per-user job event log (Redis Stream) replayed on reconnect with last_event_id
+    job_event_log_maxlen: int = Field(1000, validation_alias=AliasChoices("JOB_EVENT_LOG_MAXLEN", "job_event_log_maxlen"))  # approximate, per user
+    job_event_log_ttl_seconds: int = Field(86400, validation_alias=AliasChoices("JOB_EVENT_LOG_TTL_SECONDS", "job_event_log_ttl_seconds"))  # after the user's last event
     
     # Pydantic v2 settings config
     model_config = SettingsConfigDict(
@@ -54,5 +121,21 @@ class Settings(BaseSettings):
         env_prefix="",           # no prefix; use field names as env keys
     )
 
+    @model_validator(mode="after")
+    def _check_timeouts(self) -> "Settings":
+        # keep_alive renews it, but a reservation must at least outlive one enqueue attempt
+        if self.idempotency_pending_ttl_seconds < self.enqueue_timeout_seconds + IDEMPOTENCY_PENDING_TTL_MARGIN_SECONDS:
+            raise ValueError(
+                f"IDEMPOTENCY_PENDING_TTL_SECONDS ({self.idempotency_pending_ttl_seconds}) must be at least "
+                f"ENQUEUE_TIMEOUT_SECONDS ({self.enqueue_timeout_seconds}) + {IDEMPOTENCY_PENDING_TTL_MARGIN_SECONDS}"
+            )
+        # A job still inside Celery's hard limit may be legitimately running
+        if self.reaper_enabled and self.processing_timeout_seconds <= self.celery_time_limit:
+            raise ValueError(
+                f"PROCESSING_TIMEOUT_SECONDS ({self.processing_timeout_seconds}) must be greater than "
+                f"CELERY_TIME_LIMIT ({self.celery_time_limit}) or the reaper requeues running jobs"
+            )
+        return self
+
 
 settings = Settings()
@@ -1,13 +1,19 @@
 from .user import User, UserCreate, UserUpdate
-from .job import Job, JobCreate, JobUpdate, JobStatus, JobType
+from .job import Job, JobSummary, JobCreate, JobUpdate, JobStatus, JobType, ALLOWED_PRIOR_STATUSES
+from .pagination import Page, PageCursor, InvalidCursorError
 
 __all__ = [
     "User",
     "UserCreate", 
     "UserUpdate",
     "Job",
+    "JobSummary",
     "JobCreate",
     "JobUpdate", 
     "JobStatus",
-    "JobType"
+    "JobType",
+    "ALLOWED_PRIOR_STATUSES",
+    "Page",
+    "PageCursor",
+    "InvalidCursorError"
 ]
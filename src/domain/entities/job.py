@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from pydantic import BaseModel, Field
 from bson import ObjectId
 from .user import PyObjectId
@@ -13,6 +13,15 @@ class JobStatus(str, Enum):
     FAILED = "failed"
 
 
+# Statuses a job may be in for a move to the key status to be allowed.
+# Guarded updates make duplicate/late task deliveries no-ops instead of overwriting state.
+ALLOWED_PRIOR_STATUSES: Dict[JobStatus, Tuple[JobStatus, ...]] = {
+    JobStatus.PROCESSING: (JobStatus.PENDING,),
+    JobStatus.COMPLETED: (JobStatus.PROCESSING,),
+    JobStatus.FAILED: (JobStatus.PENDING, JobStatus.PROCESSING),
+}
+
+
 class JobType(str, Enum):
     AUDIO_GENERATION = "audio_generation"
     TEXT_GENERATION = "text_generation"
@@ -40,6 +49,26 @@ class Job(BaseModel):
         json_encoders = {ObjectId: str}
 
 
+class JobSummary(BaseModel):
+    """List-view projection of a Job: no input/output payloads"""
+    id: PyObjectId = Field(..., alias="_id")
+    user_id: str
+    session_id: Optional[str] = None
+    job_type: JobType
+    status: JobStatus
+    artifact_url: Optional[str] = None
+    error_message: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        allow_population_by_field_name = True
+        arbitrary_types_allowed = True
+        json_encoders = {ObjectId: str}
+
+
 class JobCreate(BaseModel):
     user_id: str
     session_id: Optional[str] = None
@@ -0,0 +1,45 @@
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Generic, List, Optional, TypeVar
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+    pass
+
+
+class PageCursor(BaseModel):
+    """Position after the last item of a page, for keyset pagination on (created_at, _id) descending.
+
+    Encoded as an opaque URL-safe token; created_at is kept as epoch milliseconds,
+    the precision MongoDB stores, so the next page starts exactly after the last item.
+    """
+    created_at: datetime
+    id: str
+
+    def encode(self) -> str:
+        created_at = self.created_at if self.created_at.tzinfo else self.created_at.replace(tzinfo=timezone.utc)
+        millis = (created_at - _EPOCH) // timedelta(milliseconds=1)
+        raw = json.dumps({"t": millis, "id": self.id}, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "PageCursor":
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            data = json.loads(raw)
+            return cls(created_at=_EPOCH + timedelta(milliseconds=int(data["t"])), id=str(data["id"]))
+        except (binascii.Error, ValueError, TypeError, KeyError) as e:
+            raise InvalidCursorError("Invalid pagination cursor") from e
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
@@ -1,7 +1,8 @@
 from .user_repository import UserRepository
-from .job_repository import JobRepository
+from .job_repository import JobRepository, ActiveJobExistsError
 
 __all__ = [
     "UserRepository",
-    "JobRepository"
+    "JobRepository",
+    "ActiveJobExistsError"
 ]
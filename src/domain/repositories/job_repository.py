@@ -1,11 +1,31 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
-from ..entities import Job, JobCreate, JobUpdate, JobStatus
+from typing import Optional, List, Sequence, Union
+from ..entities import Job, JobSummary, JobCreate, JobUpdate, JobStatus, Page, PageCursor
+
+
+class ActiveJobExistsError(Exception):
+    """Raised when there's already an active job for the same user session."""
+    def __init__(self, existing_job_id: str):
+        super().__init__(f"Active job already exists: {existing_job_id}")
+        self.existing_job_id = existing_job_id
 
 
 class JobRepository(ABC):
     @abstractmethod
     async def create(self, job_data: JobCreate) -> Job:
+        """Insert a pending job.
+
+        A user session has at most one active (pending/processing) job; a job whose
+        session already has one raises ActiveJobExistsError, enforced by the write itself.
+        """
+        pass
+
+    @abstractmethod
+    async def create_many(self, jobs_data: Sequence[JobCreate]) -> List[Union[Job, Exception]]:
+        """Insert several jobs in one write; returns the created job or the error for each, in order.
+
+        Session conflicts (with existing jobs or earlier items of the batch) come back as ActiveJobExistsError.
+        """
         pass
 
     @abstractmethod
@@ -13,20 +33,30 @@ class JobRepository(ABC):
         pass
 
     @abstractmethod
-    async def get_by_user_id(self, user_id: str, skip: int = 0, limit: int = 100) -> List[Job]:
+    async def get_by_user_id(self, user_id: str, limit: int = 100, cursor: Optional[PageCursor] = None) -> Page[Job]:
+        """Newest first; pass the previous page's decoded next_cursor to continue."""
         pass
 
     @abstractmethod
-    async def get_active_by_user_session(self, user_id: str, session_id: str) -> Optional[Job]:
-        """Return the most recent active (pending/processing) job for a user session if any."""
+    async def get_summaries_by_user_id(
+        self, user_id: str, limit: int = 100, cursor: Optional[PageCursor] = None
+    ) -> Page[JobSummary]:
+        """Same page as get_by_user_id without input/output payloads."""
         pass
 
     @abstractmethod
-    async def get_by_status(self, status: JobStatus, skip: int = 0, limit: int = 100) -> List[Job]:
+    async def get_by_status(self, status: JobStatus, limit: int = 100, cursor: Optional[PageCursor] = None) -> Page[Job]:
         pass
 
     @abstractmethod
-    async def update(self, job_id: str, job_data: JobUpdate) -> Optional[Job]:
+    async def update(
+        self, job_id: str, job_data: JobUpdate, expected_statuses: Optional[Sequence[JobStatus]] = None
+    ) -> Optional[Job]:
+        """Atomically apply the update and return the updated job.
+
+        With `expected_statuses`, the update only applies while the job is in one of
+        them. Returns None if the job does not exist or is in another status.
+        """
         pass
 
     @abstractmethod
@@ -34,5 +64,5 @@ class JobRepository(ABC):
         pass
 
     @abstractmethod
-    async def list_jobs(self, skip: int = 0, limit: int = 100) -> List[Job]:
+    async def list_jobs(self, limit: int = 100, cursor: Optional[PageCursor] = None) -> Page[Job]:
         pass
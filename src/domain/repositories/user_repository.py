@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import Optional, List
-from ..entities import User, UserCreate, UserUpdate
+from ..entities import User, UserCreate, UserUpdate, Page, PageCursor
 
 
 class UserRepository(ABC):
@@ -29,5 +29,6 @@ class UserRepository(ABC):
         pass
 
     @abstractmethod
-    async def list_users(self, skip: int = 0, limit: int = 100) -> List[User]:
+    async def list_users(self, limit: int = 100, cursor: Optional[PageCursor] = None) -> Page[User]:
+        """Newest first; pass the previous page's decoded next_cursor to continue."""
         pass
@@ -1,7 +1,9 @@
-from .ai_service import AIService, StorageService, QueueService
+from .ai_service import AIService, StorageService, QueueService, ResultCache, JobNotifier
 
 __all__ = [
     "AIService",
     "StorageService", 
-    "QueueService"
+    "QueueService",
+    "ResultCache",
+    "JobNotifier"
 ]
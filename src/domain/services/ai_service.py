@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, List, Optional, Sequence, Tuple, Union
+import asyncio
 from ..entities import JobType
 
 
@@ -9,6 +10,30 @@ class AIService(ABC):
         """Generate AI content based on job type and input data"""
         pass
 
+    async def generate_batch(
+        self, job_type: JobType, inputs: List[Dict[str, Any]]
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """Generate content for several inputs of the same job type in one call.
+
+        Returns one entry per input, in order; an entry may be an Exception to fail
+        just that item. The default runs `generate` concurrently; backends that
+        support real batching should override it.
+        """
+        return list(await asyncio.gather(
+            *(self.generate(job_type, input_data) for input_data in inputs),
+            return_exceptions=True,
+        ))
+
+    async def generate_stream(self, job_type: JobType, input_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Generate AI content incrementally.
+
+        Yields partial events `{"progress": int | None, "delta": dict | None}` while
+        generating and finally `{"result": <same dict generate() returns>}`. The default
+        has no partials: it yields the final result of `generate`.
+        """
+        result = await self.generate(job_type, input_data)
+        yield {"result": result}
+
 
 class StorageService(ABC):
     @abstractmethod
@@ -28,7 +53,48 @@ class QueueService(ABC):
         """Add job to processing queue"""
         pass
 
+    async def enqueue_jobs(self, jobs: Sequence[Tuple[str, Dict[str, Any]]]) -> List[bool]:
+        """Add several (job_id, job_data) pairs to the queue; one success flag per job, in order.
+
+        The default enqueues them concurrently; backends with a batch publish path should override it.
+        """
+        return list(await asyncio.gather(*(self.enqueue_job(job_id, job_data) for job_id, job_data in jobs)))
+
     @abstractmethod
     async def get_queue_status(self) -> Dict[str, Any]:
         """Get current queue status"""
         pass
+
+
+class ResultCache(ABC):
+    """Stores AI results by (job_type, input_data) so identical requests skip the AI call"""
+
+    @abstractmethod
+    async def get(self, job_type: JobType, input_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return a stored result ({"output_data", "artifact_url"}) or None (miss, or job type not cached)"""
+        pass
+
+    @abstractmethod
+    async def put(self, job_type: JobType, input_data: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """Store a successful result; a no-op for job types that are not cached"""
+        pass
+
+    @abstractmethod
+    async def stats(self) -> Dict[str, Any]:
+        """Hit/miss counts and hit ratio"""
+        pass
+
+
+class JobNotifier(ABC):
+    """Announces job status changes to the job's user (WebSockets, job event log)"""
+
+    @abstractmethod
+    async def notify_job_status(
+        self,
+        user_id: str,
+        job_id: str,
+        status: str,
+        session_id: Optional[str] = None,
+        message: Optional[str] = None
+    ) -> None:
+        pass
@@ -0,0 +1,25 @@
+from .job_response_cache import JobResponseCache, job_response_cache
+from .result_cache import RedisResultCache, result_cache
+from .idempotency_store import (
+    IdempotencyStore,
+    IdempotencyReservation,
+    IdempotencyKeyReusedError,
+    IdempotencyRecordError,
+    IdempotencyKeyInProgressError,
+    request_fingerprint,
+    idempotency_store,
+)
+
+__all__ = [
+    "JobResponseCache",
+    "job_response_cache",
+    "RedisResultCache",
+    "result_cache",
+    "IdempotencyStore",
+    "IdempotencyReservation",
+    "IdempotencyKeyReusedError",
+    "IdempotencyKeyInProgressError",
+    "IdempotencyRecordError",
+    "request_fingerprint",
+    "idempotency_store"
+]
@@ -0,0 +1,200 @@
+"""
+Idempotency Store - Idempotency-Key handling for POST /jobs
+
+The first request with a key reserves it atomically in Redis (per user, with a short
+pending TTL renewed for as long as the request runs, see keep_alive) and records the
+JobResponse when it succeeds; the record then lives for IDEMPOTENCY_KEY_TTL_SECONDS. A retry with the same key gets that response back from
+Redis without touching MongoDB or the queue, and a concurrent duplicate waits (up to
+IDEMPOTENCY_WAIT_SECONDS) for the original to finish. Failed attempts (409, 503,
+errors) release the key so a retry runs again. Reusing a key with a different body
+is rejected.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional, Union
+
+from src.application.dto import JobResponse
+from src.config.settings import settings
+from src.infrastructure.database.redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ai_backend:idempotency:"
+
+# Reserve the key (1) or return the existing record as a flat field/value list
+_ACQUIRE = """
+if redis.call('exists', KEYS[1]) == 0 then
+    redis.call('hset', KEYS[1], 'state', 'pending', 'token', ARGV[1], 'fingerprint', ARGV[2])
+    redis.call('expire', KEYS[1], ARGV[3])
+    return 1
+end
+return redis.call('hgetall', KEYS[1])
+"""
+
+_COMPLETE = """
+if redis.call('hget', KEYS[1], 'token') ~= ARGV[1] then
+    return 0
+end
+redis.call('hset', KEYS[1], 'state', 'done', 'response', ARGV[2])
+redis.call('expire', KEYS[1], ARGV[3])
+return 1
+"""
+
+# Extend a reservation that is still ours and still pending
+_RENEW = """
+if redis.call('hget', KEYS[1], 'token') == ARGV[1] and redis.call('hget', KEYS[1], 'state') == 'pending' then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_RELEASE = """
+if redis.call('hget', KEYS[1], 'token') == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class IdempotencyKeyReusedError(Exception):
+    """The key was already used for a request with a different body."""
+    pass
+
+
+class IdempotencyKeyInProgressError(Exception):
+    """The original request with this key is still running after the wait timeout."""
+    pass
+
+
+class IdempotencyRecordError(Exception):
+    """The response could not be recorded; a retry after the pending TTL may run again."""
+    pass
+
+
+@dataclass
+class IdempotencyReservation:
+    redis_key: str
+    token: str
+
+
+def request_fingerprint(body: Dict[str, Any]) -> str:
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class IdempotencyStore:
+    """Redis-backed Idempotency-Key reservations and recorded responses"""
+
+    def __init__(
+        self,
+        ttl_seconds: int = 86400,
+        pending_ttl_seconds: int = 60,
+        wait_seconds: float = 10.0,
+        poll_interval_seconds: float = 0.05,
+        complete_attempts: int = 3,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.pending_ttl_seconds = pending_ttl_seconds
+        self.wait_seconds = wait_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.complete_attempts = complete_attempts
+
+    async def acquire(
+        self, user_id: str, key: str, fingerprint: str
+    ) -> Union[IdempotencyReservation, JobResponse]:
+        """Reserve `key` for this request, or return the response recorded for it.
+
+        Raises IdempotencyKeyReusedError if the key belongs to a different request body and
+        IdempotencyKeyInProgressError if the original is still running after `wait_seconds`.
+        If Redis is unavailable the request proceeds without idempotency (logged).
+        """
+        # Keys are scoped per user; hashed so arbitrary client strings make safe key names
+        redis_key = KEY_PREFIX + user_id + ":" + hashlib.sha256(key.encode("utf-8")).hexdigest()
+        reservation = IdempotencyReservation(redis_key=redis_key, token=uuid.uuid4().hex)
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            try:
+                existing = await RedisClient.script(_ACQUIRE)(
+                    keys=[redis_key], args=[reservation.token, fingerprint, self.pending_ttl_seconds]
+                )
+            except Exception as e:
+                logger.warning("[IdempotencyStore.acquire] redis unavailable, proceeding without idempotency error=%s", e)
+                return reservation
+            if existing == 1:
+                logger.debug("[IdempotencyStore.acquire] reserved user_id=%s", user_id)
+                return reservation
+
+            record = dict(zip(existing[::2], existing[1::2]))
+            if record.get("fingerprint") != fingerprint:
+                raise IdempotencyKeyReusedError("Idempotency-Key was already used with a different request body")
+            if record.get("state") == "done":
+                logger.debug("[IdempotencyStore.acquire] replaying recorded response user_id=%s", user_id)
+                return JobResponse.model_validate_json(record["response"])
+            if time.monotonic() >= deadline:
+                raise IdempotencyKeyInProgressError("A request with this Idempotency-Key is still being processed")
+            # Original still running; if it fails and releases the key, the next attempt reserves it
+            await asyncio.sleep(self.poll_interval_seconds)
+
+    @asynccontextmanager
+    async def keep_alive(self, reservation: IdempotencyReservation) -> AsyncIterator[None]:
+        """Renew the pending reservation while the original request runs, however long it takes"""
+        renewer = asyncio.create_task(self._renew(reservation))
+        try:
+            yield
+        finally:
+            renewer.cancel()
+            try:
+                await renewer
+            except asyncio.CancelledError:
+                pass
+
+    async def _renew(self, reservation: IdempotencyReservation) -> None:
+        while True:
+            await asyncio.sleep(self.pending_ttl_seconds / 3)
+            try:
+                renewed = await RedisClient.script(_RENEW)(
+                    keys=[reservation.redis_key], args=[reservation.token, self.pending_ttl_seconds]
+                )
+            except Exception as e:
+                logger.warning("[IdempotencyStore.keep_alive] renew failed error=%s", e)
+                continue
+            if not renewed:
+                logger.error("[IdempotencyStore.keep_alive] reservation lost key=%s", reservation.redis_key)
+                return
+
+    async def complete(self, reservation: IdempotencyReservation, response: JobResponse) -> None:
+        """Record the response for replays; raises IdempotencyRecordError if Redis keeps failing"""
+        for attempt in range(1, self.complete_attempts + 1):
+            try:
+                recorded = await RedisClient.script(_COMPLETE)(
+                    keys=[reservation.redis_key], args=[reservation.token, response.model_dump_json(), self.ttl_seconds]
+                )
+            except Exception as e:
+                if attempt == self.complete_attempts:
+                    raise IdempotencyRecordError(f"could not record response for job {response.id}: {e}") from e
+                await asyncio.sleep(self.poll_interval_seconds * attempt)
+                continue
+            if not recorded:
+                # The reservation expired or was taken over: a retry may already be running
+                raise IdempotencyRecordError(f"reservation lost before recording job {response.id}")
+            return
+
+    async def release(self, reservation: IdempotencyReservation) -> None:
+        try:
+            await RedisClient.script(_RELEASE)(keys=[reservation.redis_key], args=[reservation.token])
+        except Exception as e:
+            # The pending reservation expires after pending_ttl_seconds anyway
+            logger.debug("[IdempotencyStore.release] failed error=%s", e)
+
+
+idempotency_store = IdempotencyStore(
+    ttl_seconds=settings.idempotency_key_ttl_seconds,
+    pending_ttl_seconds=settings.idempotency_pending_ttl_seconds,
+    wait_seconds=settings.idempotency_wait_seconds,
+)
@@ -0,0 +1,110 @@
+"""
+Job Response Cache - Read-through cache for GET /jobs/{job_id}
+
+Clients poll single jobs heavily. COMPLETED/FAILED jobs never change, so their
+JobResponse is kept for a long TTL in a bounded in-process LRU and, optionally, in
+Redis so all API instances share them. Pending/processing jobs are only cached
+locally for a few seconds and are dropped as soon as RedisNotificationSubscriber
+sees a status notification for them.
+"""
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from src.application.dto import JobResponse
+from src.config.settings import settings
+from src.domain.entities import JobStatus
+from src.infrastructure.database.redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED)
+REDIS_KEY_PREFIX = "ai_backend:job_response:"
+
+
+class JobResponseCache:
+    """Two-tier (local LRU + optional Redis) cache of JobResponse by job id"""
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        terminal_ttl_seconds: float = 3600.0,
+        active_ttl_seconds: float = 2.0,
+        redis_enabled: bool = False,
+    ):
+        self.max_entries = max_entries
+        self.terminal_ttl_seconds = terminal_ttl_seconds
+        self.active_ttl_seconds = active_ttl_seconds
+        self.redis_enabled = redis_enabled
+        self._entries: "OrderedDict[str, Tuple[JobResponse, float]]" = OrderedDict()
+        # Metrics
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    async def get(self, job_id: str) -> Optional[JobResponse]:
+        entry = self._entries.get(job_id)
+        if entry is not None:
+            job, expires_at = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(job_id)
+                self.local_hits += 1
+                return job
+            del self._entries[job_id]
+
+        if self.redis_enabled:
+            try:
+                raw = await RedisClient.get_client().get(REDIS_KEY_PREFIX + job_id)
+            except Exception as e:
+                logger.debug("[JobResponseCache.get] redis read failed job_id=%s error=%s", job_id, e)
+                raw = None
+            if raw:
+                job = JobResponse.model_validate_json(raw)
+                self._store_local(job)
+                self.redis_hits += 1
+                return job
+
+        self.misses += 1
+        return None
+
+    async def put(self, job: JobResponse) -> None:
+        self._store_local(job)
+        if self.redis_enabled and job.status in TERMINAL_STATUSES:
+            try:
+                await RedisClient.get_client().set(
+                    REDIS_KEY_PREFIX + job.id, job.model_dump_json(), ex=int(self.terminal_ttl_seconds)
+                )
+            except Exception as e:
+                logger.debug("[JobResponseCache.put] redis write failed job_id=%s error=%s", job.id, e)
+
+    def invalidate(self, job_id: str) -> None:
+        """Drop the local entry (terminal entries in Redis never go stale, so they stay)"""
+        self._entries.pop(job_id, None)
+
+    def _store_local(self, job: JobResponse) -> None:
+        ttl = self.terminal_ttl_seconds if job.status in TERMINAL_STATUSES else self.active_ttl_seconds
+        if ttl <= 0:
+            return
+        self._entries[job.id] = (job, time.monotonic() + ttl)
+        self._entries.move_to_end(job.id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.local_hits + self.redis_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.local_hits + self.redis_hits) / lookups, 4) if lookups else None,
+        }
+
+
+job_response_cache = JobResponseCache(
+    max_entries=settings.job_cache_max_entries,
+    terminal_ttl_seconds=settings.job_cache_terminal_ttl_seconds,
+    active_ttl_seconds=settings.job_cache_active_ttl_seconds,
+    redis_enabled=settings.job_cache_redis_enabled,
+)
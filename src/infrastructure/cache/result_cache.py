@@ -0,0 +1,161 @@
+"""
+Result Cache - Content-addressed AI results shared by the API and workers
+
+Identical (job_type, input_data) submissions reuse a stored output_data/artifact_url
+instead of calling the AI service again. The key is a SHA-256 of the canonical JSON
+of the request (sorted keys, no whitespace, NFC-normalised strings), so key order and
+Unicode composition do not matter while any real difference in the input does.
+
+Only job types listed in RESULT_CACHE_JOB_TYPES are cached (deterministic ones such as
+TTS). Entries expire after RESULT_CACHE_TTL_SECONDS; a sorted set of entry hashes by
+store time caps the cache at RESULT_CACHE_MAX_ENTRIES by evicting the oldest first.
+Lookups and stores are one Lua call each and also bump shared hit/miss counters, so
+the hit rate covers every API and worker process.
+"""
+import hashlib
+import json
+import logging
+import time
+import unicodedata
+from typing import Any, Dict, Iterable, Optional
+
+from src.config.settings import settings
+from src.domain.entities import JobType
+from src.domain.services import ResultCache
+from src.infrastructure.database.redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ai_backend:result:"
+INDEX_KEY = "ai_backend:result_cache:index"
+STATS_KEY = "ai_backend:result_cache:stats"
+
+# GET plus the hit/miss counter for the job type in one round trip
+_GET = """
+local value = redis.call('get', KEYS[1])
+if value then
+    redis.call('hincrby', KEYS[2], 'hits:' .. ARGV[1], 1)
+else
+    redis.call('hincrby', KEYS[2], 'misses:' .. ARGV[1], 1)
+end
+return value
+"""
+
+# SET EX, index by store time, drop expired index entries, evict the oldest over the cap
+_PUT = """
+local now = tonumber(ARGV[3])
+redis.call('set', KEYS[1], ARGV[1], 'EX', ARGV[2])
+redis.call('zadd', KEYS[2], now, ARGV[5])
+redis.call('zremrangebyscore', KEYS[2], '-inf', now - tonumber(ARGV[2]))
+redis.call('hincrby', KEYS[3], 'stores', 1)
+local overflow = redis.call('zcard', KEYS[2]) - tonumber(ARGV[4])
+if overflow <= 0 then
+    return 0
+end
+local evicted = redis.call('zpopmin', KEYS[2], overflow)
+for i = 1, #evicted, 2 do
+    redis.call('del', ARGV[6] .. evicted[i])
+end
+redis.call('hincrby', KEYS[3], 'evictions', overflow)
+return overflow
+"""
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return unicodedata.normalize("NFC", value)
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def result_key(job_type: JobType, input_data: Dict[str, Any]) -> str:
+    """Canonical content hash of an AI request"""
+    canonical = json.dumps(
+        {"job_type": JobType(job_type).value, "input_data": _normalize(input_data)},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class RedisResultCache(ResultCache):
+    """Result cache in Redis with per-job-type opt-in, TTL and a size cap"""
+
+    def __init__(self, job_types: Iterable[str], ttl_seconds: int = 86400, max_entries: int = 100000):
+        self.job_types = {JobType(job_type) for job_type in job_types}
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+    def caches(self, job_type: JobType) -> bool:
+        return bool(self.job_types) and JobType(job_type) in self.job_types
+
+    async def get(self, job_type: JobType, input_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if not self.caches(job_type):
+            return None
+        key = result_key(job_type, input_data)
+        try:
+            raw = await RedisClient.script(_GET)(keys=[KEY_PREFIX + key, STATS_KEY], args=[JobType(job_type).value])
+        except Exception as e:
+            logger.debug("[RedisResultCache.get] redis read failed job_type=%s error=%s", job_type, e)
+            return None
+        if not raw:
+            return None
+        logger.debug("[RedisResultCache.get] hit job_type=%s key=%s", job_type, key)
+        return json.loads(raw)
+
+    async def put(self, job_type: JobType, input_data: Dict[str, Any], result: Dict[str, Any]) -> None:
+        if not self.caches(job_type):
+            return
+        key = result_key(job_type, input_data)
+        value = json.dumps({"output_data": result.get("output_data"), "artifact_url": result.get("artifact_url")}, default=str)
+        try:
+            evicted = await RedisClient.script(_PUT)(
+                keys=[KEY_PREFIX + key, INDEX_KEY, STATS_KEY],
+                args=[value, self.ttl_seconds, time.time(), self.max_entries, key, KEY_PREFIX],
+            )
+        except Exception as e:
+            logger.debug("[RedisResultCache.put] redis write failed job_type=%s error=%s", job_type, e)
+            return
+        logger.debug("[RedisResultCache.put] stored job_type=%s key=%s evicted=%s", job_type, key, evicted)
+
+    async def stats(self) -> Dict[str, Any]:
+        client = RedisClient.get_client()
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.hgetall(STATS_KEY)
+            pipe.zcard(INDEX_KEY)
+            counters, entries = await pipe.execute()
+        by_type: Dict[str, Dict[str, Any]] = {}
+        for job_type in sorted(job_type.value for job_type in self.job_types):
+            hits = int(counters.get(f"hits:{job_type}", 0))
+            misses = int(counters.get(f"misses:{job_type}", 0))
+            by_type[job_type] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+            }
+        hits = sum(item["hits"] for item in by_type.values())
+        lookups = hits + sum(item["misses"] for item in by_type.values())
+        return {
+            "job_types": sorted(by_type),
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "stores": int(counters.get("stores", 0)),
+            "evictions": int(counters.get("evictions", 0)),
+            "hits": hits,
+            "lookups": lookups,
+            "hit_ratio": round(hits / lookups, 4) if lookups else None,
+            "by_job_type": by_type,
+        }
+
+
+result_cache = RedisResultCache(
+    job_types=[t.strip() for t in settings.result_cache_job_types.split(",") if t.strip()],
+    ttl_seconds=settings.result_cache_ttl_seconds,
+    max_entries=settings.result_cache_max_entries,
+)
@@ -0,0 +1,62 @@
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+from typing import Dict, Optional
+import os
+import logging
+import asyncio
+
+from src.config.settings import settings
+
+
+class RedisClient:
+    """Shared asyncio Redis client (one connection pool per process and event loop)."""
+
+    client: Optional[Redis] = None
+    _pid: Optional[int] = None
+    _loop_id: Optional[int] = None
+    _scripts: Dict[str, AsyncScript] = {}
+
+    @classmethod
+    def get_client(cls) -> Redis:
+        """Return the process-wide client, recreating it after a fork or on a new event loop."""
+        current_pid = os.getpid()
+        try:
+            current_loop_id = id(asyncio.get_running_loop())
+        except RuntimeError:
+            current_loop_id = None
+
+        if (
+            cls.client is None
+            or cls._pid != current_pid
+            or (cls._loop_id is not None and current_loop_id is not None and cls._loop_id != current_loop_id)
+        ):
+            logging.debug("[RedisClient] creating client url=%s pid=%s", settings.redis_url, current_pid)
+            cls.client = Redis.from_url(settings.redis_url, decode_responses=True)
+            cls._pid = current_pid
+            cls._loop_id = current_loop_id
+        return cls.client
+
+    @classmethod
+    def script(cls, source: str) -> AsyncScript:
+        """Return the Lua `source` registered on the current client.
+
+        Calls send EVALSHA (loading the script once on NOSCRIPT) instead of the full
+        script body on every EVAL.
+        """
+        client = cls.get_client()
+        script = cls._scripts.get(source)
+        if script is None or script.registered_client is not client:
+            script = cls._scripts[source] = client.register_script(source)
+        return script
+
+    @classmethod
+    async def close(cls):
+        """Close the shared client"""
+        if cls.client is not None and cls._pid == os.getpid():
+            try:
+                await cls.client.close()
+            except Exception:
+                pass
+        cls.client = None
+        cls._pid = None
+        cls._loop_id = None
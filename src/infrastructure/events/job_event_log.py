@@ -0,0 +1,94 @@
+"""
+Job Event Log - Durable per-user log of job status events (Redis Streams)
+
+Every job_status_update is appended to the user's stream before it is published, in
+the same Lua call, so stream ids (monotonic "<ms>-<seq>") and publish order agree and
+the published payload carries its id as `event_id`. A client that reconnects with
+`last_event_id` is replayed everything after it from the stream; the stream is capped
+with approximate MAXLEN trimming (JOB_EVENT_LOG_MAXLEN) and expires
+JOB_EVENT_LOG_TTL_SECONDS after the user's last event, so memory stays bounded.
+
+If `last_event_id` has been trimmed away (or the stream expired) the replay cannot be
+gap-free; read_after reports that as `gap` and the client resyncs once from the API.
+"""
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config.settings import settings
+from src.infrastructure.database.redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ai_backend:job_events:"
+
+_EVENT_ID = re.compile(r"^\d+-\d+$")
+
+# KEYS: stream, user channel, invalidation channel
+# ARGV: maxlen, ttl, payload (JSON object), job id
+# The id is spliced into the payload so subscribers need not re-encode it
+APPEND = """
+local id = redis.call('xadd', KEYS[1], 'MAXLEN', '~', ARGV[1], '*', 'data', ARGV[3])
+redis.call('expire', KEYS[1], ARGV[2])
+redis.call('publish', KEYS[2], string.sub(ARGV[3], 1, -2) .. ',"event_id":"' .. id .. '"}')
+redis.call('publish', KEYS[3], ARGV[4])
+return id
+"""
+
+
+def stream_key(user_id: str) -> str:
+    return KEY_PREFIX + user_id
+
+
+class JobEventLog:
+    """Capped Redis Stream of job events per user, read back on WebSocket reconnect"""
+
+    def __init__(self, maxlen: int = 1000, ttl_seconds: int = 86400, page_size: int = 500):
+        self.maxlen = maxlen
+        self.ttl_seconds = ttl_seconds
+        self.page_size = page_size
+
+    def append_keys_and_args(
+        self, user_id: str, user_channel: str, invalidation_channel: str, payload: str, job_id: str
+    ) -> Dict[str, list]:
+        """Keyword arguments for a registered APPEND script, shared by the sync and async notifiers"""
+        return {
+            "keys": [stream_key(user_id), user_channel, invalidation_channel],
+            "args": [self.maxlen, self.ttl_seconds, payload, job_id],
+        }
+
+    async def read_after(self, user_id: str, last_event_id: str) -> Tuple[List[Tuple[str, Dict[str, Any]]], bool]:
+        """Events after `last_event_id`, oldest first, and whether some may be missing.
+
+        The replay is gap-free only if `last_event_id` itself is still in the log;
+        otherwise entries after it may have been trimmed and `gap` is True.
+        """
+        if not _EVENT_ID.match(last_event_id or ""):
+            return [], True
+        client = RedisClient.get_client()
+        key = stream_key(user_id)
+        if not await client.xrange(key, min=last_event_id, max=last_event_id, count=1):
+            logger.info("[JobEventLog.read_after] last_event_id no longer retained user_id=%s id=%s", user_id, last_event_id)
+            return await self._read(key, "-"), True
+        return await self._read(key, "(" + last_event_id), False
+
+    async def _read(self, key: str, start: str) -> List[Tuple[str, Dict[str, Any]]]:
+        client = RedisClient.get_client()
+        events: List[Tuple[str, Dict[str, Any]]] = []
+        while True:
+            page = await client.xrange(key, min=start, max="+", count=self.page_size)
+            for event_id, fields in page:
+                try:
+                    events.append((event_id, json.loads(fields["data"])))
+                except Exception:
+                    logger.warning("[JobEventLog] skipping malformed event id=%s", event_id)
+            if len(page) < self.page_size:
+                return events
+            start = "(" + page[-1][0]
+
+
+job_event_log = JobEventLog(
+    maxlen=settings.job_event_log_maxlen,
+    ttl_seconds=settings.job_event_log_ttl_seconds,
+)
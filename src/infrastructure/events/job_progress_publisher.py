@@ -0,0 +1,88 @@
+"""
+Job Progress Publisher - Rate-limited, coalescing forwarder of streamed job progress
+
+A streaming AI service can yield dozens of tokens per second. Publishing each one
+would flood Redis and every subscribed socket, so increments are merged and sent at
+most once per interval; the first increment goes out immediately (time to first token).
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# (progress, partial) -> publish coroutine
+PublishFn = Callable[[Optional[int], Optional[Dict[str, Any]]], Awaitable[None]]
+
+
+def merge_partial(pending: Dict[str, Any], delta: Dict[str, Any]) -> None:
+    """Merge a delta into pending output: strings concatenate, lists extend, others replace."""
+    for key, value in delta.items():
+        current = pending.get(key)
+        if isinstance(current, str) and isinstance(value, str):
+            pending[key] = current + value
+        elif isinstance(current, list) and isinstance(value, list):
+            current.extend(value)
+        else:
+            pending[key] = list(value) if isinstance(value, list) else value
+
+
+class JobProgressPublisher:
+    """Coalesces progress events of one job and publishes them at a bounded rate"""
+
+    def __init__(self, publish: PublishFn, min_interval_seconds: float = 0.25):
+        self._publish = publish
+        self.min_interval_seconds = min_interval_seconds
+        self._progress: Optional[int] = None
+        self._partial: Dict[str, Any] = {}
+        self._dirty = False
+        self._last_sent: Optional[float] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._closing = asyncio.Event()
+        # Metrics
+        self.events = 0
+        self.published = 0
+
+    async def push(self, event: Dict[str, Any]) -> None:
+        """Accept one partial event; never waits for Redis"""
+        self.events += 1
+        if event.get("progress") is not None:
+            self._progress = event["progress"]
+        if event.get("delta"):
+            merge_partial(self._partial, event["delta"])
+        self._dirty = True
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while self._dirty:
+            if self._last_sent is not None:
+                delay = self._last_sent + self.min_interval_seconds - time.monotonic()
+                if delay > 0 and not self._closing.is_set():
+                    try:
+                        # close() cuts the wait short so the tail is sent before the terminal status
+                        await asyncio.wait_for(self._closing.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+            await self._send()
+
+    async def _send(self) -> None:
+        progress, partial = self._progress, self._partial or None
+        self._partial = {}
+        self._dirty = False
+        self._last_sent = time.monotonic()
+        try:
+            await self._publish(progress, partial)
+            self.published += 1
+        except Exception:
+            logger.debug("[JobProgressPublisher] publish failed", exc_info=True)
+
+    async def close(self) -> None:
+        """Send whatever is still pending right away (before the terminal status)"""
+        self._closing.set()
+        if self._flusher is not None:
+            await self._flusher
+        if self._dirty:
+            await self._send()
+        logger.debug("[JobProgressPublisher] closed events=%s published=%s", self.events, self.published)
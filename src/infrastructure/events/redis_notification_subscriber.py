@@ -1,15 +1,32 @@
 """
 Redis Notification Subscriber - Listens for job notifications and forwards to WebSockets
+
+Subscribes to the per-user channel of every user with a socket on this node, following
+ConnectionManager presence: a user's first socket subscribes, their last disconnect
+unsubscribes. Changes are applied by one task in batched SUBSCRIBE/UNSUBSCRIBE commands,
+so connection churn costs one round trip per batch rather than per socket; a new
+user's connect waits for their SUBSCRIBE, so nothing published after it is missed. Also
+subscribed: the cache invalidation channel (job ids) and the legacy global channel.
+Status updates pass through a StatusCoalescer, so a burst for one job costs one socket
+write per NOTIFICATION_COALESCE_WINDOW_MS rather than one per update.
 """
 import asyncio
 import json
 import logging
-from typing import Optional
+from typing import Dict, Optional, Set
 from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
 
 from src.config.settings import settings
-from src.presentation.websocket.websocket_routes import notify_job_status_update
-from src.infrastructure.events.simple_job_notifier import JOB_NOTIFICATION_CHANNEL
+from src.presentation.websocket.connection_manager import ConnectionManager, manager
+from src.presentation.websocket.websocket_routes import notify_job_status_update, notify_job_progress
+from src.infrastructure.events.simple_job_notifier import (
+    JOB_CACHE_INVALIDATION_CHANNEL,
+    JOB_NOTIFICATION_CHANNEL,
+    user_channel,
+)
+from src.infrastructure.cache import job_response_cache
+from src.infrastructure.events.status_coalescer import StatusCoalescer
 
 logger = logging.getLogger(__name__)
 
@@ -17,10 +34,19 @@ logger = logging.getLogger(__name__)
 class RedisNotificationSubscriber:
     """Subscribes to Redis job notifications and forwards to WebSockets"""
     
-    def __init__(self):
+    def __init__(self, connection_manager: ConnectionManager = manager):
+        self.connection_manager = connection_manager
         self._redis: Optional[Redis] = None
         self._task: Optional[asyncio.Task] = None
+        self._sync_task: Optional[asyncio.Task] = None
         self._stopping = asyncio.Event()
+        # Desired state per user since the last sync (True: subscribe, False: unsubscribe)
+        self._pending: Dict[str, bool] = {}
+        self._sync_wake = asyncio.Event()
+        self._subscribed: Set[str] = set()
+        # Resolved once the user's channel is subscribed (awaited by ConnectionManager.connect)
+        self._ready: Dict[str, asyncio.Future] = {}
+        self.coalescer = StatusCoalescer(self._forward_status, window_ms=settings.notification_coalesce_window_ms)
 
     def _get_redis(self) -> Redis:
         if self._redis is None:
@@ -32,12 +58,22 @@ class RedisNotificationSubscriber:
         if self._task and not self._task.done():
             return
         self._stopping.clear()
+        self.connection_manager.add_presence_listener(self._user_online, self._user_offline)
         self._task = asyncio.create_task(self._run(), name="redis_notification_subscriber")
         logger.info("[RedisNotificationSubscriber] started")
 
     async def stop(self) -> None:
         """Stop listening for Redis notifications"""
         self._stopping.set()
+        self.connection_manager.remove_presence_listener(self._user_online, self._user_offline)
+        if self._sync_task:
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+            self._sync_task = None
+        self.coalescer.close()
         if self._task:
             self._task.cancel()
             try:
@@ -52,12 +88,108 @@ class RedisNotificationSubscriber:
             self._redis = None
         logger.info("[RedisNotificationSubscriber] stopped")
 
+    def _user_online(self, user_id: str) -> Optional[asyncio.Future]:
+        self._pending[user_id] = True
+        self._sync_wake.set()
+        if user_id in self._subscribed:
+            return None
+        ready = self._ready.get(user_id)
+        if ready is None or ready.done():
+            ready = self._ready[user_id] = asyncio.get_running_loop().create_future()
+        return ready
+
+    def _user_offline(self, user_id: str) -> None:
+        self._pending[user_id] = False
+        self._sync_wake.set()
+
+    def _resolve_ready(self, user_id: str) -> None:
+        ready = self._ready.pop(user_id, None)
+        if ready is not None and not ready.done():
+            ready.set_result(None)
+
+    async def _sync_once(self, pubsub: PubSub) -> None:
+        """Apply all presence changes since the last call in (at most) two commands"""
+        pending, self._pending = self._pending, {}
+        subscribe = [user_id for user_id, online in pending.items() if online and user_id not in self._subscribed]
+        unsubscribe = [user_id for user_id, online in pending.items() if not online and user_id in self._subscribed]
+        if subscribe:
+            await pubsub.subscribe(*(user_channel(user_id) for user_id in subscribe))
+            self._subscribed.update(subscribe)
+        if unsubscribe:
+            await pubsub.unsubscribe(*(user_channel(user_id) for user_id in unsubscribe))
+            self._subscribed.difference_update(unsubscribe)
+        for user_id in pending:
+            self._resolve_ready(user_id)
+        if subscribe or unsubscribe:
+            logger.debug(
+                "[RedisNotificationSubscriber] subscriptions +%s -%s total=%s",
+                len(subscribe), len(unsubscribe), len(self._subscribed),
+            )
+
+    async def _sync_subscriptions(self, pubsub: PubSub) -> None:
+        while True:
+            await self._sync_wake.wait()
+            self._sync_wake.clear()
+            try:
+                await self._sync_once(pubsub)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("[RedisNotificationSubscriber] subscription sync failed")
+
+    async def _forward_status(self, payload: dict) -> None:
+        user_id = payload.get("user_id")
+        job_id = payload.get("job_id")
+        status = payload.get("status")
+        try:
+            await notify_job_status_update(
+                user_id=user_id,
+                job_id=job_id,
+                status=status,
+                message=payload.get("message"),
+                session_id=payload.get("session_id"),
+                event_id=payload.get("event_id"),
+            )
+            logger.info("[RedisNotificationSubscriber] forwarded notification: user_id=%s, job_id=%s, status=%s",
+                        user_id, job_id, status)
+        except Exception:
+            logger.exception(
+                "[RedisNotificationSubscriber] notify failed user_id=%s job_id=%s status=%s",
+                user_id, job_id, status,
+            )
+
+    async def _forward_progress(self, payload: dict) -> None:
+        """Forward a coalesced job_progress message (high volume: logged at debug only)"""
+        user_id = payload.get("user_id")
+        job_id = payload.get("job_id")
+        if not (user_id and job_id):
+            logger.debug("[RedisNotificationSubscriber] missing fields in payload=%s", payload)
+            return
+        try:
+            await notify_job_progress(
+                user_id=user_id,
+                job_id=job_id,
+                progress=payload.get("progress"),
+                partial=payload.get("partial"),
+                session_id=payload.get("session_id"),
+            )
+        except Exception:
+            logger.exception("[RedisNotificationSubscriber] progress notify failed user_id=%s job_id=%s", user_id, job_id)
+
     async def _run(self) -> None:
         """Main subscription loop"""
         r = self._get_redis()
         pubsub = r.pubsub()
-        await pubsub.subscribe(JOB_NOTIFICATION_CHANNEL)
-        logger.info("[RedisNotificationSubscriber] subscribed to channel=%s", JOB_NOTIFICATION_CHANNEL)
+        await pubsub.subscribe(JOB_NOTIFICATION_CHANNEL, JOB_CACHE_INVALIDATION_CHANNEL)
+        logger.info(
+            "[RedisNotificationSubscriber] subscribed to channels=%s,%s (+ per-user channels)",
+            JOB_NOTIFICATION_CHANNEL, JOB_CACHE_INVALIDATION_CHANNEL,
+        )
+        # Fresh connection: subscribe everyone already connected (e.g. after a restart)
+        self._subscribed.clear()
+        for user_id in list(self.connection_manager.active_connections):
+            self._user_online(user_id)
+        self._sync_task = asyncio.create_task(self._sync_subscriptions(pubsub), name="redis_notification_subscriptions")
         
         try:
             async for msg in pubsub.listen():
@@ -71,6 +203,11 @@ class RedisNotificationSubscriber:
                 data = msg.get("data")
                 if not data:
                     continue
+
+                if msg.get("channel") == JOB_CACHE_INVALIDATION_CHANNEL:
+                    # Any node may have cached the job, whether or not it holds the user's socket
+                    job_response_cache.invalidate(data)
+                    continue
                     
                 try:
                     payload = json.loads(data)
@@ -78,41 +215,27 @@ class RedisNotificationSubscriber:
                     logger.exception("[RedisNotificationSubscriber] invalid payload: %r", data)
                     continue
                     
+                if payload.get("type") == "job_progress":
+                    await self._forward_progress(payload)
+                    continue
                 if payload.get("type") != "job_status_update":
                     continue
                     
-                user_id = payload.get("user_id")
                 job_id = payload.get("job_id")
-                status = payload.get("status")
-                session_id = payload.get("session_id")
-                message = payload.get("message")
-                
-                if not (user_id and job_id and status):
+                if not (payload.get("user_id") and job_id and payload.get("status")):
                     logger.debug("[RedisNotificationSubscriber] missing fields in payload=%s", payload)
                     continue
-                    
-                try:
-                    await notify_job_status_update(
-                        user_id=user_id,
-                        job_id=job_id,
-                        status=status,
-                        message=message,
-                        session_id=session_id,
-                    )
-                    logger.info("[RedisNotificationSubscriber] forwarded notification: user_id=%s, job_id=%s, status=%s", 
-                               user_id, job_id, status)
-                except Exception:
-                    logger.exception(
-                        "[RedisNotificationSubscriber] notify failed user_id=%s job_id=%s status=%s",
-                        user_id, job_id, status,
-                    )
+
+                # The job changed: the next GET /jobs/{id} must read it from Mongo
+                job_response_cache.invalidate(job_id)
+                await self.coalescer.submit(payload)
         except asyncio.CancelledError:
             pass
         except Exception:
             logger.exception("[RedisNotificationSubscriber] subscriber error")
         finally:
             try:
-                await pubsub.unsubscribe(JOB_NOTIFICATION_CHANNEL)
+                await pubsub.unsubscribe()
                 await pubsub.close()
             except Exception:
                 pass
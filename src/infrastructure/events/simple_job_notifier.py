@@ -1,20 +1,59 @@
 """
 Simple Job Notifier - Uses Redis pub/sub for worker-to-API communication
+
+Notifications are published to the user's own channel (user_channel), which only the
+API nodes holding a socket for that user subscribe to, so each node decodes only its
+own users' traffic. Status changes also publish the bare job id on
+JOB_CACHE_INVALIDATION_CHANNEL, which every node receives to drop cached job responses.
+Status changes are first appended to the user's job event log (job_event_log), which
+adds the `event_id` clients resume from; progress messages are live-only.
 """
 import json
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional
 import redis
+from redis.commands.core import Script
 
 from src.config.settings import settings
+from src.domain.services import JobNotifier
+from src.infrastructure.database.redis_client import RedisClient
+from src.infrastructure.events.job_event_log import APPEND, job_event_log
 
 logger = logging.getLogger(__name__)
 
-# Channel for job status notifications
+# Global channel: still consumed by every API node (messages from older publishers)
 JOB_NOTIFICATION_CHANNEL = "job_notifications"
+# Job ids whose status changed (no JSON: cheap for every node to consume)
+JOB_CACHE_INVALIDATION_CHANNEL = "job_notifications:invalidate"
+
+
+# Shared by every sync notification in the process (one pooled connection, not one per call)
+_sync_redis: Optional[redis.Redis] = None
+_sync_append: Optional[Script] = None
+
+
+def user_channel(user_id: str) -> str:
+    """Per-user notification channel"""
+    return f"{JOB_NOTIFICATION_CHANNEL}:user:{user_id}"
+
 
+def _get_sync_redis() -> redis.Redis:
+    global _sync_redis
+    if _sync_redis is None:
+        _sync_redis = redis.from_url(settings.redis_url, decode_responses=True)
+    return _sync_redis
 
-class SimpleJobNotifier:
+
+def _sync_append_script() -> Script:
+    """APPEND registered on the sync client, so each notification sends EVALSHA"""
+    global _sync_append
+    r = _get_sync_redis()
+    if _sync_append is None or _sync_append.registered_client is not r:
+        _sync_append = r.register_script(APPEND)
+    return _sync_append
+
+
+class SimpleJobNotifier(JobNotifier):
     """Simple job status notifier that uses Redis pub/sub"""
     
     @staticmethod
@@ -30,9 +69,6 @@ class SimpleJobNotifier:
             logger.info("[SimpleJobNotifier] notifying: user_id=%s, job_id=%s, status=%s, session_id=%s", 
                        user_id, job_id, status, session_id)
             
-            # Create Redis client
-            r = redis.from_url(settings.redis_url, decode_responses=True)
-            
             # Prepare notification payload
             payload = {
                 "type": "job_status_update",
@@ -43,9 +79,52 @@ class SimpleJobNotifier:
                 "message": message
             }
             
-            # Publish to Redis channel
-            r.publish(JOB_NOTIFICATION_CHANNEL, json.dumps(payload))
+            # Log, then publish to the user's channel and the cache invalidation channel, in one call
+            _sync_append_script()(**job_event_log.append_keys_and_args(
+                user_id, user_channel(user_id), JOB_CACHE_INVALIDATION_CHANNEL, json.dumps(payload), job_id
+            ))
             logger.info("[SimpleJobNotifier] notification published to Redis")
             
         except Exception:
             logger.exception("[SimpleJobNotifier] failed to notify job status sync")
+
+    @staticmethod
+    async def notify_job_status(
+        user_id: str,
+        job_id: str,
+        status: str,
+        session_id: Optional[str] = None,
+        message: Optional[str] = None
+    ) -> None:
+        """Async status notification for code running on an event loop (API background tasks, worker loop)"""
+        payload = {
+            "type": "job_status_update",
+            "user_id": user_id,
+            "job_id": job_id,
+            "status": status,
+            "session_id": session_id,
+            "message": message
+        }
+        await RedisClient.script(APPEND)(**job_event_log.append_keys_and_args(
+            user_id, user_channel(user_id), JOB_CACHE_INVALIDATION_CHANNEL, json.dumps(payload), job_id
+        ))
+
+    @staticmethod
+    async def notify_job_progress(
+        user_id: str,
+        job_id: str,
+        progress: Optional[int] = None,
+        partial: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> None:
+        """Async progress/partial-output notification (runs on the worker loop)"""
+        payload = {
+            "type": "job_progress",
+            "user_id": user_id,
+            "job_id": job_id,
+            "status": "PROCESSING",
+            "session_id": session_id,
+            "progress": progress,
+            "partial": partial,
+        }
+        await RedisClient.get_client().publish(user_channel(user_id), json.dumps(payload))
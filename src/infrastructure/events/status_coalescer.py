@@ -0,0 +1,108 @@
+"""
+Status Coalescer - Collapses bursts of job_status_update per job before delivery
+
+The first update for a job is forwarded at once and opens a window of
+NOTIFICATION_COALESCE_WINDOW_MS; updates arriving inside it replace each other and
+only the latest is forwarded when the window closes (opening the next one). So each
+job reaches clients at most once per window however chatty the workers are, with a
+trailing update carrying the final state. Terminal states (completed, failed) are
+never held or superseded: they are forwarded immediately, after any earlier flush of
+the same job, so clients always see them and in order.
+
+This runs on the delivering side (RedisNotificationSubscriber) and bounds socket
+writes only. Producers are not coalesced: every transition is a durable event log
+entry that replay depends on, and a job has few of them (its chatty progress
+messages are throttled separately by JOB_PROGRESS_MIN_INTERVAL_MS).
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Set
+
+from src.domain.entities import JobStatus
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = {JobStatus.COMPLETED.value, JobStatus.FAILED.value}
+
+
+def is_terminal(payload: Dict[str, Any]) -> bool:
+    return str(payload.get("status") or "").lower() in TERMINAL_STATUSES
+
+
+class StatusCoalescer:
+    """Per-job leading + trailing rate limit for status payloads (window_ms <= 0 disables)"""
+
+    def __init__(self, forward: Callable[[Dict[str, Any]], Awaitable[None]], window_ms: float = 100.0):
+        self.forward = forward
+        self.window_seconds = window_ms / 1000
+        self._windows: Dict[str, asyncio.TimerHandle] = {}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._flushing: Dict[str, asyncio.Task] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        # Metrics
+        self.forwarded = 0
+        self.superseded = 0
+
+    async def submit(self, payload: Dict[str, Any]) -> None:
+        job_id = payload.get("job_id")
+        if self.window_seconds <= 0 or not job_id:
+            await self._forward(payload)
+            return
+        if is_terminal(payload):
+            if self._pending.pop(job_id, None) is not None:
+                self.superseded += 1
+            await self._after_flush(job_id)
+            if job_id not in self._windows:
+                self._open_window(job_id)
+            await self._forward(payload)
+            return
+        if job_id in self._windows:
+            if job_id in self._pending:
+                self.superseded += 1
+            self._pending[job_id] = payload
+            return
+        self._open_window(job_id)
+        await self._after_flush(job_id)
+        await self._forward(payload)
+
+    async def _forward(self, payload: Dict[str, Any]) -> None:
+        self.forwarded += 1
+        await self.forward(payload)
+
+    async def _after_flush(self, job_id: str) -> None:
+        # A trailing update of this job still being forwarded goes out first
+        flushing = self._flushing.get(job_id)
+        if flushing is not None and not flushing.done():
+            await asyncio.shield(flushing)
+
+    def _open_window(self, job_id: str) -> None:
+        self._windows[job_id] = asyncio.get_running_loop().call_later(self.window_seconds, self._close_window, job_id)
+
+    def _close_window(self, job_id: str) -> None:
+        self._windows.pop(job_id, None)
+        payload = self._pending.pop(job_id, None)
+        if payload is None:
+            return
+        self._open_window(job_id)
+        task = asyncio.create_task(self._flush(job_id, payload))
+        self._flushing[job_id] = task
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, job_id: str, payload: Dict[str, Any]) -> None:
+        try:
+            await self._forward(payload)
+        except Exception:
+            logger.exception("[StatusCoalescer] forward failed job_id=%s", job_id)
+        finally:
+            if self._flushing.get(job_id) is asyncio.current_task():
+                del self._flushing[job_id]
+
+    def close(self) -> None:
+        """Cancel open windows; held (non-terminal) updates are discarded"""
+        for handle in self._windows.values():
+            handle.cancel()
+        self._windows.clear()
+        self._pending.clear()
+        for task in list(self._tasks):
+            task.cancel()
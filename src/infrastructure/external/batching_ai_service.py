@@ -0,0 +1,90 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from src.domain.services import AIService
+from src.domain.entities import JobType
+
+
+logger = logging.getLogger(__name__)
+
+
+class BatchingAIService(AIService):
+    """Micro-batcher in front of another AIService.
+
+    Concurrent `generate` calls for the same JobType are held for at most
+    `max_wait_ms` (or until `max_batch_size` are waiting) and sent to the inner
+    service as one `generate_batch` call; each caller gets its own result back, so
+    JobUseCases.process_job and its status updates stay per job.
+    """
+
+    def __init__(self, inner: AIService, max_batch_size: int = 16, max_wait_ms: float = 20.0):
+        self.inner = inner
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max_wait_ms / 1000.0
+        self._pending: Dict[JobType, List[Tuple[Dict[str, Any], asyncio.Future]]] = {}
+        self._timers: Dict[JobType, asyncio.TimerHandle] = {}
+        # Metrics
+        self.batches = 0
+        self.items = 0
+
+    async def generate(self, job_type: JobType, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(job_type, [])
+        pending.append((input_data, future))
+        if len(pending) >= self.max_batch_size:
+            self._flush(job_type)
+        elif len(pending) == 1:
+            self._timers[job_type] = loop.call_later(self.max_wait_seconds, self._flush, job_type)
+        return await future
+
+    async def generate_batch(
+        self, job_type: JobType, inputs: List[Dict[str, Any]]
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        return await self.inner.generate_batch(job_type, inputs)
+
+    async def generate_stream(self, job_type: JobType, input_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        # Streamed jobs want their own first token fast; they bypass batching
+        async for event in self.inner.generate_stream(job_type, input_data):
+            yield event
+
+    def _flush(self, job_type: JobType) -> None:
+        timer = self._timers.pop(job_type, None)
+        if timer is not None:
+            timer.cancel()
+        # Callers cancelled while waiting (e.g. soft time limit) are dropped from the batch
+        batch = [item for item in self._pending.pop(job_type, []) if not item[1].done()]
+        if batch:
+            asyncio.get_running_loop().create_task(self._dispatch(job_type, batch))
+
+    async def _dispatch(self, job_type: JobType, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        self.batches += 1
+        self.items += len(batch)
+        logger.debug("[BatchingAIService._dispatch] job_type=%s size=%s", job_type, len(batch))
+        try:
+            results = await self.inner.generate_batch(job_type, [input_data for input_data, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"generate_batch returned {len(results)} results for {len(batch)} inputs")
+        except Exception as e:
+            results = [e] * len(batch)
+        except BaseException:
+            # Cancelled (runtime shutdown, loop stopping): callers must not wait for the hard limit
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError(f"{job_type} batch was cancelled before it completed"))
+            raise
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": (self.items / self.batches) if self.batches else None,
+        }
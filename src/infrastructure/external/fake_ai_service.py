@@ -1,19 +1,62 @@
 import asyncio
 import random
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple, Union
 from src.domain.services import AIService
 from src.domain.entities import JobType
 
 
 class FakeAIService(AIService):
     """Fake AI service for testing and development"""
-    
+
+    def __init__(self, latency_range: Tuple[float, float] = (2, 5), batch_latency_seconds: Optional[float] = None):
+        # Per-call latency for generate(); per-batch latency for generate_batch() (defaults to the call latency)
+        self.latency_range = latency_range
+        self.batch_latency_seconds = batch_latency_seconds
+
     async def generate(self, job_type: JobType, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Simulate AI generation with fake processing time"""
         
         # Simulate processing time
-        await asyncio.sleep(random.uniform(2, 5))
-        
+        await asyncio.sleep(random.uniform(*self.latency_range))
+        return await self._generate_one(job_type, input_data)
+
+    async def generate_batch(
+        self, job_type: JobType, inputs: List[Dict[str, Any]]
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """Simulate a batched backend: one latency for the whole batch"""
+        if self.batch_latency_seconds is not None:
+            await asyncio.sleep(self.batch_latency_seconds)
+        else:
+            await asyncio.sleep(random.uniform(*self.latency_range))
+        results: List[Union[Dict[str, Any], Exception]] = []
+        for input_data in inputs:
+            try:
+                results.append(await self._generate_one(job_type, input_data))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    async def generate_stream(self, job_type: JobType, input_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Simulate streaming generation: the same total latency, spread over partial events"""
+        result = await self._generate_one(job_type, input_data)
+        output = result.get("output_data") or {}
+        if job_type == JobType.TEXT_GENERATION:
+            words = output.get("generated_text", "").split(" ")
+            pieces = [{"text": word if i == 0 else " " + word} for i, word in enumerate(words)]
+        elif job_type == JobType.AUDIO_GENERATION:
+            base = (result.get("artifact_url") or "").rsplit(".", 1)[0]
+            pieces = [{"audio_chunks": [f"{base}.part{i}.mp3"]} for i in range(4)]
+        else:
+            # Images have no useful partial output, only progress
+            pieces = [None] * 4
+
+        step_latency = random.uniform(*self.latency_range) / max(1, len(pieces))
+        for i, delta in enumerate(pieces, start=1):
+            await asyncio.sleep(step_latency)
+            yield {"progress": int(i * 100 / len(pieces)), "delta": delta}
+        yield {"result": result}
+
+    async def _generate_one(self, job_type: JobType, input_data: Dict[str, Any]) -> Dict[str, Any]:
         if job_type == JobType.AUDIO_GENERATION:
             return await self._generate_audio(input_data)
         elif job_type == JobType.TEXT_GENERATION:
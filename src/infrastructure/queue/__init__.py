@@ -1,6 +1,7 @@
-from .celery_queue_service import CeleryQueueService, celery_app
+from .celery_queue_service import CeleryQueueService, celery_app, task_publisher
 
 __all__ = [
     "CeleryQueueService",
     "celery_app",
+    "task_publisher",
 ]
@@ -1,9 +1,12 @@
 from celery import Celery
-from typing import Dict, Any
+from typing import Dict, Any, List, Sequence, Tuple
 from src.domain.services import QueueService
 import logging
 from src.config.settings import settings
 from kombu import Queue
+import asyncio
+from .task_publisher import TaskPublisher, PublishBufferFull
+from .queue_metrics import queue_metrics_collector
 
 
 # Celery configuration
@@ -51,12 +54,22 @@ celery_app.conf.update(
         'interval_step': 0.2,
         'interval_max': 1,
     },
-    broker_pool_limit=1,
+    # One connection per API publisher thread plus headroom for consumers and events
+    broker_pool_limit=settings.celery_broker_pool_limit,
     broker_heartbeat=30,
     broker_heartbeat_checkrate=2,
 )
 
 
+# Process-wide publisher shared by every CeleryQueueService instance
+task_publisher = TaskPublisher(
+    celery_app,
+    max_buffer=settings.enqueue_buffer_size,
+    max_batch=settings.enqueue_batch_size,
+    workers=settings.enqueue_publisher_threads,
+)
+
+
 class CeleryQueueService(QueueService):
     def __init__(self):
         self.celery = celery_app
@@ -81,57 +94,94 @@ class CeleryQueueService(QueueService):
                 job_id,
                 list(job_data.keys()) if isinstance(job_data, dict) else type(job_data).__name__,
             )
-            # Explicitly route to the configured queue to avoid any default-queue mismatches
-            result = process_job.apply_async(
-                args=(job_id, job_data),
-                queue=settings.celery_queue_name,
-                soft_time_limit=settings.celery_soft_time_limit,
-                time_limit=settings.celery_time_limit,
+            # Publish through the buffered publisher so broker I/O never runs on the event loop.
+            # Explicitly route to the configured queue to avoid any default-queue mismatches.
+            # On timeout the request is withdrawn from the buffer; one already being sent may
+            # still arrive late, which is harmless: the worker's guarded claim only moves a
+            # PENDING job, so a job marked FAILED is skipped without any status event.
+            task_id = await asyncio.wait_for(
+                task_publisher.publish(
+                    process_job,
+                    (job_id, job_data),
+                    queue=settings.celery_queue_name,
+                    soft_time_limit=settings.celery_soft_time_limit,
+                    time_limit=settings.celery_time_limit,
+                ),
+                timeout=settings.enqueue_timeout_seconds,
             )
             self.logger.info(
                 "[CeleryQueueService.enqueue_job] enqueued job_id=%s queue=%s task_id=%s",
                 job_id,
                 settings.celery_queue_name,
-                getattr(result, 'id', None),
+                task_id,
             )
             return True
+        except PublishBufferFull as e:
+            self.logger.error("[CeleryQueueService.enqueue_job] publish buffer full job_id=%s error=%s", job_id, e)
+            return False
+        except asyncio.TimeoutError:
+            self.logger.error(
+                "[CeleryQueueService.enqueue_job] publish timed out job_id=%s timeout=%ss",
+                job_id,
+                settings.enqueue_timeout_seconds,
+            )
+            return False
         except Exception as e:
             self.logger.exception("[CeleryQueueService.enqueue_job] failed job_id=%s error=%s", job_id, e)
             return False
 
-    async def get_queue_status(self) -> Dict[str, Any]:
-        """Get current queue status"""
+    async def enqueue_jobs(self, jobs: Sequence[Tuple[str, Dict[str, Any]]]) -> List[bool]:
+        """Add several jobs at once: buffered together, published in producer batches"""
+        if not jobs:
+            return []
         try:
-            self.logger.debug("[CeleryQueueService.get_queue_status] inspecting workers")
-            inspect = self.celery.control.inspect()
-            active_tasks = inspect.active() or {}
-            scheduled_tasks = inspect.scheduled() or {}
-            reserved_tasks = inspect.reserved() or {}
-            active_queues = inspect.active_queues() or {}
-            stats = inspect.stats() or {}
-            
-            status = {
-                "active_tasks": sum(len(v) for v in active_tasks.values()),
-                "scheduled_tasks": sum(len(v) for v in scheduled_tasks.values()),
-                "reserved_tasks": sum(len(v) for v in reserved_tasks.values()),
-                "workers": list(set(list(active_tasks.keys()) + list(scheduled_tasks.keys()) + list(reserved_tasks.keys()))),
-                "queues": {k: [q.get('name') for q in v] for k, v in active_queues.items()},
-                "broker": getattr(self.celery.conf, "broker_url", None),
-                "default_queue": getattr(self.celery.conf, "task_default_queue", None),
-                "queue_routes": self.celery.conf.task_routes,
-                "queue_name_used_for_enqueue": settings.celery_queue_name,
-                "pool_limit": getattr(self.celery.conf, "broker_pool_limit", None),
-                "heartbeat": getattr(self.celery.conf, "broker_heartbeat", None),
-                "heartbeat_checkrate": getattr(self.celery.conf, "broker_heartbeat_checkrate", None),
+            from .tasks import process_job
+            options = {
+                "queue": settings.celery_queue_name,
+                "soft_time_limit": settings.celery_soft_time_limit,
+                "time_limit": settings.celery_time_limit,
             }
-            self.logger.debug("[CeleryQueueService.get_queue_status] status=%s", status)
-            return status
+            # Same timeout semantics as enqueue_job: unsent requests are withdrawn
+            results = await asyncio.wait_for(
+                task_publisher.publish_many(
+                    [(process_job, (job_id, job_data), options) for job_id, job_data in jobs]
+                ),
+                timeout=settings.enqueue_timeout_seconds,
+            )
+        except PublishBufferFull as e:
+            self.logger.error("[CeleryQueueService.enqueue_jobs] publish buffer full count=%s error=%s", len(jobs), e)
+            return [False] * len(jobs)
+        except asyncio.TimeoutError:
+            self.logger.error(
+                "[CeleryQueueService.enqueue_jobs] publish timed out count=%s timeout=%ss",
+                len(jobs),
+                settings.enqueue_timeout_seconds,
+            )
+            return [False] * len(jobs)
         except Exception as e:
-            self.logger.exception("[CeleryQueueService.get_queue_status] error=%s", e)
-            return {
-                "error": str(e),
-                "active_tasks": 0,
-                "scheduled_tasks": 0,
-                "reserved_tasks": 0,
-                "workers": []
-            }
+            self.logger.exception("[CeleryQueueService.enqueue_jobs] failed count=%s error=%s", len(jobs), e)
+            return [False] * len(jobs)
+
+        ok = [not isinstance(result, Exception) for result in results]
+        self.logger.info(
+            "[CeleryQueueService.enqueue_jobs] enqueued=%s failed=%s queue=%s",
+            sum(ok),
+            len(ok) - sum(ok),
+            settings.celery_queue_name,
+        )
+        return ok
+
+    async def get_queue_status(self) -> Dict[str, Any]:
+        """Get current queue status from the background metrics snapshot (no worker broadcasts)"""
+        status = queue_metrics_collector.get_snapshot()
+        status.update({
+            "broker": getattr(self.celery.conf, "broker_url", None),
+            "default_queue": getattr(self.celery.conf, "task_default_queue", None),
+            "queue_routes": self.celery.conf.task_routes,
+            "queue_name_used_for_enqueue": settings.celery_queue_name,
+            "pool_limit": getattr(self.celery.conf, "broker_pool_limit", None),
+            "heartbeat": getattr(self.celery.conf, "broker_heartbeat", None),
+            "heartbeat_checkrate": getattr(self.celery.conf, "broker_heartbeat_checkrate", None),
+            "publisher": task_publisher.stats(),
+        })
+        return status
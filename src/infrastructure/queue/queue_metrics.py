@@ -0,0 +1,146 @@
+"""
+Queue Metrics Collector - Periodically samples broker queue depth and worker heartbeats
+
+Keeps the latest snapshot in memory so CeleryQueueService.get_queue_status can answer
+instantly instead of broadcasting inspect() calls and waiting for every worker.
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from src.config.settings import settings
+from src.infrastructure.database.redis_client import RedisClient
+from src.infrastructure.queue.worker_heartbeat import WORKER_HEARTBEATS_KEY
+
+logger = logging.getLogger(__name__)
+
+# kombu's Redis transport keeps one list per priority step: "<queue>", "<queue>\x06\x163", ...
+KOMBU_PRIORITY_SEPARATOR = "\x06\x16"
+KOMBU_PRIORITY_STEPS = (0, 3, 6, 9)
+# kombu's Redis transport tracks delivered-but-unacked messages in this hash
+KOMBU_UNACKED_KEY = "unacked"
+
+
+def _queue_keys(queue_name: str) -> List[str]:
+    return [queue_name if step == 0 else f"{queue_name}{KOMBU_PRIORITY_SEPARATOR}{step}" for step in KOMBU_PRIORITY_STEPS]
+
+
+class QueueMetricsCollector:
+    """Background sampler of Redis queue lengths and worker heartbeats"""
+
+    def __init__(self, queue_name: str, interval_seconds: float = 5.0, heartbeat_timeout_seconds: float = 10.0):
+        self.queue_name = queue_name
+        self.interval_seconds = interval_seconds
+        self.heartbeat_timeout_seconds = heartbeat_timeout_seconds
+        self._task: Optional[asyncio.Task] = None
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._sampled_at: Optional[float] = None
+        self._last_error: Optional[str] = None
+
+    async def start(self) -> None:
+        """Start sampling in the background"""
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run(), name="queue_metrics_collector")
+        logger.info("[QueueMetricsCollector] started interval=%ss queue=%s", self.interval_seconds, self.queue_name)
+
+    async def stop(self) -> None:
+        """Stop sampling"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        logger.info("[QueueMetricsCollector] stopped")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sample()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._last_error = str(e)
+                logger.warning("[QueueMetricsCollector] sample failed error=%s", e)
+            await asyncio.sleep(self.interval_seconds)
+
+    async def sample(self) -> Dict[str, Any]:
+        """Take one snapshot: O(1) Redis reads in a single round trip"""
+        r = RedisClient.get_client()
+        keys = _queue_keys(self.queue_name)
+        pipe = r.pipeline(transaction=False)
+        for key in keys:
+            pipe.llen(key)
+        pipe.hlen(KOMBU_UNACKED_KEY)
+        pipe.hgetall(WORKER_HEARTBEATS_KEY)
+        results = await pipe.execute()
+
+        queued = sum(int(n or 0) for n in results[: len(keys)])
+        unacked = int(results[len(keys)] or 0)
+        heartbeats = results[len(keys) + 1] or {}
+
+        now = time.time()
+        workers: Dict[str, Dict[str, Any]] = {}
+        stale: List[str] = []
+        expired: List[str] = []
+        for hostname, raw in heartbeats.items():
+            try:
+                record = json.loads(raw)
+            except Exception:
+                expired.append(hostname)
+                continue
+            age = now - float(record.get("ts", 0))
+            if age > self.heartbeat_timeout_seconds:
+                stale.append(hostname)
+                # Workers killed without a clean shutdown never remove their record
+                if age > self.heartbeat_timeout_seconds * 30:
+                    expired.append(hostname)
+                continue
+            workers[hostname] = record
+        if expired:
+            await r.hdel(WORKER_HEARTBEATS_KEY, *expired)
+
+        self._snapshot = {
+            "queued_tasks": queued,
+            "unacked_tasks": unacked,
+            "active_tasks": sum(int(w.get("active", 0)) for w in workers.values()),
+            "reserved_tasks": sum(int(w.get("reserved", 0)) for w in workers.values()),
+            "workers": sorted(workers.keys()),
+            "worker_details": workers,
+            "stale_workers": sorted(stale),
+        }
+        self._sampled_at = now
+        self._last_error = None
+        return self._snapshot
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        """Latest snapshot plus its age; never touches Redis"""
+        if self._snapshot is None:
+            return {
+                "error": self._last_error or "queue metrics not collected yet",
+                "queued_tasks": 0,
+                "unacked_tasks": 0,
+                "active_tasks": 0,
+                "reserved_tasks": 0,
+                "workers": [],
+                "snapshot_age_seconds": None,
+            }
+        snapshot = {
+            **self._snapshot,
+            "sampled_at": self._sampled_at,
+            "snapshot_age_seconds": round(time.time() - self._sampled_at, 3),
+        }
+        if self._last_error:
+            snapshot["error"] = self._last_error
+        return snapshot
+
+
+queue_metrics_collector = QueueMetricsCollector(
+    settings.celery_queue_name,
+    interval_seconds=settings.queue_metrics_interval_seconds,
+    heartbeat_timeout_seconds=settings.worker_heartbeat_timeout_seconds,
+)
@@ -0,0 +1,282 @@
+"""
+Stale Job Reaper - Requeues or fails jobs stuck in PENDING/PROCESSING
+
+A lost enqueue leaves a job PENDING forever, a killed worker leaves it PROCESSING;
+either way it also blocks its session's single active job. Every interval the reaper
+scans each status with an index range on {status, updated_at} (oldest first, bounded
+batches), then in one bulk_write per batch either puts the job back to PENDING and
+re-enqueues it, or marks it FAILED once it has been requeued REAPER_MAX_REQUEUES times.
+
+A PENDING job past its timeout is only presumed lost while the broker has no backlog
+(broker_backlog: messages still queued or prefetched by a worker and waiting for a
+slot). During a backlog it may simply not have been reached yet, and requeueing it
+would add a duplicate message and eventually fail a job that was never lost, so the
+PENDING pass is deferred until the queue drains (or the backlog is unknown).
+
+All API replicas run the loop; a Redis lease (SET NX PX, renewed by its holder) makes
+only one of them reap at a time. Every write is guarded on the status/updated_at it
+was selected with, and task claims are guarded too, so a job that moved on
+concurrently is left alone and an extra queue message is a no-op.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from src.config.settings import settings
+from src.domain.entities import JobStatus
+from src.domain.services import QueueService
+from src.infrastructure.database.mongodb import MongoDB
+from src.infrastructure.database.redis_client import RedisClient
+from src.infrastructure.events.simple_job_notifier import SimpleJobNotifier
+from src.infrastructure.queue.queue_metrics import queue_metrics_collector
+
+logger = logging.getLogger(__name__)
+
+LEASE_KEY = "ai_backend:stale_job_reaper:lease"
+
+# Acquire the lease, or extend it if this instance already holds it
+_ACQUIRE_OR_RENEW = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+if redis.call('set', KEYS[1], ARGV[1], 'NX', 'PX', ARGV[2]) then
+    return 1
+end
+return 0
+"""
+
+_RELEASE = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# Only what a requeue needs
+REAP_PROJECTION = {"_id": 1, "status": 1, "updated_at": 1, "user_id": 1, "session_id": 1,
+                   "job_type": 1, "input_data": 1, "requeue_count": 1}
+
+
+def plan_reap(
+    docs: List[Dict[str, Any]], status: JobStatus, cutoff: datetime, now: datetime, max_requeues: int, reason: str
+) -> Tuple[List[UpdateOne], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Build guarded bulk operations for expired jobs: (operations, requeued docs, failed docs)"""
+    operations: List[UpdateOne] = []
+    requeued: List[Dict[str, Any]] = []
+    failed: List[Dict[str, Any]] = []
+    for doc in docs:
+        # Still in the status and as old as when it was selected
+        guard = {"_id": doc["_id"], "status": status, "updated_at": {"$lt": cutoff}}
+        if int(doc.get("requeue_count", 0)) < max_requeues:
+            operations.append(UpdateOne(guard, {
+                "$set": {"status": JobStatus.PENDING, "updated_at": now},
+                "$unset": {"started_at": ""},
+                "$inc": {"requeue_count": 1},
+            }))
+            requeued.append(doc)
+        else:
+            operations.append(UpdateOne(guard, {
+                "$set": {"status": JobStatus.FAILED, "updated_at": now, "completed_at": now, "error_message": reason},
+            }))
+            failed.append(doc)
+    return operations, requeued, failed
+
+
+class StaleJobReaper:
+    """Periodic, lease-guarded requeue/fail of expired PENDING and PROCESSING jobs"""
+
+    def __init__(
+        self,
+        queue_service_factory,
+        interval_seconds: float = 30.0,
+        batch_size: int = 200,
+        max_batches: int = 10,
+        max_requeues: int = 2,
+        pending_timeout_seconds: float = 300.0,
+        processing_timeout_seconds: float = 180.0,
+        broker_backlog: Optional[Callable[[], Optional[int]]] = None,
+    ):
+        self.queue_service_factory = queue_service_factory
+        # Messages waiting in the broker, None if unknown; PENDING is reaped only at 0
+        self.broker_backlog = broker_backlog
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.max_requeues = max_requeues
+        self.timeouts = {
+            JobStatus.PENDING: pending_timeout_seconds,
+            JobStatus.PROCESSING: processing_timeout_seconds,
+        }
+        self.instance_id = uuid.uuid4().hex
+        self._task: Optional[asyncio.Task] = None
+        # Metrics
+        self.requeued = 0
+        self.failed = 0
+        self.pending_deferred = 0
+        self.last_run_at: Optional[datetime] = None
+
+    async def start(self) -> None:
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run(), name="stale_job_reaper")
+        logger.info("[StaleJobReaper] started interval=%ss instance=%s", self.interval_seconds, self.instance_id)
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await RedisClient.script(_RELEASE)(keys=[LEASE_KEY], args=[self.instance_id])
+        except Exception:
+            pass
+        logger.info("[StaleJobReaper] stopped")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if await self._acquire_lease():
+                    await self.reap_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("[StaleJobReaper] reap cycle failed")
+            await asyncio.sleep(self.interval_seconds)
+
+    async def _acquire_lease(self) -> bool:
+        # Outlives one missed cycle, so a stalled holder is replaced within ~3 intervals
+        lease_ms = int(self.interval_seconds * 3 * 1000)
+        return bool(await RedisClient.script(_ACQUIRE_OR_RENEW)(keys=[LEASE_KEY], args=[self.instance_id, lease_ms]))
+
+    async def reap_once(self) -> Dict[str, int]:
+        """One pass over both statuses; returns {"requeued": n, "failed": n}"""
+        totals = {"requeued": 0, "failed": 0}
+        for status, timeout in self.timeouts.items():
+            requeued, failed = await self._reap_status(status, timeout)
+            totals["requeued"] += requeued
+            totals["failed"] += failed
+        self.last_run_at = datetime.now(timezone.utc)
+        if totals["requeued"] or totals["failed"]:
+            logger.info("[StaleJobReaper] reaped requeued=%s failed=%s", totals["requeued"], totals["failed"])
+        return totals
+
+    async def _reap_status(self, status: JobStatus, timeout: float) -> Tuple[int, int]:
+        if status == JobStatus.PENDING and self.broker_backlog is not None:
+            backlog = self.broker_backlog()
+            if backlog is None or backlog > 0:
+                # Expired PENDING jobs may still be queued: not lost, just not reached yet
+                logger.debug("[StaleJobReaper] pending pass deferred backlog=%s", backlog)
+                self.pending_deferred += 1
+                return 0, 0
+        collection = MongoDB.get_database().jobs
+        now = datetime.now(timezone.utc)
+        # Millisecond precision (as stored) so the writes of this pass can be recognised below
+        now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+        cutoff = now - timedelta(seconds=timeout)
+        reason = f"Job stuck in {status.value} for more than {int(timeout)}s"
+        requeued_total = failed_total = 0
+        for _ in range(self.max_batches):
+            # Index: {status: 1, updated_at: 1}; reaped jobs leave the range, so no cursor is needed
+            docs = await collection.find(
+                {"status": status, "updated_at": {"$lt": cutoff}}, REAP_PROJECTION
+            ).sort("updated_at", 1).limit(self.batch_size).to_list(length=self.batch_size)
+            if not docs:
+                break
+            operations, requeued, failed = plan_reap(docs, status, cutoff, now, self.max_requeues, reason)
+            result = await collection.bulk_write(operations, ordered=False)
+            logger.debug(
+                "[StaleJobReaper] status=%s selected=%s modified=%s", status.value, len(docs), result.modified_count
+            )
+            if result.modified_count != len(operations):
+                # Some jobs moved on concurrently; only act on the ones this pass changed
+                applied = {
+                    doc["_id"] for doc in await collection.find(
+                        {"_id": {"$in": [doc["_id"] for doc in docs]}, "updated_at": now}, {"_id": 1}
+                    ).to_list(length=len(docs))
+                }
+                requeued = [doc for doc in requeued if doc["_id"] in applied]
+                failed = [doc for doc in failed if doc["_id"] in applied]
+            await self._requeue(requeued)
+            await self._notify(requeued, "PENDING", "Job requeued after timeout")
+            await self._notify(failed, "FAILED", reason)
+            requeued_total += len(requeued)
+            failed_total += len(failed)
+            if len(docs) < self.batch_size:
+                break
+        self.requeued += requeued_total
+        self.failed += failed_total
+        return requeued_total, failed_total
+
+    async def _requeue(self, docs: List[Dict[str, Any]]) -> None:
+        if not docs:
+            return
+        queue_service: QueueService = self.queue_service_factory()
+        results = await queue_service.enqueue_jobs([
+            (str(doc["_id"]), {
+                "job_id": str(doc["_id"]),
+                "job_type": doc["job_type"],
+                "input_data": doc.get("input_data") or {},
+                "user_id": doc.get("user_id"),
+                "session_id": doc.get("session_id"),
+            })
+            for doc in docs
+        ])
+        if not all(results):
+            # Left PENDING with a fresh updated_at: the next expiry retries (and counts) it
+            logger.warning("[StaleJobReaper] %s of %s requeues failed to publish", results.count(False), len(docs))
+
+    async def _notify(self, docs: List[Dict[str, Any]], status: str, message: str) -> None:
+        for doc in docs:
+            if not doc.get("user_id"):
+                continue
+            try:
+                await SimpleJobNotifier.notify_job_status(
+                    user_id=doc["user_id"],
+                    job_id=str(doc["_id"]),
+                    status=status,
+                    session_id=doc.get("session_id"),
+                    message=message,
+                )
+            except Exception:
+                logger.debug("[StaleJobReaper] notify failed job_id=%s", doc["_id"], exc_info=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requeued": self.requeued,
+            "failed": self.failed,
+            "pending_deferred": self.pending_deferred,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+        }
+
+
+def _broker_backlog() -> Optional[int]:
+    """Queued plus prefetched-but-not-started tasks from the latest queue metrics, None if unknown"""
+    snapshot = queue_metrics_collector.get_snapshot()
+    age = snapshot.get("snapshot_age_seconds")
+    if snapshot.get("error") or age is None or age > queue_metrics_collector.interval_seconds * 3:
+        return None
+    waiting = max(int(snapshot["reserved_tasks"]), int(snapshot["unacked_tasks"]) - int(snapshot["active_tasks"]))
+    return int(snapshot["queued_tasks"]) + waiting
+
+
+def _default_queue_service() -> QueueService:
+    from src.infrastructure.queue.celery_queue_service import CeleryQueueService
+    return CeleryQueueService()
+
+
+stale_job_reaper = StaleJobReaper(
+    _default_queue_service,
+    interval_seconds=settings.reaper_interval_seconds,
+    batch_size=settings.reaper_batch_size,
+    max_requeues=settings.reaper_max_requeues,
+    pending_timeout_seconds=settings.pending_timeout_seconds,
+    processing_timeout_seconds=settings.processing_timeout_seconds,
+    broker_backlog=_broker_backlog,
+)
@@ -0,0 +1,178 @@
+"""
+Task Publisher - Publishes Celery tasks from the async API without blocking the event loop
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from celery import Celery
+
+
+logger = logging.getLogger(__name__)
+
+
+class PublishBufferFull(Exception):
+    """Raised when the in-memory publish buffer is at capacity."""
+    pass
+
+
+@dataclass
+class _PublishRequest:
+    task: Any
+    args: Tuple[Any, ...]
+    options: Dict[str, Any]
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class TaskPublisher:
+    """Bounded buffer of publish requests drained by a small pool of publisher threads.
+
+    - `publish` never runs broker I/O on the event loop; it awaits a future instead
+    - Each drainer takes up to `max_batch` buffered requests and publishes them on one
+      producer/connection from Celery's pool, so concurrent requests share round trips
+    - When the buffer is full, `publish` fails fast with PublishBufferFull
+    - Cancelling `publish` (e.g. a caller's timeout) withdraws requests still in the
+      buffer; a request already handed to a publisher thread may still reach the broker
+    """
+
+    def __init__(self, app: Celery, max_buffer: int = 1000, max_batch: int = 50, workers: int = 4):
+        self.app = app
+        self.max_buffer = max_buffer
+        self.max_batch = max_batch
+        self.workers = workers
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._drainers: List[asyncio.Task] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Metrics
+        self.published = 0
+        self.failed = 0
+        self.rejected = 0
+        self.withdrawn = 0
+        self.batches = 0
+        self._latencies: Deque[float] = deque(maxlen=1000)
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._queue is not None:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_buffer)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="task-publisher")
+        self._drainers = [
+            loop.create_task(self._drain(), name=f"task_publisher_drainer_{n}")
+            for n in range(self.workers)
+        ]
+        logger.info(
+            "[TaskPublisher] started workers=%s max_buffer=%s max_batch=%s",
+            self.workers,
+            self.max_buffer,
+            self.max_batch,
+        )
+
+    async def publish(self, task: Any, args: Tuple[Any, ...], **options: Any) -> str:
+        """Buffer one task for publishing and wait for the broker to accept it; returns the task id."""
+        return (await self.publish_many([(task, args, options)]))[0]
+
+    async def publish_many(self, requests: Sequence[Tuple[Any, Tuple[Any, ...], Dict[str, Any]]]) -> List[Any]:
+        """Buffer several tasks at once. Returns a task id or the exception for each request."""
+        self._ensure_started()
+        if self._queue.qsize() + len(requests) > self.max_buffer:
+            self.rejected += len(requests)
+            raise PublishBufferFull(f"publish buffer full ({self._queue.qsize()}/{self.max_buffer})")
+        pending = []
+        for task, args, options in requests:
+            request = _PublishRequest(task=task, args=args, options=options, future=self._loop.create_future())
+            self._queue.put_nowait(request)
+            pending.append(request.future)
+        return list(await asyncio.gather(*pending, return_exceptions=True))
+
+    async def _drain(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            # Callers that gave up (cancelled) before the batch was taken are never published
+            live = [request for request in batch if not request.future.cancelled()]
+            self.withdrawn += len(batch) - len(live)
+            batch = live
+            if not batch:
+                continue
+            try:
+                results = await self._loop.run_in_executor(self._executor, self._publish_batch, batch)
+            except Exception as e:
+                results = [e] * len(batch)
+            self.batches += 1
+            now = time.perf_counter()
+            for request, result in zip(batch, results):
+                self._latencies.append(now - request.enqueued_at)
+                if isinstance(result, Exception):
+                    self.failed += 1
+                else:
+                    self.published += 1
+                if request.future.done():
+                    continue
+                if isinstance(result, Exception):
+                    request.future.set_exception(result)
+                else:
+                    request.future.set_result(result)
+
+    def _publish_batch(self, batch: List[_PublishRequest]) -> List[Any]:
+        """Runs in a publisher thread: one pooled producer for the whole batch."""
+        results: List[Any] = []
+        with self.app.producer_or_acquire() as producer:
+            for request in batch:
+                try:
+                    result = request.task.apply_async(args=request.args, producer=producer, **request.options)
+                    results.append(result.id)
+                except Exception as e:
+                    logger.warning("[TaskPublisher._publish_batch] publish failed error=%s", e)
+                    results.append(e)
+        return results
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Flush what is buffered (bounded by `timeout`), then stop the drainers and threads."""
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            deadline = time.monotonic() + timeout
+            while not self._queue.empty() and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+        for drainer in self._drainers:
+            drainer.cancel()
+        for drainer in self._drainers:
+            try:
+                await drainer
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._drainers = []
+        self._queue = None
+        self._loop = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        logger.info("[TaskPublisher] stopped")
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+
+        def pct(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 3)
+
+        return {
+            "buffer_depth": self._queue.qsize() if self._queue is not None else 0,
+            "buffer_capacity": self.max_buffer,
+            "published": self.published,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "withdrawn": self.withdrawn,
+            "batches": self.batches,
+            "enqueue_latency_ms_p50": pct(0.50),
+            "enqueue_latency_ms_p99": pct(0.99),
+        }
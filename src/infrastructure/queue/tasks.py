@@ -4,14 +4,39 @@ from src.infrastructure.queue.celery_queue_service import celery_app
 from src.application.use_cases import JobUseCases
 from src.infrastructure.repositories import MongoJobRepository
 from src.infrastructure.external.fake_ai_service import FakeAIService
+from src.infrastructure.external.batching_ai_service import BatchingAIService
 #from src.infrastructure.storage.s3_storage_service import FakeStorageService
 from src.infrastructure.queue.celery_queue_service import CeleryQueueService
-from src.infrastructure.database.mongodb import MongoDB
 from src.domain.entities import JobStatus
 from src.infrastructure.events.simple_job_notifier import SimpleJobNotifier
-import asyncio
+from src.infrastructure.events.job_progress_publisher import JobProgressPublisher
+from src.infrastructure.queue import worker_heartbeat  # noqa: F401  (registers heartbeat signal handlers)
+from src.infrastructure.queue.worker_runtime import worker_runtime
+from src.infrastructure.cache import result_cache
 import logging
 from src.config.settings import settings
+from src.domain.services import AIService
+from typing import Optional
+
+
+STREAM_JOB_TYPES = {t.strip() for t in settings.job_stream_job_types.split(",") if t.strip()}
+
+# Process-wide AI service so concurrent jobs (async worker mode) can share micro-batches
+_ai_service: Optional[AIService] = None
+
+
+def _get_ai_service() -> AIService:
+    global _ai_service
+    if _ai_service is None:
+        ai_service: AIService = FakeAIService(batch_latency_seconds=settings.fake_ai_batch_latency_seconds)
+        if worker_runtime.threaded and settings.ai_batch_max_size > 1:
+            ai_service = BatchingAIService(
+                ai_service,
+                max_batch_size=settings.ai_batch_max_size,
+                max_wait_ms=settings.ai_batch_max_wait_ms,
+            )
+        _ai_service = ai_service
+    return _ai_service
 
 
 @celery_app.task(soft_time_limit=settings.celery_soft_time_limit, time_limit=settings.celery_time_limit)
@@ -22,20 +47,21 @@ def process_job(job_id: str, job_data: dict):
         logger.info("[tasks.process_job] start job_id=%s user_id=%s session_id=%s", 
                    job_id, job_data.get('user_id'), job_data.get('session_id'))
         
-        # Notify job started
         user_id = job_data.get('user_id')
         session_id = job_data.get('session_id')
-        if user_id:
-            SimpleJobNotifier.notify_job_status_sync(
-                user_id=user_id,
-                job_id=job_id,
-                status='PROCESSING',
-                session_id=session_id
-            )
-        
-        # Run async job processing
-        processed_ok = asyncio.run(_process_job_async(job_id, job_data))
-        if processed_ok:
+
+        # Run async job processing (PROCESSING is announced by process_job once it has claimed the job)
+        # In async mode the loop enforces the soft limit (threads pool has no signal-based limit)
+        job = worker_runtime.run(
+            _process_job_async(job_id, job_data),
+            timeout=settings.celery_soft_time_limit if worker_runtime.threaded else None,
+            job_type=job_data.get('job_type'),
+        )
+        if job is None:
+            # Missing, already claimed by an earlier delivery, or finalized elsewhere: nothing to announce
+            logger.info("[tasks.process_job] skipped (not pending or already finalized) job_id=%s", job_id)
+            return {"status": "skipped", "job_id": job_id}
+        if job.status == JobStatus.COMPLETED:
             logger.info("[tasks.process_job] completed job_id=%s", job_id)
             # Notify job completed
             if user_id:
@@ -47,7 +73,7 @@ def process_job(job_id: str, job_data: dict):
                 )
             return {"status": "completed", "job_id": job_id}
         else:
-            logger.warning("[tasks.process_job] processing failed or job not found job_id=%s", job_id)
+            logger.warning("[tasks.process_job] processing failed job_id=%s", job_id)
             # Notify job failed
             if user_id:
                 SimpleJobNotifier.notify_job_status_sync(
@@ -55,14 +81,14 @@ def process_job(job_id: str, job_data: dict):
                     job_id=job_id,
                     status='FAILED',
                     session_id=session_id,
-                    message='Processing failed or job not found'
+                    message=job.error_message or 'Processing failed'
                 )
             return {"status": "failed", "job_id": job_id}
     except SoftTimeLimitExceeded as e:
         logging.warning("[tasks.process_job] soft time limit exceeded job_id=%s limit=%ss", job_id, settings.celery_soft_time_limit)
         # Best-effort mark job as failed due to timeout
         try:
-            asyncio.run(_mark_job_failed_async(job_id, f"Timed out after {settings.celery_soft_time_limit}s"))
+            worker_runtime.run(_mark_job_failed_async(job_id, f"Timed out after {settings.celery_soft_time_limit}s"))
         except Exception:
             logging.debug("[tasks.process_job] failed to mark job as FAILED on timeout job_id=%s", job_id)
         return {"status": "failed", "job_id": job_id, "error": "soft_time_limit_exceeded"}
@@ -83,39 +109,44 @@ def process_job(job_id: str, job_data: dict):
 
 
 async def _process_job_async(job_id: str, job_data: dict):
-    """Async job processing logic"""
-    # Fresh DB connection per task to avoid event loop reuse issues
-    logging.debug(
-        "[tasks._process_job_async] connecting MongoDB url=%s db=%s",
-        settings.mongodb_url,
-        settings.database_name,
-    )
-    await MongoDB.connect_to_mongo(settings.mongodb_url, settings.database_name)
-    try:
-        # Initialize services
-        job_repository = MongoJobRepository()
-        ai_service = FakeAIService()
-        #storage_service = FakeStorageService()
-        queue_service = CeleryQueueService()
-        
-        # Initialize use case
-        job_use_cases = JobUseCases(job_repository, queue_service, ai_service)
+    """Async job processing logic (runs on the worker process loop, reusing its Mongo client)"""
+    # Initialize services
+    job_repository = MongoJobRepository()
+    ai_service = _get_ai_service()
+    #storage_service = FakeStorageService()
+    queue_service = CeleryQueueService()
+
+    # Initialize use case
+    job_use_cases = JobUseCases(job_repository, queue_service, ai_service, result_cache, SimpleJobNotifier())
 
-        # Process the job
+    # Stream partial output to the user's sockets for job types where latency to first output matters
+    user_id = job_data.get('user_id')
+    if not user_id or job_data.get('job_type') not in STREAM_JOB_TYPES:
         logging.debug("[tasks._process_job_async] calling JobUseCases.process_job job_id=%s", job_id)
         return await job_use_cases.process_job(job_id)
+
+    async def publish(progress, partial):
+        await SimpleJobNotifier.notify_job_progress(
+            user_id=user_id,
+            job_id=job_id,
+            progress=progress,
+            partial=partial,
+            session_id=job_data.get('session_id'),
+        )
+
+    progress_publisher = JobProgressPublisher(publish, settings.job_progress_min_interval_ms / 1000.0)
+    logging.debug("[tasks._process_job_async] calling JobUseCases.process_job (streaming) job_id=%s", job_id)
+    try:
+        return await job_use_cases.process_job(job_id, on_progress=progress_publisher.push)
     finally:
-        await MongoDB.close_mongo_connection()
+        # Flush the tail before process_job's caller publishes the terminal status
+        await progress_publisher.close()
 
 
 async def _mark_job_failed_async(job_id: str, message: str):
     """Best-effort failure marker used by timeout handler."""
-    await MongoDB.connect_to_mongo(settings.mongodb_url, settings.database_name)
-    try:
-        job_repository = MongoJobRepository()
-        ai_service = FakeAIService()
-        queue_service = CeleryQueueService()
-        job_use_cases = JobUseCases(job_repository, queue_service, ai_service)
-        await job_use_cases.update_job_status(job_id, JobStatus.FAILED, error_message=message)
-    finally:
-        await MongoDB.close_mongo_connection()
+    job_repository = MongoJobRepository()
+    ai_service = FakeAIService()
+    queue_service = CeleryQueueService()
+    job_use_cases = JobUseCases(job_repository, queue_service, ai_service)
+    await job_use_cases.update_job_status(job_id, JobStatus.FAILED, error_message=message)
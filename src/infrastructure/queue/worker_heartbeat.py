@@ -0,0 +1,61 @@
+"""
+Worker Heartbeat - Publishes a small liveness/load record per worker into Redis
+
+Piggybacks on Celery's own heartbeat timer (heartbeat_sent, every ~2s with events
+enabled) so the API can read worker state with one HGETALL instead of broadcasting
+inspect() calls to the whole cluster.
+"""
+import json
+import logging
+import os
+import time
+from typing import Optional
+
+import redis
+from celery.signals import heartbeat_sent, worker_shutdown
+from celery.worker import state as worker_state
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Hash of { hostname: json heartbeat record }
+WORKER_HEARTBEATS_KEY = "ai_backend:worker_heartbeats"
+
+_redis: Optional[redis.Redis] = None
+
+
+def _get_redis() -> redis.Redis:
+    global _redis
+    if _redis is None:
+        _redis = redis.from_url(settings.redis_url, decode_responses=True)
+    return _redis
+
+
+@heartbeat_sent.connect
+def record_worker_heartbeat(sender=None, **kwargs):
+    """Write this worker's heartbeat record (runs in the worker's main process)."""
+    try:
+        hostname = sender.eventer.hostname
+        record = {
+            "hostname": hostname,
+            "pid": os.getpid(),
+            "ts": time.time(),
+            "active": len(worker_state.active_requests),
+            "reserved": len(worker_state.reserved_requests),
+            "processed": sum(worker_state.total_count.values()),
+        }
+        _get_redis().hset(WORKER_HEARTBEATS_KEY, hostname, json.dumps(record))
+    except Exception:
+        logger.debug("[worker_heartbeat] failed to record heartbeat", exc_info=True)
+
+
+@worker_shutdown.connect
+def clear_worker_heartbeat(sender=None, **kwargs):
+    """Remove this worker's record so it disappears from the snapshot immediately."""
+    try:
+        hostname = getattr(sender, "hostname", None)
+        if hostname:
+            _get_redis().hdel(WORKER_HEARTBEATS_KEY, hostname)
+    except Exception:
+        logger.debug("[worker_heartbeat] failed to clear heartbeat", exc_info=True)
@@ -0,0 +1,187 @@
+"""
+Worker Runtime - One event loop and one Mongo client per Celery worker process
+
+Tasks used to call asyncio.run() and connect/close MongoDB per job, paying for a new
+loop, a new Motor client and a new connection pool every time. The runtime creates
+them once at worker_process_init and reuses them for every task in that process.
+
+Two execution modes (WORKER_MODE):
+- "prefork": one task at a time per process; the loop runs inside the task call
+- "async": the worker uses Celery's threads pool purely as concurrency slots; the loop
+  runs forever in its own thread and every slot submits its job coroutine to it, so
+  up to WORKER_ASYNC_CONCURRENCY I/O-bound jobs share one loop and one Mongo pool.
+  The threads pool does not enforce Celery's hard time_limit; the soft limit, applied
+  with asyncio.wait_for on the loop, is the only bound on a job in this mode
+"""
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Awaitable, Dict, Optional
+
+from celery.exceptions import SoftTimeLimitExceeded
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
+
+from src.config.settings import settings
+from src.infrastructure.database.mongodb import MongoDB
+from src.infrastructure.database.redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+
+def parse_job_type_limits(raw: Optional[str]) -> Dict[str, int]:
+    """Parse "audio_generation=8,image_generation=4" into {job_type: limit}."""
+    limits: Dict[str, int] = {}
+    for part in (raw or "").split(","):
+        if "=" not in part:
+            continue
+        job_type, _, value = part.partition("=")
+        try:
+            limits[job_type.strip()] = int(value)
+        except ValueError:
+            logger.warning("[WorkerRuntime] ignoring invalid job type limit %r", part)
+    return limits
+
+
+class WorkerRuntime:
+    """Per-process event loop with long-lived Mongo/Redis clients"""
+
+    def __init__(self, threaded: bool = False, job_type_limits: Optional[Dict[str, int]] = None):
+        self.threaded = threaded
+        self.job_type_limits = job_type_limits or {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pid: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        # Created lazily on the loop: one semaphore per limited job type
+        self._job_type_slots: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def started(self) -> bool:
+        return self.loop is not None and self._pid == os.getpid() and not self.loop.is_closed()
+
+    def start(self) -> None:
+        """Create the process loop and connect MongoDB on it (idempotent per process)"""
+        with self._start_lock:
+            if self.started:
+                return
+            self.loop = asyncio.new_event_loop()
+            self._pid = os.getpid()
+            self._job_type_slots = {}
+            if self.threaded:
+                self._thread = threading.Thread(target=self.loop.run_forever, name="worker-runtime-loop", daemon=True)
+                self._thread.start()
+                asyncio.run_coroutine_threadsafe(
+                    MongoDB.connect_to_mongo(settings.mongodb_url, settings.database_name), self.loop
+                ).result()
+            else:
+                asyncio.set_event_loop(self.loop)
+                self.loop.run_until_complete(MongoDB.connect_to_mongo(settings.mongodb_url, settings.database_name))
+            logger.info(
+                "[WorkerRuntime] started pid=%s threaded=%s job_type_limits=%s",
+                self._pid,
+                self.threaded,
+                self.job_type_limits,
+            )
+
+    def _slot(self, job_type: Optional[str]) -> Optional[asyncio.Semaphore]:
+        limit = self.job_type_limits.get(job_type) if job_type else None
+        if not limit:
+            return None
+        slot = self._job_type_slots.get(job_type)
+        if slot is None:
+            slot = asyncio.Semaphore(limit)
+            self._job_type_slots[job_type] = slot
+        return slot
+
+    async def _guarded(self, coro: Awaitable[Any], timeout: Optional[float], job_type: Optional[str]) -> Any:
+        slot = self._slot(job_type)
+        if slot is not None:
+            await slot.acquire()
+        try:
+            if timeout is None:
+                return await coro
+            try:
+                # Threads pool has no signal-based soft limit; enforce it on the loop instead.
+                # The clock starts once the job holds its job-type slot.
+                return await asyncio.wait_for(coro, timeout)
+            except asyncio.TimeoutError:
+                raise SoftTimeLimitExceeded(f"job exceeded {timeout}s")
+        finally:
+            if slot is not None:
+                slot.release()
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None, job_type: Optional[str] = None) -> Any:
+        """Run a coroutine to completion on the process loop.
+
+        - `timeout` raises SoftTimeLimitExceeded when exceeded (used in async mode)
+        - `job_type` waits for that type's concurrency slot first, if a limit is configured
+
+        If the wait is interrupted (e.g. SoftTimeLimitExceeded raised by Celery's signal
+        handler), the coroutine is cancelled so it cannot resume during the next task.
+        """
+        if not self.started:
+            # Pools that don't send worker_process_init (solo/threads) start lazily
+            self.start()
+        guarded = self._guarded(coro, timeout, job_type)
+        if self.threaded:
+            future = asyncio.run_coroutine_threadsafe(guarded, self.loop)
+            try:
+                return future.result()
+            except BaseException:
+                future.cancel()
+                raise
+        task = self.loop.create_task(guarded)
+        try:
+            return self.loop.run_until_complete(task)
+        except BaseException:
+            if not task.done():
+                task.cancel()
+                try:
+                    self.loop.run_until_complete(task)
+                except BaseException:
+                    pass
+            raise
+
+    def shutdown(self) -> None:
+        """Close clients and the loop (only in the process that started them)"""
+        if not self.started:
+            return
+        try:
+            self.run(MongoDB.close_mongo_connection())
+            self.run(RedisClient.close())
+            self.run(self.loop.shutdown_asyncgens())
+        except Exception:
+            logger.exception("[WorkerRuntime] error during shutdown")
+        finally:
+            if self.threaded:
+                self.loop.call_soon_threadsafe(self.loop.stop)
+                if self._thread is not None:
+                    self._thread.join(timeout=5)
+                self._thread = None
+            self.loop.close()
+            self.loop = None
+            self._pid = None
+            logger.info("[WorkerRuntime] stopped pid=%s", os.getpid())
+
+
+worker_runtime = WorkerRuntime(
+    threaded=settings.worker_mode == "async",
+    job_type_limits=parse_job_type_limits(settings.worker_job_type_limits),
+)
+
+
+@worker_process_init.connect
+def _start_worker_runtime(**kwargs):
+    worker_runtime.start()
+
+
+@worker_process_shutdown.connect
+def _stop_worker_runtime(**kwargs):
+    worker_runtime.shutdown()
+
+
+@worker_shutdown.connect
+def _stop_worker_runtime_main(**kwargs):
+    # solo/threads pools run tasks in the main process and never send worker_process_shutdown
+    worker_runtime.shutdown()
@@ -0,0 +1,222 @@
+"""
+Index Registry - Declares the MongoDB indexes every repository query needs
+
+`ensure_indexes` creates them at API startup (idempotent; existing indexes with the
+same keys are left alone), so environments no longer depend on init-mongo.js having
+run on a fresh volume. Unique indexes enforce invariants (one active job per session
+exists only as the partial unique index), so failing to build one is fatal while a
+missing performance index is only logged; duplicate active jobs left by older
+versions are failed first (dedupe_active_jobs) so that index can be built.
+`check_query_plans` explains each registered query shape and reports any that would
+scan the collection or sort in memory:
+
+    python -m src.infrastructure.repositories.indexes --check
+
+When a repository query changes, update its shape in QUERY_SHAPES (and its index).
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from src.domain.entities import JobStatus, PageCursor
+from src.infrastructure.repositories.mongo_job_repository import ACTIVE_STATUSES
+from src.infrastructure.repositories.pagination import KEYSET_SORT, keyset_query
+
+logger = logging.getLogger(__name__)
+
+# Default index names are used so indexes created by init-mongo.js are recognised as the same index
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("clerk_id", ASCENDING)], unique=True),
+        IndexModel([("email", ASCENDING)], unique=True),
+        # list_users (keyset)
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ],
+    "jobs": [
+        # get_by_user_id / get_summaries_by_user_id (keyset)
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+        # get_by_status (keyset)
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+        # list_jobs (keyset)
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+        # Stale job reaper: oldest PENDING/PROCESSING first
+        IndexModel([("status", ASCENDING), ("updated_at", ASCENDING)]),
+        # Single active (pending/processing) job per user session, enforced on insert
+        IndexModel(
+            [("user_id", ASCENDING), ("session_id", ASCENDING)],
+            unique=True,
+            partialFilterExpression={"session_id": {"$type": "string"}, "status": {"$in": ACTIVE_STATUSES}},
+        ),
+    ],
+}
+
+# Stages that mean a query is not served by an index range in the right order
+PROBLEM_STAGES = {"COLLSCAN": "collection scan", "SORT": "in-memory sort"}
+
+
+@dataclass
+class QueryShape:
+    """A representative repository query (sample values, real filter/sort shape)"""
+    name: str
+    collection: str
+    filter: Dict[str, Any]
+    sort: Optional[List[Tuple[str, int]]] = None
+    limit: int = 101
+    projection: Optional[Dict[str, Any]] = field(default=None)
+
+
+def _sample_cursor() -> PageCursor:
+    return PageCursor(created_at=datetime(2024, 1, 1, tzinfo=timezone.utc), id=str(ObjectId()))
+
+
+QUERY_SHAPES: List[QueryShape] = [
+    QueryShape("users.list_users", "users", {}, KEYSET_SORT),
+    QueryShape("users.list_users(cursor)", "users", keyset_query({}, _sample_cursor()), KEYSET_SORT),
+    QueryShape("users.get_by_clerk_id", "users", {"clerk_id": "user_sample"}, limit=1),
+    QueryShape("users.get_by_email", "users", {"email": "sample@example.com"}, limit=1),
+    QueryShape("jobs.get_by_user_id", "jobs", {"user_id": "user_sample"}, KEYSET_SORT),
+    QueryShape("jobs.get_by_user_id(cursor)", "jobs", keyset_query({"user_id": "user_sample"}, _sample_cursor()), KEYSET_SORT),
+    QueryShape("jobs.get_by_status", "jobs", {"status": JobStatus.PENDING.value}, KEYSET_SORT),
+    QueryShape("jobs.get_by_status(cursor)", "jobs", keyset_query({"status": JobStatus.PENDING.value}, _sample_cursor()), KEYSET_SORT),
+    QueryShape("jobs.list_jobs", "jobs", {}, KEYSET_SORT),
+    QueryShape(
+        "jobs.reaper_expired",
+        "jobs",
+        {"status": JobStatus.PROCESSING.value, "updated_at": {"$lt": datetime(2024, 1, 1, tzinfo=timezone.utc)}},
+        [("updated_at", ASCENDING)],
+        limit=200,
+    ),
+    QueryShape(
+        "jobs.active_job_conflict",
+        "jobs",
+        {"user_id": "user_sample", "session_id": {"$type": "string", "$in": ["s1", "s2"]}, "status": {"$in": ACTIVE_STATUSES}},
+        limit=0,
+    ),
+]
+
+
+DUPLICATE_ACTIVE_JOB_MESSAGE = "Superseded: another job was already active for this session"
+
+
+async def dedupe_active_jobs(database: AsyncIOMotorDatabase) -> int:
+    """Fail all but the oldest active job of each user session; returns how many were failed"""
+    groups = database.jobs.aggregate([
+        {"$match": {"session_id": {"$type": "string"}, "status": {"$in": ACTIVE_STATUSES}}},
+        {"$sort": {"created_at": 1, "_id": 1}},
+        {"$group": {"_id": {"user_id": "$user_id", "session_id": "$session_id"}, "ids": {"$push": "$_id"}}},
+        {"$match": {"ids.1": {"$exists": True}}},
+    ])
+    duplicates = [job_id async for group in groups for job_id in group["ids"][1:]]
+    if not duplicates:
+        return 0
+    now = datetime.now(timezone.utc)
+    result = await database.jobs.update_many(
+        {"_id": {"$in": duplicates}, "status": {"$in": ACTIVE_STATUSES}},
+        {"$set": {"status": JobStatus.FAILED.value, "error_message": DUPLICATE_ACTIVE_JOB_MESSAGE,
+                  "completed_at": now, "updated_at": now}},
+    )
+    logger.warning("[indexes.dedupe_active_jobs] failed duplicate active jobs count=%s", result.modified_count)
+    return result.modified_count
+
+
+async def ensure_indexes(database: AsyncIOMotorDatabase) -> None:
+    """Create every registered index that does not exist yet.
+
+    Raises if a unique index cannot be created; other failures are logged.
+    """
+    await dedupe_active_jobs(database)
+    for collection_name, models in INDEXES.items():
+        for model in models:
+            try:
+                name = await database[collection_name].create_indexes([model])
+            except Exception:
+                if model.document.get("unique"):
+                    logger.error("[indexes.ensure_indexes] constraint index failed collection=%s index=%s",
+                                 collection_name, model.document["name"])
+                    raise
+                logger.exception("[indexes.ensure_indexes] index failed collection=%s index=%s",
+                                 collection_name, model.document["name"])
+                continue
+            logger.info("[indexes.ensure_indexes] collection=%s index=%s", collection_name, name)
+
+
+async def missing_constraint_indexes(database: AsyncIOMotorDatabase) -> List[str]:
+    """Names of registered unique indexes that do not exist (for deployments managing indexes themselves)"""
+    missing: List[str] = []
+    for collection_name, models in INDEXES.items():
+        existing = await database[collection_name].index_information()
+        for model in models:
+            if model.document.get("unique") and model.document["name"] not in existing:
+                missing.append(f"{collection_name}.{model.document['name']}")
+    return missing
+
+
+def plan_problems(explain: Dict[str, Any]) -> List[str]:
+    """Return the problem stages (COLLSCAN, blocking SORT) found in an explain() winning plan"""
+    planner = explain.get("queryPlanner", explain)
+    found: List[str] = []
+
+    def walk(node: Any) -> None:
+        if isinstance(node, dict):
+            stage = node.get("stage")
+            if stage in PROBLEM_STAGES:
+                found.append(f"{stage} ({PROBLEM_STAGES[stage]})")
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(planner.get("winningPlan", {}))
+    return found
+
+
+async def check_query_plans(database: AsyncIOMotorDatabase) -> Dict[str, List[str]]:
+    """Explain every registered query shape; returns {query name: problems} for failing ones"""
+    failures: Dict[str, List[str]] = {}
+    for shape in QUERY_SHAPES:
+        cursor = database[shape.collection].find(shape.filter, shape.projection)
+        if shape.sort:
+            cursor = cursor.sort(shape.sort)
+        if shape.limit:
+            cursor = cursor.limit(shape.limit)
+        problems = plan_problems(await cursor.explain())
+        if problems:
+            failures[shape.name] = problems
+            logger.warning("[indexes.check_query_plans] query=%s problems=%s", shape.name, problems)
+        else:
+            logger.debug("[indexes.check_query_plans] query=%s ok", shape.name)
+    return failures
+
+
+async def _main(check: bool) -> int:
+    from src.config.settings import settings
+    from src.infrastructure.database.mongodb import MongoDB
+
+    await MongoDB.connect_to_mongo(settings.mongodb_url, settings.database_name)
+    try:
+        database = MongoDB.get_database()
+        await ensure_indexes(database)
+        if not check:
+            return 0
+        failures = await check_query_plans(database)
+        for name, problems in failures.items():
+            print(f"FAIL {name}: {', '.join(problems)}")
+        print(f"{len(QUERY_SHAPES) - len(failures)}/{len(QUERY_SHAPES)} query shapes use an index without an in-memory sort")
+        return 1 if failures else 0
+    finally:
+        await MongoDB.close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ensure MongoDB indexes and optionally verify query plans")
+    parser.add_argument("--check", action="store_true", help="explain every registered query; exit 1 on COLLSCAN or in-memory SORT")
+    sys.exit(asyncio.run(_main(parser.parse_args().check)))
@@ -1,12 +1,30 @@
-from typing import Optional, List
+from typing import Dict, Iterable, Optional, List, Sequence, Union
 from datetime import datetime, timezone
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from src.domain.repositories import JobRepository
-from src.domain.entities import Job, JobCreate, JobUpdate, JobStatus
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from src.domain.repositories import JobRepository, ActiveJobExistsError
+from src.domain.entities import Job, JobSummary, JobCreate, JobUpdate, JobStatus, Page, PageCursor
 from src.infrastructure.database.mongodb import MongoDB
+from src.infrastructure.repositories.pagination import fetch_page
 import logging
 
 
+# Only the fields JobSummary needs; input_data/output_data stay on the server
+JOB_SUMMARY_PROJECTION = {
+    field.alias or name: 1 for name, field in JobSummary.model_fields.items()
+}
+
+ACTIVE_STATUSES = [JobStatus.PENDING.value, JobStatus.PROCESSING.value]
+
+
+def is_active_session_conflict(details: Optional[dict]) -> bool:
+    """True for a duplicate key on the partial unique {user_id, session_id} index of active jobs"""
+    return bool(details) and details.get("code", 11000) == 11000 and "session_id" in (details.get("keyPattern") or {})
+
+
 class MongoJobRepository(JobRepository):
     def __init__(self):
         self.database = MongoDB.get_database()
@@ -17,81 +35,144 @@ class MongoJobRepository(JobRepository):
         job_dict["status"] = JobStatus.PENDING
         job_dict["created_at"] = datetime.now(timezone.utc)
         job_dict["updated_at"] = datetime.now(timezone.utc)
-        
-        result = await self.collection.insert_one(job_dict)
-        job_dict["_id"] = result.inserted_id
-        
-        return Job(**job_dict)
 
-    async def get_by_id(self, job_id: str) -> Optional[Job]:
-        from bson import ObjectId
+        # The partial unique index on active {user_id, session_id} makes this insert the
+        # single-active-job check; the holder's id is only looked up on conflict
+        for attempt in range(2):
+            try:
+                result = await self.collection.insert_one(dict(job_dict))
+            except DuplicateKeyError as e:
+                if not is_active_session_conflict(e.details):
+                    raise
+                existing = await self._active_job_ids(job_data.user_id, [job_data.session_id])
+                if job_data.session_id in existing:
+                    raise ActiveJobExistsError(existing[job_data.session_id])
+                # The active job finished in between; the session is free again
+                logging.debug("[MongoJobRepository.create] session freed during conflict, retrying attempt=%s", attempt)
+                continue
+            job_dict["_id"] = result.inserted_id
+            return Job(**job_dict)
+        raise RuntimeError("Active job conflict; session was freed, retry")
+
+    async def create_many(self, jobs_data: Sequence[JobCreate]) -> List[Union[Job, Exception]]:
+        now = datetime.now(timezone.utc)
+        job_dicts = []
+        for job_data in jobs_data:
+            job_dict = job_data.dict()
+            # Ids assigned client-side so results map back to inputs even on partial failure
+            job_dict["_id"] = ObjectId()
+            job_dict["status"] = JobStatus.PENDING
+            job_dict["created_at"] = now
+            job_dict["updated_at"] = now
+            job_dicts.append(job_dict)
+        if not job_dicts:
+            return []
+
+        write_errors: Dict[int, Exception] = {}
         try:
-            job_doc = await self.collection.find_one({"_id": ObjectId(job_id)})
-            if job_doc:
-                logging.debug("[MongoJobRepository.get_by_id] found job id=%s", job_id)
-                return Job(**job_doc)
-            logging.warning("[MongoJobRepository.get_by_id] job not found id=%s", job_id)
-            return None
-        except Exception as e:
-            logging.exception("[MongoJobRepository.get_by_id] error fetching job id=%s error=%s", job_id, e)
-            return None
+            # Unordered: one failing document does not stop the rest of the batch
+            await self.collection.insert_many(job_dicts, ordered=False)
+        except BulkWriteError as e:
+            conflicts: Dict[int, str] = {}
+            for error in e.details.get("writeErrors", []):
+                if is_active_session_conflict(error):
+                    conflicts[error["index"]] = job_dicts[error["index"]]["session_id"]
+                else:
+                    write_errors[error["index"]] = RuntimeError(error.get("errmsg", "insert failed"))
+            if conflicts:
+                # Holders may be older jobs or earlier items of this batch
+                user_id = job_dicts[next(iter(conflicts))]["user_id"]
+                existing = await self._active_job_ids(user_id, set(conflicts.values()))
+                for index, session_id in conflicts.items():
+                    write_errors[index] = (
+                        ActiveJobExistsError(existing[session_id]) if session_id in existing
+                        else RuntimeError("Active job conflict; session was freed, retry")
+                    )
+            logging.warning("[MongoJobRepository.create_many] %s of %s inserts failed", len(write_errors), len(job_dicts))
+        return [
+            write_errors[i] if i in write_errors else Job(**job_dict)
+            for i, job_dict in enumerate(job_dicts)
+        ]
 
-    async def get_by_user_id(self, user_id: str, skip: int = 0, limit: int = 100) -> List[Job]:
-        cursor = self.collection.find({"user_id": user_id}).skip(skip).limit(limit).sort("created_at", -1)
-        jobs = []
-        async for job_doc in cursor:
-            jobs.append(Job(**job_doc))
-        return jobs
+    async def _active_job_ids(self, user_id: str, session_ids: Iterable[str]) -> Dict[str, str]:
+        """{session_id: active job id}; only used to report a conflict"""
+        # Index: partial unique {user_id: 1, session_id: 1}; the filter repeats its partialFilterExpression
+        cursor = self.collection.find({
+            "user_id": user_id,
+            "session_id": {"$type": "string", "$in": list(session_ids)},
+            "status": {"$in": ACTIVE_STATUSES},
+        }, {"session_id": 1})
+        return {doc["session_id"]: str(doc["_id"]) async for doc in cursor}
 
-    async def get_active_by_user_session(self, user_id: str, session_id: str) -> Optional[Job]:
-        """Return the most recent active job (pending/processing) for a user and session."""
+    async def get_by_id(self, job_id: str) -> Optional[Job]:
         try:
-            cursor = self.collection.find({
-                "user_id": user_id,
-                "session_id": session_id,
-                "status": {"$in": [JobStatus.PENDING, JobStatus.PROCESSING]}
-            }).sort("created_at", -1).limit(1)
-            async for job_doc in cursor:
-                return Job(**job_doc)
-            return None
-        except Exception:
+            oid = ObjectId(job_id)
+        except (InvalidId, TypeError):
+            logging.warning("[MongoJobRepository.get_by_id] invalid job id=%s", job_id)
             return None
+        job_doc = await self.collection.find_one({"_id": oid})
+        if job_doc:
+            logging.debug("[MongoJobRepository.get_by_id] found job id=%s", job_id)
+            return Job(**job_doc)
+        logging.warning("[MongoJobRepository.get_by_id] job not found id=%s", job_id)
+        return None
+
+    async def get_by_user_id(self, user_id: str, limit: int = 100, cursor: Optional[PageCursor] = None) -> Page[Job]:
+        # Index: {user_id: 1, created_at: -1, _id: -1}
+        return await fetch_page(self.collection, {"user_id": user_id}, limit, cursor, lambda doc: Job(**doc))
 
-    async def get_by_status(self, status: JobStatus, skip: int = 0, limit: int = 100) -> List[Job]:
-        cursor = self.collection.find({"status": status}).skip(skip).limit(limit).sort("created_at", -1)
-        jobs = []
-        async for job_doc in cursor:
-            jobs.append(Job(**job_doc))
-        return jobs
+    async def get_summaries_by_user_id(
+        self, user_id: str, limit: int = 100, cursor: Optional[PageCursor] = None
+    ) -> Page[JobSummary]:
+        # Same index as get_by_user_id; the projection cuts wire bytes and BSON decoding
+        return await fetch_page(
+            self.collection,
+            {"user_id": user_id},
+            limit,
+            cursor,
+            lambda doc: JobSummary(**doc),
+            projection=JOB_SUMMARY_PROJECTION,
+        )
 
-    async def update(self, job_id: str, job_data: JobUpdate) -> Optional[Job]:
-        from bson import ObjectId
+    async def get_by_status(self, status: JobStatus, limit: int = 100, cursor: Optional[PageCursor] = None) -> Page[Job]:
+        # Index: {status: 1, created_at: -1, _id: -1}
+        return await fetch_page(self.collection, {"status": status}, limit, cursor, lambda doc: Job(**doc))
+
+    async def update(
+        self, job_id: str, job_data: JobUpdate, expected_statuses: Optional[Sequence[JobStatus]] = None
+    ) -> Optional[Job]:
         try:
-            update_dict = {k: v for k, v in job_data.dict().items() if v is not None}
-            update_dict["updated_at"] = datetime.now(timezone.utc)
-            
-            result = await self.collection.update_one(
-                {"_id": ObjectId(job_id)},
-                {"$set": update_dict}
-            )
-            
-            if result.modified_count:
-                return await self.get_by_id(job_id)
+            oid = ObjectId(job_id)
+        except (InvalidId, TypeError):
+            logging.warning("[MongoJobRepository.update] invalid job id=%s", job_id)
             return None
-        except:
+        update_dict = {k: v for k, v in job_data.dict().items() if v is not None}
+        update_dict["updated_at"] = datetime.now(timezone.utc)
+
+        query = {"_id": oid}
+        if expected_statuses is not None:
+            query["status"] = {"$in": list(expected_statuses)}
+        # One round trip: conditional update returning the new document
+        job_doc = await self.collection.find_one_and_update(
+            query,
+            {"$set": update_dict},
+            return_document=ReturnDocument.AFTER,
+        )
+        if job_doc is None:
+            logging.debug(
+                "[MongoJobRepository.update] no match id=%s expected_statuses=%s", job_id, expected_statuses
+            )
             return None
+        return Job(**job_doc)
 
     async def delete(self, job_id: str) -> bool:
-        from bson import ObjectId
         try:
-            result = await self.collection.delete_one({"_id": ObjectId(job_id)})
-            return result.deleted_count > 0
-        except:
+            oid = ObjectId(job_id)
+        except (InvalidId, TypeError):
             return False
+        result = await self.collection.delete_one({"_id": oid})
+        return result.deleted_count > 0
 
-    async def list_jobs(self, skip: int = 0, limit: int = 100) -> List[Job]:
-        cursor = self.collection.find().skip(skip).limit(limit).sort("created_at", -1)
-        jobs = []
-        async for job_doc in cursor:
-            jobs.append(Job(**job_doc))
-        return jobs
+    async def list_jobs(self, limit: int = 100, cursor: Optional[PageCursor] = None) -> Page[Job]:
+        # Index: {created_at: -1, _id: -1}
+        return await fetch_page(self.collection, {}, limit, cursor, lambda doc: Job(**doc))
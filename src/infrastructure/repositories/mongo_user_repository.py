@@ -2,8 +2,9 @@ from typing import Optional, List
 from datetime import datetime, timezone
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from src.domain.repositories import UserRepository
-from src.domain.entities import User, UserCreate, UserUpdate
+from src.domain.entities import User, UserCreate, UserUpdate, Page, PageCursor
 from src.infrastructure.database.mongodb import MongoDB
+from src.infrastructure.repositories.pagination import fetch_page
 
 
 class MongoUserRepository(UserRepository):
@@ -63,9 +64,6 @@ class MongoUserRepository(UserRepository):
         except:
             return False
 
-    async def list_users(self, skip: int = 0, limit: int = 100) -> List[User]:
-        cursor = self.collection.find().skip(skip).limit(limit)
-        users = []
-        async for user_doc in cursor:
-            users.append(User(**user_doc))
-        return users
+    async def list_users(self, limit: int = 100, cursor: Optional[PageCursor] = None) -> Page[User]:
+        # Index: {created_at: -1, _id: -1}; the _id tie-break makes the order stable
+        return await fetch_page(self.collection, {}, limit, cursor, lambda doc: User(**doc))
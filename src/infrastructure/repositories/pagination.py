@@ -0,0 +1,56 @@
+"""
+Keyset pagination helpers shared by the Mongo repositories
+
+Pages are ordered by (created_at desc, _id desc) and continue from the last item
+seen, so every page is an index range scan of `limit + 1` documents, however deep.
+Each paginated query needs a compound index ending in {created_at: -1, _id: -1}.
+"""
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from src.domain.entities import Page, PageCursor, InvalidCursorError
+
+T = TypeVar("T")
+
+KEYSET_SORT = [("created_at", -1), ("_id", -1)]
+
+
+def keyset_query(query: Dict[str, Any], cursor: Optional[PageCursor]) -> Dict[str, Any]:
+    """Restrict a query to documents strictly after the cursor position"""
+    if cursor is None:
+        return query
+    try:
+        last_id = ObjectId(cursor.id)
+    except (InvalidId, TypeError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+    after = {
+        "$or": [
+            {"created_at": {"$lt": cursor.created_at}},
+            {"created_at": cursor.created_at, "_id": {"$lt": last_id}},
+        ]
+    }
+    return {"$and": [query, after]} if query else after
+
+
+async def fetch_page(
+    collection: AsyncIOMotorCollection,
+    query: Dict[str, Any],
+    limit: int,
+    cursor: Optional[PageCursor],
+    to_entity: Callable[[Dict[str, Any]], T],
+    projection: Optional[Dict[str, Any]] = None,
+) -> Page[T]:
+    """Fetch one page; reads one extra document to know whether another page exists.
+
+    A projection must keep created_at (and _id) for the next cursor.
+    """
+    docs = await collection.find(keyset_query(query, cursor), projection).sort(KEYSET_SORT).limit(limit + 1).to_list(length=limit + 1)
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        last = docs[-1]
+        next_cursor = PageCursor(created_at=last["created_at"], id=str(last["_id"])).encode()
+    return Page(items=[to_entity(doc) for doc in docs], next_cursor=next_cursor)
@@ -1,11 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from typing import List, Literal, Optional, Union
 from dataclasses import dataclass
 from src.application.use_cases.job_use_cases import JobUseCases, EnqueueJobError, ActiveJobExistsError
-from src.application.dto import JobCreateRequest, JobResponse
+from src.application.dto import (
+    JobCreateRequest,
+    JobBatchCreateRequest,
+    JobBatchCreateResponse,
+    JobBatchItemResult,
+    JobResponse,
+    JobPageResponse,
+    JobSummaryPageResponse,
+)
+from src.config.settings import settings
+from src.infrastructure.cache import (
+    IdempotencyKeyInProgressError,
+    IdempotencyKeyReusedError,
+    IdempotencyRecordError,
+    IdempotencyStore,
+    JobResponseCache,
+    idempotency_store,
+    job_response_cache,
+    request_fingerprint,
+    result_cache,
+)
+from src.domain.entities import InvalidCursorError
 from src.infrastructure.repositories import MongoJobRepository
 from src.infrastructure.external.fake_ai_service import FakeAIService
 from src.infrastructure.queue.celery_queue_service import CeleryQueueService
+from src.infrastructure.events.simple_job_notifier import SimpleJobNotifier
 from src.config.auth import get_current_user, security
 import logging
 
@@ -18,7 +40,7 @@ def get_job_use_cases() -> JobUseCases:
     job_repository = MongoJobRepository()
     queue_service = CeleryQueueService()
     ai_service = FakeAIService()
-    return JobUseCases(job_repository, queue_service, ai_service)
+    return JobUseCases(job_repository, queue_service, ai_service, result_cache, SimpleJobNotifier())
 
 
 @dataclass
@@ -36,14 +58,26 @@ def get_job_context(
     logger.debug("[job_routes.get_job_context] user_id=%s", ctx.user_id)
     return ctx
 
+def get_job_cache() -> JobResponseCache:
+    return job_response_cache
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    return idempotency_store
+
+
 async def get_owned_job(
     job_id: str,
     ctx: JobContext = Depends(get_job_context),
+    cache: JobResponseCache = Depends(get_job_cache),
 ) -> JobResponse:
-    """Fetch a job and ensure the current user owns it."""
-    job = await ctx.use_cases.get_job_by_id(job_id)
-    if not job:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    """Fetch a job (read-through cache) and ensure the current user owns it."""
+    job = await cache.get(job_id)
+    if job is None:
+        job = await ctx.use_cases.get_job_by_id(job_id)
+        if not job:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+        await cache.put(job)
 
     """ if job.user_id != ctx.user_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied") """
@@ -53,15 +87,63 @@ async def get_owned_job(
 @router.post("/", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
 async def create_job(
     job_request: JobCreateRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
     ctx: JobContext = Depends(get_job_context),
+    idempotency: IdempotencyStore = Depends(get_idempotency_store),
 ):
-    """Create and enqueue a new AI job"""
+    """Create and enqueue a new AI job.
+
+    With an `Idempotency-Key` header, retries of a successful request return the original
+    job (`Idempotent-Replayed: true`) instead of creating another one.
+    """
     logger.debug(
-        "[job_routes.create_job] user_id=%s job_type=%s payload_keys=%s",
+        "[job_routes.create_job] user_id=%s job_type=%s payload_keys=%s has_idempotency_key=%s",
         ctx.user_id,
         getattr(job_request, "job_type", None),
         list(getattr(job_request, "input_data", {}).keys()) if getattr(job_request, "input_data", None) else [],
+        bool(idempotency_key),
     )
+    if not idempotency_key:
+        return await _create_job(ctx, job_request)
+
+    try:
+        outcome = await idempotency.acquire(
+            ctx.user_id, idempotency_key, request_fingerprint(job_request.model_dump(mode="json"))
+        )
+    except IdempotencyKeyReusedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"error": "idempotency_key_reused", "message": str(e)},
+        )
+    except IdempotencyKeyInProgressError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"error": "idempotency_key_in_progress", "message": str(e)},
+        )
+    if isinstance(outcome, JobResponse):
+        logger.debug("[job_routes.create_job] idempotent replay job_id=%s", outcome.id)
+        response.headers["Idempotent-Replayed"] = "true"
+        return outcome
+
+    try:
+        # Keeps the reservation pending however long the create takes (enqueue timeout, Mongo retries)
+        async with idempotency.keep_alive(outcome):
+            resp = await _create_job(ctx, job_request)
+    except BaseException:
+        # Only successes are recorded: after a 409/503/error a retry with the same key runs again
+        await idempotency.release(outcome)
+        raise
+    try:
+        await idempotency.complete(outcome, resp)
+    except IdempotencyRecordError as e:
+        # The job exists, so this request still succeeds (failing it would invite the retry
+        # that duplicates it); once the reservation expires a retry with this key runs again
+        logger.error("[job_routes.create_job] idempotency record failed job_id=%s error=%s", resp.id, e)
+    return resp
+
+
+async def _create_job(ctx: JobContext, job_request: JobCreateRequest) -> JobResponse:
     try:
         resp = await ctx.use_cases.create_job(ctx.user_id, job_request)
         logger.debug("[job_routes.create_job] created job_id=%s status=%s", resp.id, resp.status)
@@ -83,17 +165,69 @@ async def create_job(
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
 
 
-@router.get("/", response_model=List[JobResponse])
+@router.post("/batch", response_model=JobBatchCreateResponse)
+async def create_jobs_batch(
+    batch_request: JobBatchCreateRequest,
+    ctx: JobContext = Depends(get_job_context),
+):
+    """Create and enqueue many jobs in one request.
+
+    Items succeed or fail independently; each result carries the job or an error code
+    (`active_job_exists`, `enqueue_failed`, `create_failed`).
+    """
+    count = len(batch_request.jobs)
+    if count == 0 or count > settings.job_batch_max_size:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"jobs must contain between 1 and {settings.job_batch_max_size} items",
+        )
+    logger.debug("[job_routes.create_jobs_batch] user_id=%s count=%s", ctx.user_id, count)
+
+    outcomes = await ctx.use_cases.create_jobs(ctx.user_id, batch_request.jobs)
+    results = []
+    for index, outcome in enumerate(outcomes):
+        if isinstance(outcome, JobResponse):
+            results.append(JobBatchItemResult(index=index, job=outcome))
+        elif isinstance(outcome, ActiveJobExistsError):
+            results.append(JobBatchItemResult(
+                index=index, error="active_job_exists", detail=str(outcome), existing_job_id=outcome.existing_job_id
+            ))
+        elif isinstance(outcome, EnqueueJobError):
+            results.append(JobBatchItemResult(index=index, error="enqueue_failed", detail=str(outcome)))
+        else:
+            results.append(JobBatchItemResult(index=index, error="create_failed", detail=str(outcome)))
+    created = sum(1 for result in results if result.job is not None)
+    logger.debug("[job_routes.create_jobs_batch] user_id=%s created=%s failed=%s", ctx.user_id, created, count - created)
+    return JobBatchCreateResponse(created=created, failed=count - created, results=results)
+
+
+@router.get("/", response_model=Union[JobPageResponse, JobSummaryPageResponse])
 async def get_user_jobs(
-    skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
+    view: Literal["full", "summary"] = "full",
     ctx: JobContext = Depends(get_job_context),
 ):
-    """Get current user's jobs"""
-    logger.debug("[job_routes.get_user_jobs] user_id=%s skip=%s limit=%s", ctx.user_id, skip, limit)
-    jobs = await ctx.use_cases.get_user_jobs(ctx.user_id, skip, limit)
-    logger.debug("[job_routes.get_user_jobs] found=%s", len(jobs))
-    return jobs
+    """Get current user's jobs, newest first. Pass `next_cursor` back as `cursor` for the next page.
+
+    `view=summary` omits input_data/output_data (projected away in MongoDB).
+    """
+    logger.debug("[job_routes.get_user_jobs] user_id=%s limit=%s has_cursor=%s view=%s", ctx.user_id, limit, bool(cursor), view)
+    try:
+        if view == "summary":
+            page = await ctx.use_cases.get_user_job_summaries(ctx.user_id, limit, cursor)
+        else:
+            page = await ctx.use_cases.get_user_jobs(ctx.user_id, limit, cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    logger.debug("[job_routes.get_user_jobs] found=%s has_more=%s", len(page.items), bool(page.next_cursor))
+    return page
+
+
+@router.get("/result-cache/stats")
+async def get_result_cache_stats(ctx: JobContext = Depends(get_job_context)):
+    """Hit/miss counters of the AI result cache (all API and worker processes)"""
+    return await result_cache.stats()
 
 
 @router.get("/{job_id}", response_model=JobResponse)
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, Security, status, Response
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Security, status, Response
+from typing import List, Optional
 from fastapi.security import HTTPAuthorizationCredentials
 import logging
 from src.application.use_cases import UserUseCases
-from src.application.dto import UserResponse, UserCreateRequest, UserUpdateRequest
+from src.application.dto import UserResponse, UserPageResponse, UserCreateRequest, UserUpdateRequest
+from src.domain.entities import InvalidCursorError
 from src.infrastructure.repositories import MongoUserRepository
 from src.config.auth import get_current_user, security
 
@@ -98,12 +99,15 @@ async def update_user(
     return user
 
 
-@router.get("/", response_model=List[UserResponse])
+@router.get("/", response_model=UserPageResponse)
 async def list_users(
-    skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_user),
     use_cases: UserUseCases = Depends(get_user_use_cases)
 ):
-    """List users"""
-    return await use_cases.list_users(skip, limit)
+    """List users, newest first. Pass `next_cursor` back as `cursor` for the next page."""
+    try:
+        return await use_cases.list_users(limit, cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -1,9 +1,12 @@
-from .connection_manager import ConnectionManager, manager
+from .connection_manager import BroadcastResult, ConnectionManager, manager
+from .connection_sender import ConnectionSender
 from .websocket_routes import router, notify_job_status_update
 
 __all__ = [
+    "BroadcastResult",
     "ConnectionManager",
     "manager",
+    "ConnectionSender",
     "router",
     "notify_job_status_update"
 ]
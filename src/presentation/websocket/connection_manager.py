@@ -1,19 +1,103 @@
-from typing import List, Dict
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, List, Dict, Optional, Tuple
 from fastapi import WebSocket
-import json
 import asyncio
+import json
+import logging
+import time
+
+from src.config.settings import settings
+from .connection_sender import ConnectionSender
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BroadcastResult:
+    recipients: int
+    queued: int
+    failed: int  # dropped by a full queue or the socket was already closing
+    duration_ms: float
 
 
 class ConnectionManager:
-    def __init__(self):
+    """Tracks sockets per user; sends go through each socket's bounded ConnectionSender queue"""
+
+    def __init__(
+        self,
+        max_queue: int = 256,
+        overflow_policy: str = "coalesce",
+        max_consecutive_drops: int = 64,
+        send_timeout_seconds: float = 10.0,
+        broadcast_chunk_size: int = 1000,
+        presence_timeout_seconds: float = 2.0,
+    ):
         self.active_connections: Dict[str, List[WebSocket]] = {}
+        self.max_queue = max_queue
+        self.overflow_policy = overflow_policy
+        self.max_consecutive_drops = max_consecutive_drops
+        self.send_timeout_seconds = send_timeout_seconds
+        self.broadcast_chunk_size = broadcast_chunk_size
+        self.presence_timeout_seconds = presence_timeout_seconds
+        # (on_first_connect, on_last_disconnect) per listener, called with the user id
+        self._presence_listeners: List[Tuple[Callable[[str], Optional[Awaitable]], Callable[[str], None]]] = []
+        # Per user: done once every first-connect listener is ready to route their messages
+        self._presence_ready: Dict[str, asyncio.Future] = {}
+        # Metrics
+        self.slow_disconnects = 0
+        self.last_broadcast: Optional[BroadcastResult] = None
+
+    def add_presence_listener(
+        self, on_first_connect: Callable[[str], Optional[Awaitable]], on_last_disconnect: Callable[[str], None]
+    ) -> None:
+        """Be told when a user gains their first socket on this node or loses their last one.
+
+        `on_first_connect` may return an awaitable (e.g. a pending subscription); connect()
+        waits for it, up to `presence_timeout_seconds`, before returning.
+        """
+        self._presence_listeners.append((on_first_connect, on_last_disconnect))
 
-    async def connect(self, websocket: WebSocket, user_id: str):
-        """Connect a WebSocket for a user"""
+    def remove_presence_listener(
+        self, on_first_connect: Callable[[str], Optional[Awaitable]], on_last_disconnect: Callable[[str], None]
+    ) -> None:
+        if (on_first_connect, on_last_disconnect) in self._presence_listeners:
+            self._presence_listeners.remove((on_first_connect, on_last_disconnect))
+
+    async def connect(self, websocket: WebSocket, user_id: str, identity: Optional[dict] = None, hold: bool = False):
+        """Connect a WebSocket for a user; the verified identity and sender travel on websocket.state.
+
+        Returns once the user's messages are routed to this node. With `hold`, live
+        messages wait in the sender until `sender.release()` (used for replays).
+        """
         await websocket.accept()
+        websocket.state.identity = identity
+        sender = ConnectionSender(
+            websocket,
+            max_queue=self.max_queue,
+            overflow_policy=self.overflow_policy,
+            max_consecutive_drops=self.max_consecutive_drops,
+            send_timeout_seconds=self.send_timeout_seconds,
+            on_closed=lambda closed: self._on_sender_closed(closed, user_id),
+        )
+        websocket.state.sender = sender
+        if hold:
+            sender.hold()
+        sender.start()
         if user_id not in self.active_connections:
             self.active_connections[user_id] = []
+            pending = [ready for ready in (on_first(user_id) for on_first, _ in self._presence_listeners) if ready is not None]
+            if pending:
+                self._presence_ready[user_id] = asyncio.ensure_future(asyncio.gather(*pending))
         self.active_connections[user_id].append(websocket)
+        ready = self._presence_ready.get(user_id)
+        if ready is not None:
+            # Also for a user's later sockets while their first is still being routed
+            done, _ = await asyncio.wait({ready}, timeout=self.presence_timeout_seconds)
+            if not done:
+                logger.warning("[ConnectionManager.connect] presence listeners not ready after %ss user_id=%s",
+                               self.presence_timeout_seconds, user_id)
+            elif self._presence_ready.get(user_id) is ready:
+                del self._presence_ready[user_id]
 
     def disconnect(self, websocket: WebSocket, user_id: str):
         """Disconnect a WebSocket for a user"""
@@ -22,38 +106,69 @@ class ConnectionManager:
                 self.active_connections[user_id].remove(websocket)
             if not self.active_connections[user_id]:
                 del self.active_connections[user_id]
+                ready = self._presence_ready.pop(user_id, None)
+                if ready is not None:
+                    ready.cancel()
+                for _, on_last_disconnect in self._presence_listeners:
+                    on_last_disconnect(user_id)
+        sender = getattr(websocket.state, "sender", None)
+        if sender is not None:
+            sender.stop()
 
-    async def send_personal_message(self, message: dict, user_id: str):
-        """Send message to all connections of a specific user"""
-        if user_id in self.active_connections:
+    def _on_sender_closed(self, sender: ConnectionSender, user_id: str) -> None:
+        # Writer gave up (send error, timeout, slow consumer): forget the socket
+        if sender.close_reason:
+            self.slow_disconnects += 1
+        self.disconnect(sender.websocket, user_id)
+
+    async def send_personal_message(
+        self,
+        message: dict,
+        user_id: str,
+        coalesce_key: Optional[str] = None,
+        event_id: Optional[str] = None,
+        terminal: bool = False,
+    ):
+        """Queue a message to all connections of a specific user (never waits on a socket).
+
+        Queued messages with the same `coalesce_key` may be replaced by this one under backpressure.
+        `event_id` is the job event log id, used to skip messages a replay already delivered.
+        `terminal` messages (a job's final status) are never dropped under backpressure.
+        """
+        connections = self.active_connections.get(user_id)
+        if connections:
             message_str = json.dumps(message)
-            disconnected = []
-            
-            for connection in self.active_connections[user_id]:
-                try:
-                    await connection.send_text(message_str)
-                except:
-                    disconnected.append(connection)
-            
-            # Remove disconnected connections
-            for connection in disconnected:
-                self.disconnect(connection, user_id)
-
-    async def broadcast(self, message: dict):
-        """Broadcast message to all connected users"""
+            for connection in list(connections):
+                connection.state.sender.send(message_str, coalesce_key, event_id, terminal)
+
+    async def broadcast(self, message: dict) -> BroadcastResult:
+        """Queue a message to every connected socket.
+
+        The frame is encoded once and handed to each socket's writer over a snapshot of
+        the connections (safe against connects/disconnects meanwhile), yielding to the
+        event loop between chunks of `broadcast_chunk_size` so writers start sending,
+        and other sockets are served, while a large fan-out is still being queued.
+        """
+        started = time.perf_counter()
         message_str = json.dumps(message)
-        for user_id, connections in self.active_connections.items():
-            disconnected = []
-            
-            for connection in connections:
-                try:
-                    await connection.send_text(message_str)
-                except:
-                    disconnected.append(connection)
-            
-            # Remove disconnected connections
-            for connection in disconnected:
-                self.disconnect(connection, user_id)
+        senders = [connection.state.sender for connections in list(self.active_connections.values()) for connection in connections]
+        queued = 0
+        for offset in range(0, len(senders), self.broadcast_chunk_size):
+            for sender in senders[offset:offset + self.broadcast_chunk_size]:
+                queued += sender.send(message_str)
+            await asyncio.sleep(0)
+        result = BroadcastResult(
+            recipients=len(senders),
+            queued=queued,
+            failed=len(senders) - queued,
+            duration_ms=round((time.perf_counter() - started) * 1000, 3),
+        )
+        self.last_broadcast = result
+        logger.info(
+            "[ConnectionManager.broadcast] recipients=%s failed=%s duration_ms=%s",
+            result.recipients, result.failed, result.duration_ms,
+        )
+        return result
 
     def get_user_connection_count(self, user_id: str) -> int:
         """Get number of active connections for a user"""
@@ -63,5 +178,24 @@ class ConnectionManager:
         """Get total number of active connections"""
         return sum(len(connections) for connections in self.active_connections.values())
 
+    def stats(self) -> Dict[str, Any]:
+        senders = [connection.state.sender for connections in self.active_connections.values() for connection in connections]
+        return {
+            "users": len(self.active_connections),
+            "connections": len(senders),
+            "queued": sum(sender.queued for sender in senders),
+            "max_queued": max((sender.queued for sender in senders), default=0),
+            "dropped": sum(sender.dropped for sender in senders),
+            "coalesced": sum(sender.coalesced for sender in senders),
+            "slow_disconnects": self.slow_disconnects,
+            "last_broadcast": asdict(self.last_broadcast) if self.last_broadcast else None,
+        }
+
 
-manager = ConnectionManager()
+manager = ConnectionManager(
+    max_queue=settings.websocket_send_queue_size,
+    overflow_policy=settings.websocket_overflow_policy,
+    max_consecutive_drops=settings.websocket_slow_consumer_max_drops,
+    send_timeout_seconds=settings.websocket_send_timeout_seconds,
+    broadcast_chunk_size=settings.websocket_broadcast_chunk_size,
+)
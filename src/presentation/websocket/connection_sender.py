@@ -0,0 +1,218 @@
+"""
+Connection Sender - Bounded outbound queue and writer task for one WebSocket
+
+ConnectionManager only enqueues (never awaits a socket), so one slow client cannot
+stall delivery to other sockets or the notification subscriber loop. When the queue
+is full the overflow policy decides what gives:
+
+- drop_oldest: discard the oldest queued message
+- drop_newest: discard the incoming message
+- coalesce: replace a queued message with the same coalesce key (e.g. the previous
+  status of the same job); without one, fall back to drop_oldest
+
+Terminal frames (a job's completed/failed status, the end of a replay) are never
+dropped: eviction skips them to the oldest other frame, and a queue holding nothing
+but terminal frames disconnects the client so it reconnects and replays instead.
+
+A client that keeps the queue full (WEBSOCKET_SLOW_CONSUMER_MAX_DROPS drops in a row
+without draining) or whose single send takes longer than WEBSOCKET_SEND_TIMEOUT_SECONDS
+is disconnected; it reconnects and resyncs instead of holding memory. The writer
+enforces the send timeout itself, so a socket that hangs on its last frame is closed
+even if nothing else is ever queued for it.
+
+While a reconnecting client is replayed its missed events, live frames are held
+(hold) and queued after the replay (release), minus those the replay already
+contained, so the client sees every event once and in order.
+"""
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from fastapi import WebSocket
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "coalesce")
+
+# RFC 6455 "try again later": closed for falling behind, reconnecting is fine
+WS_TRY_AGAIN_LATER = 1013
+
+
+def _event_id_key(event_id: str) -> Tuple[int, int]:
+    # Redis stream ids "<ms>-<seq>" order numerically, not as strings
+    ms, _, seq = event_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+class ConnectionSender:
+    """Per-connection outbound queue drained by its own writer task"""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        max_queue: int = 256,
+        overflow_policy: str = "coalesce",
+        max_consecutive_drops: int = 64,
+        send_timeout_seconds: float = 10.0,
+        on_closed: Optional[Callable[["ConnectionSender"], None]] = None,
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow_policy must be one of {OVERFLOW_POLICIES}, got {overflow_policy!r}")
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.overflow_policy = overflow_policy
+        self.max_consecutive_drops = max_consecutive_drops
+        self.send_timeout_seconds = send_timeout_seconds
+        self.on_closed = on_closed
+        # Entries are [coalesce_key, text, terminal] so a coalesced update can be replaced in place
+        self._queue: Deque[List[Any]] = deque()
+        self._keyed: Dict[str, List[Any]] = {}
+        self._waiter: Optional[asyncio.Future] = None
+        self._task: Optional[asyncio.Task] = None
+        # (coalesce_key, event_id, text, terminal) of live frames held during a replay
+        self._held: Optional[List[Tuple[Optional[str], Optional[str], str, bool]]] = None
+        self._consecutive_drops = 0
+        self.closed = False
+        self.close_reason: Optional[str] = None
+        # Metrics
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="websocket_sender")
+
+    def send(
+        self, text: str, coalesce_key: Optional[str] = None, event_id: Optional[str] = None, terminal: bool = False
+    ) -> bool:
+        """Queue a frame without waiting; False if it was dropped or the sender is closed.
+
+        A `terminal` frame is never dropped or replaced by overflow handling.
+        """
+        if self.closed:
+            return False
+        if self._held is not None:
+            self._held.append((coalesce_key, event_id, text, terminal))
+            return True
+        if coalesce_key is not None and self.overflow_policy == "coalesce":
+            queued = self._keyed.get(coalesce_key)
+            if queued is not None and not queued[2]:
+                # Superseded before it was written: keep its place, send the newer state
+                queued[1] = text
+                queued[2] = terminal
+                self.coalesced += 1
+                return True
+        if len(self._queue) >= self.max_queue:
+            if not self._overflow(terminal):
+                return False
+        entry = [coalesce_key, text, terminal]
+        self._queue.append(entry)
+        if coalesce_key is not None:
+            self._keyed[coalesce_key] = entry
+        self._wake()
+        return True
+
+    def _wake(self) -> None:
+        if self._waiter is not None:
+            if not self._waiter.done():
+                self._waiter.set_result(None)
+            self._waiter = None
+
+    def hold(self) -> None:
+        """Hold live frames until release() (call before the socket is registered)"""
+        self._held = []
+
+    def release(self, replayed: List[Tuple[str, bool]], replayed_through: Optional[str]) -> None:
+        """Queue the replayed (text, terminal) frames, then the held live frames not covered by them.
+
+        Replayed frames bypass the queue bound (the event log's MAXLEN bounds them);
+        held frames whose event id is at or before `replayed_through` are duplicates.
+        """
+        held, self._held = self._held or [], None
+        if self.closed:
+            return
+        for text, terminal in replayed:
+            self._queue.append([None, text, terminal])
+        self._wake()
+        through = _event_id_key(replayed_through) if replayed_through else None
+        for coalesce_key, event_id, text, terminal in held:
+            if through is not None and event_id is not None and _event_id_key(event_id) <= through:
+                continue
+            self.send(text, coalesce_key, terminal=terminal)
+
+    def _overflow(self, terminal: bool) -> bool:
+        """Make room per policy; False means the incoming frame is dropped"""
+        self.dropped += 1
+        self._consecutive_drops += 1
+        if self._consecutive_drops >= self.max_consecutive_drops:
+            logger.warning("[ConnectionSender] slow consumer, disconnecting dropped=%s", self.dropped)
+            asyncio.create_task(self._close(WS_TRY_AGAIN_LATER, "Slow consumer"))
+            return False
+        if self.overflow_policy == "drop_newest" and not terminal:
+            return False
+        for index, entry in enumerate(self._queue):
+            if not entry[2]:
+                break
+        else:
+            # Only terminal frames queued: none may be lost, so the client must resync
+            logger.warning("[ConnectionSender] queue full of terminal frames, disconnecting")
+            asyncio.create_task(self._close(WS_TRY_AGAIN_LATER, "Slow consumer"))
+            return False
+        del self._queue[index]
+        if entry[0] is not None and self._keyed.get(entry[0]) is entry:
+            del self._keyed[entry[0]]
+        return True
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                if not self._queue:
+                    self._consecutive_drops = 0
+                    self._waiter = loop.create_future()
+                    await self._waiter
+                    continue
+                entry = self._queue.popleft()
+                if entry[0] is not None and self._keyed.get(entry[0]) is entry:
+                    del self._keyed[entry[0]]
+                try:
+                    await asyncio.wait_for(self.websocket.send_text(entry[1]), self.send_timeout_seconds)
+                except asyncio.TimeoutError:
+                    logger.warning("[ConnectionSender] send stalled over %ss, disconnecting", self.send_timeout_seconds)
+                    await self._close(WS_TRY_AGAIN_LATER, "Send timeout")
+                    return
+                self.sent += 1
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.debug("[ConnectionSender] send failed error=%s", e)
+            await self._close(None, None)
+
+    async def _close(self, code: Optional[int], reason: Optional[str]) -> None:
+        if self.closed:
+            return
+        self.close_reason = reason
+        self.stop()
+        if code is not None:
+            try:
+                await self.websocket.close(code=code, reason=reason)
+            except Exception:
+                pass
+
+    def stop(self) -> None:
+        """Stop writing and release the queue (idempotent)"""
+        if self.closed:
+            return
+        self.closed = True
+        self._held = None
+        self._queue.clear()
+        self._keyed.clear()
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+        if self.on_closed is not None:
+            self.on_closed(self)
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
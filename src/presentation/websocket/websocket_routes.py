@@ -1,25 +1,102 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, Query
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, Query, HTTPException
 from typing import Optional
 from datetime import datetime, timezone
 from .connection_manager import manager
-from src.config.auth import get_optional_user
+from src.config.auth import authenticate_token
+from src.infrastructure.events.job_event_log import job_event_log
+from src.infrastructure.events.status_coalescer import is_terminal
+import asyncio
 import json
+import logging
+import time
 
 router = APIRouter()
 
+logger = logging.getLogger(__name__)
+
+# RFC 6455 policy-violation close code, used for auth failures and token expiry
+WS_POLICY_VIOLATION = 1008
+
+
+async def _close_at_token_expiry(websocket: WebSocket, user_id: str, exp: float) -> None:
+    """Close the socket once the token that authenticated it expires."""
+    await asyncio.sleep(max(0.0, exp - time.time()))
+    logger.info("[websocket] token expired; closing user_id=%s", user_id)
+    try:
+        await websocket.close(code=WS_POLICY_VIOLATION, reason="Token expired")
+    except Exception:
+        pass
+
+
+async def _replay(websocket: WebSocket, user_id: str, last_event_id: str) -> None:
+    """Send the job events logged after `last_event_id`, then the live messages held meanwhile."""
+    try:
+        events, gap = await job_event_log.read_after(user_id, last_event_id)
+    except Exception as e:
+        logger.warning("[websocket] replay failed user_id=%s error=%s", user_id, e)
+        events, gap = [], True
+    frames = [
+        (json.dumps(job_status_message(
+            job_id=payload.get("job_id"),
+            status=payload.get("status"),
+            message=payload.get("message"),
+            session_id=payload.get("session_id"),
+            event_id=event_id,
+            timestamp=datetime.fromtimestamp(int(event_id.split("-")[0]) / 1000, timezone.utc),
+        )), is_terminal(payload))
+        for event_id, payload in events
+    ]
+    replayed_through = events[-1][0] if events else last_event_id
+    # gap: events may have been trimmed from the log; the client should resync from GET /jobs once
+    frames.append((json.dumps({
+        "type": "replay_complete",
+        "last_event_id": replayed_through,
+        "replayed": len(events),
+        "gap": gap,
+    }), True))
+    websocket.state.sender.release(frames, None if gap and not events else replayed_through)
+    logger.info("[websocket] replayed user_id=%s events=%s gap=%s", user_id, len(events), gap)
+
 
 @router.websocket("/ws/{user_id}")
-async def websocket_endpoint(websocket: WebSocket, user_id: str, token: Optional[str] = Query(None)):
-    """WebSocket endpoint for real-time job status updates"""
-    
-    # Simple token validation for WebSocket (in production, use proper validation)
-    if not token or not token.startswith("clerk_"):
-        await websocket.close(code=1008, reason="Authentication required")
+async def websocket_endpoint(
+    websocket: WebSocket,
+    user_id: str,
+    token: Optional[str] = Query(None),
+    last_event_id: Optional[str] = Query(None, max_length=64),
+):
+    """WebSocket endpoint for real-time job status updates.
+
+    The token is verified once at handshake through the same (cached) JWKS path as
+    get_current_user; the socket is closed when the token's exp passes. A client that
+    reconnects with the `event_id` of the last job_status_update it saw as
+    `last_event_id` first receives every status event logged since, then live ones.
+    """
+    try:
+        identity = await authenticate_token(token)
+    except HTTPException as e:
+        logger.info("[websocket] auth failed user_id=%s detail=%s", user_id, e.detail)
+        await websocket.close(code=WS_POLICY_VIOLATION, reason="Authentication required")
+        return
+    except Exception:
+        logger.exception("[websocket] unexpected auth error user_id=%s", user_id)
+        await websocket.close(code=WS_POLICY_VIOLATION, reason="Authentication required")
+        return
+
+    if identity.get("user_id") != user_id:
+        logger.warning("[websocket] token subject does not match path user_id=%s", user_id)
+        await websocket.close(code=WS_POLICY_VIOLATION, reason="Forbidden")
         return
-    
-    await manager.connect(websocket, user_id)
-    
+
+    await manager.connect(websocket, user_id, identity, hold=last_event_id is not None)
+    expiry_task = None
+    if identity.get("exp") is not None:
+        expiry_task = asyncio.create_task(_close_at_token_expiry(websocket, user_id, float(identity["exp"])))
+
     try:
+        if last_event_id is not None:
+            await _replay(websocket, user_id, last_event_id)
+
         # Send welcome message
         await manager.send_personal_message({
             "type": "connection",
@@ -42,17 +119,64 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str, token: Optional
     except WebSocketDisconnect:
         manager.disconnect(websocket, user_id)
     except Exception as e:
-        print(f"WebSocket error for user {user_id}: {str(e)}")
+        logger.warning("[websocket] error for user_id=%s: %s", user_id, e)
         manager.disconnect(websocket, user_id)
+    finally:
+        if expiry_task is not None:
+            expiry_task.cancel()
 
 
-async def notify_job_status_update(user_id: str, job_id: str, status: str, message: str = None, session_id: str | None = None):
-    """Notify user about job status update via WebSocket"""
-    await manager.send_personal_message({
+def job_status_message(
+    job_id: str,
+    status: str,
+    message: str = None,
+    session_id: str | None = None,
+    event_id: str | None = None,
+    timestamp: datetime | None = None,
+) -> dict:
+    return {
         "type": "job_status_update",
         "job_id": job_id,
         "status": status,
         "session_id": session_id,
         "message": message,
+        "event_id": event_id,
+        "timestamp": str(timestamp or datetime.now(timezone.utc))
+    }
+
+
+async def notify_job_status_update(
+    user_id: str,
+    job_id: str,
+    status: str,
+    message: str = None,
+    session_id: str | None = None,
+    event_id: str | None = None,
+):
+    """Notify user about job status update via WebSocket"""
+    await manager.send_personal_message(
+        job_status_message(job_id, status, message, session_id, event_id),
+        user_id,
+        coalesce_key=f"job_status:{job_id}",
+        event_id=event_id,
+        terminal=is_terminal({"status": status}),
+    )
+
+
+async def notify_job_progress(
+    user_id: str,
+    job_id: str,
+    progress: Optional[int] = None,
+    partial: Optional[dict] = None,
+    session_id: str | None = None,
+):
+    """Notify user about a running job's progress and partial output via WebSocket"""
+    await manager.send_personal_message({
+        "type": "job_progress",
+        "job_id": job_id,
+        "status": "PROCESSING",
+        "session_id": session_id,
+        "progress": progress,
+        "partial": partial,
         "timestamp": str(datetime.now(timezone.utc))
     }, user_id)
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from src.domain.entities import JobCreate, JobType
+from src.domain.repositories import ActiveJobExistsError
+from src.infrastructure.repositories.mongo_job_repository import MongoJobRepository
+
+SESSION_INDEX = {"user_id": 1, "session_id": 1}
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
+
+class FakeJobsCollection:
+    """Unique {user_id, session_id} over active jobs, like the partial index"""
+
+    def __init__(self, *active):
+        self.active = {(doc["user_id"], doc["session_id"]): doc for doc in active}
+        self.finds = 0
+
+    def _conflicts(self, doc):
+        return doc.get("session_id") is not None and (doc["user_id"], doc["session_id"]) in self.active
+
+    async def insert_one(self, doc):
+        if self._conflicts(doc):
+            raise DuplicateKeyError("E11000", 11000, {"code": 11000, "keyPattern": SESSION_INDEX})
+        doc.setdefault("_id", ObjectId())
+        self.active[(doc["user_id"], doc["session_id"])] = doc
+        return type("Result", (), {"inserted_id": doc["_id"]})()
+
+    async def insert_many(self, docs, ordered=True):
+        errors = []
+        for index, doc in enumerate(docs):
+            if self._conflicts(doc):
+                errors.append({"index": index, "code": 11000, "keyPattern": SESSION_INDEX, "errmsg": "E11000"})
+            elif doc.get("session_id") is not None:
+                self.active[(doc["user_id"], doc["session_id"])] = doc
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+
+    def find(self, query, projection=None):
+        self.finds += 1
+        sessions = set(query["session_id"]["$in"])
+        return FakeCursor([doc for (user, session), doc in self.active.items()
+                           if user == query["user_id"] and session in sessions])
+
+
+def _repository(collection):
+    repository = MongoJobRepository.__new__(MongoJobRepository)
+    repository.collection = collection
+    return repository
+
+
+def _create(session_id):
+    return JobCreate(user_id="u1", session_id=session_id, job_type=JobType.TEXT_GENERATION, input_data={})
+
+
+def test_create_is_a_single_write_unless_the_session_is_busy():
+    holder = {"_id": ObjectId(), "user_id": "u1", "session_id": "s1"}
+    collection = FakeJobsCollection(holder)
+    repository = _repository(collection)
+
+    asyncio.run(repository.create(_create("s2")))
+    asyncio.run(repository.create(_create(None)))
+    assert collection.finds == 0
+
+    with pytest.raises(ActiveJobExistsError) as conflict:
+        asyncio.run(repository.create(_create("s1")))
+    assert conflict.value.existing_job_id == str(holder["_id"])
+
+
+def test_create_many_maps_conflicts_including_within_the_batch():
+    holder = {"_id": ObjectId(), "user_id": "u1", "session_id": "busy"}
+    repository = _repository(FakeJobsCollection(holder))
+
+    results = asyncio.run(repository.create_many([_create("busy"), _create("s1"), _create("s1"), _create(None)]))
+
+    assert isinstance(results[0], ActiveJobExistsError) and results[0].existing_job_id == str(holder["_id"])
+    assert isinstance(results[2], ActiveJobExistsError) and results[2].existing_job_id == str(results[1].id)
+    assert not isinstance(results[3], Exception)
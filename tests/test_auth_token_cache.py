@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from src.config import auth as auth_module
+from src.config.auth import ClerkAuth, VerifiedTokenCache
+
+ISSUER = "https://issuer.test"
+KID = "test-key"
+
+
+@pytest.fixture(scope="module")
+def signing_key():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode()
+    public_jwk = {**jwk.construct(public_pem, algorithm="RS256").to_dict(), "kid": KID, "use": "sig"}
+    return pem, {"keys": [public_jwk]}
+
+
+def make_token(pem: str, sub: str = "user_1", exp_in: int = 60) -> str:
+    now = int(time.time())
+    claims = {"sub": sub, "iss": ISSUER, "iat": now, "exp": now + exp_in}
+    return jwt.encode(claims, pem, algorithm="RS256", headers={"kid": KID})
+
+
+@pytest.fixture
+def clerk(signing_key, monkeypatch):
+    _, jwks = signing_key
+    instance = ClerkAuth()
+    instance.expected_issuer = ISSUER
+    instance.expected_audience = None
+
+    async def fake_fetch_jwks(issuer):
+        return jwks
+
+    monkeypatch.setattr(instance, "_fetch_jwks", fake_fetch_jwks)
+    return instance
+
+
+def test_repeat_token_skips_signature_verification(clerk, signing_key, monkeypatch):
+    pem, _ = signing_key
+    token = make_token(pem)
+    lookups = []
+    real_get_key_store = clerk._get_key_store
+
+    def counting_get_key_store(issuer):
+        lookups.append(issuer)
+        return real_get_key_store(issuer)
+
+    monkeypatch.setattr(clerk, "_get_key_store", counting_get_key_store)
+
+    first = asyncio.run(clerk.verify_clerk_token(token))
+    second = asyncio.run(clerk.verify_clerk_token(token))
+
+    assert first == second
+    assert first["user_id"] == "user_1"
+    assert len(lookups) == 1
+    stats = clerk.get_cache_stats()["token_cache"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_cached_claims_are_copies(clerk, signing_key):
+    pem, _ = signing_key
+    token = make_token(pem)
+    asyncio.run(clerk.verify_clerk_token(token))
+    cached = asyncio.run(clerk.verify_clerk_token(token))
+    cached["user_id"] = "tampered"
+    assert asyncio.run(clerk.verify_clerk_token(token))["user_id"] == "user_1"
+
+
+def test_entry_evicted_at_token_exp(monkeypatch):
+    cache = VerifiedTokenCache(max_size=10, max_ttl_seconds=300)
+    now = time.time()
+    cache.put("tok", {"user_id": "u", "exp": now + 5})
+    assert cache.get("tok") is not None
+
+    monkeypatch.setattr(auth_module.time, "time", lambda: now + 6)
+    assert cache.get("tok") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_cache_is_bounded_lru():
+    cache = VerifiedTokenCache(max_size=2, max_ttl_seconds=300)
+    exp = time.time() + 60
+    cache.put("a", {"exp": exp})
+    cache.put("b", {"exp": exp})
+    assert cache.get("a") is not None  # "a" becomes most recently used
+    cache.put("c", {"exp": exp})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
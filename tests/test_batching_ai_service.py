@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from src.domain.entities import JobType
+from src.domain.services import AIService
+from src.infrastructure.external.batching_ai_service import BatchingAIService
+
+
+class RecordingAIService(AIService):
+    def __init__(self, fail_index=None):
+        self.calls = []
+        self.fail_index = fail_index
+
+    async def generate(self, job_type, input_data):
+        raise AssertionError("BatchingAIService must call generate_batch")
+
+    async def generate_batch(self, job_type, inputs):
+        self.calls.append((job_type, list(inputs)))
+        await asyncio.sleep(0.01)
+        return [
+            ValueError("bad input") if i == self.fail_index else {"echo": item["n"]}
+            for i, item in enumerate(inputs)
+        ]
+
+
+def test_concurrent_calls_share_one_batch_per_job_type():
+    inner = RecordingAIService()
+    service = BatchingAIService(inner, max_batch_size=10, max_wait_ms=20)
+
+    async def main():
+        return await asyncio.gather(
+            *(service.generate(JobType.TEXT_GENERATION, {"n": n}) for n in range(3)),
+            service.generate(JobType.IMAGE_GENERATION, {"n": 99}),
+        )
+
+    results = asyncio.run(main())
+
+    assert results == [{"echo": 0}, {"echo": 1}, {"echo": 2}, {"echo": 99}]
+    assert sorted(len(inputs) for _, inputs in inner.calls) == [1, 3]
+    assert service.stats()["batches"] == 2
+
+
+def test_full_batch_flushes_without_waiting():
+    inner = RecordingAIService()
+    service = BatchingAIService(inner, max_batch_size=2, max_wait_ms=10_000)
+
+    async def main():
+        return await asyncio.wait_for(
+            asyncio.gather(*(service.generate(JobType.TEXT_GENERATION, {"n": n}) for n in range(4))),
+            timeout=1,
+        )
+
+    assert asyncio.run(main()) == [{"echo": n} for n in range(4)]
+    assert [len(inputs) for _, inputs in inner.calls] == [2, 2]
+
+
+def test_item_failure_only_fails_its_caller():
+    inner = RecordingAIService(fail_index=1)
+    service = BatchingAIService(inner, max_batch_size=3, max_wait_ms=20)
+
+    async def main():
+        return await asyncio.gather(
+            *(service.generate(JobType.TEXT_GENERATION, {"n": n}) for n in range(3)),
+            return_exceptions=True,
+        )
+
+    ok0, failed, ok2 = asyncio.run(main())
+    assert ok0 == {"echo": 0} and ok2 == {"echo": 2}
+    assert isinstance(failed, ValueError)
+
+
+def test_cancelled_caller_is_dropped_from_batch():
+    inner = RecordingAIService()
+    service = BatchingAIService(inner, max_batch_size=10, max_wait_ms=20)
+
+    async def main():
+        cancelled = asyncio.ensure_future(service.generate(JobType.TEXT_GENERATION, {"n": 0}))
+        kept = asyncio.ensure_future(service.generate(JobType.TEXT_GENERATION, {"n": 1}))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        result = await kept
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        return result
+
+    assert asyncio.run(main()) == {"echo": 1}
+    assert inner.calls[0][1] == [{"n": 1}]
+
+
+def test_cancelled_dispatch_fails_its_callers():
+    class StalledAIService(RecordingAIService):
+        async def generate_batch(self, job_type, inputs):
+            await asyncio.Event().wait()
+
+    service = BatchingAIService(StalledAIService(), max_batch_size=2, max_wait_ms=20)
+
+    async def main():
+        callers = [asyncio.ensure_future(service.generate(JobType.TEXT_GENERATION, {"n": n})) for n in range(2)]
+        await asyncio.sleep(0.01)
+        dispatch, = [task for task in asyncio.all_tasks() if task.get_coro().__name__ == "_dispatch"]
+        dispatch.cancel()
+        return await asyncio.wait_for(asyncio.gather(*callers, return_exceptions=True), 1)
+
+    results = asyncio.run(main())
+    assert [type(result) for result in results] == [RuntimeError, RuntimeError]
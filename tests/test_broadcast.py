@@ -0,0 +1,50 @@
+import asyncio
+
+from starlette.datastructures import State
+
+from src.presentation.websocket.connection_manager import ConnectionManager
+
+
+class RecordingSocket:
+    def __init__(self, fail=False):
+        self.state = State()
+        self.fail = fail
+        self.frames = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.fail:
+            raise RuntimeError("connection reset")
+        self.frames.append(text)
+
+    async def close(self, code=None, reason=None):
+        pass
+
+
+def test_broadcast_encodes_once_and_reports_fan_out():
+    async def scenario():
+        manager = ConnectionManager(broadcast_chunk_size=2)
+        sockets = [RecordingSocket() for _ in range(5)]
+        for index, socket in enumerate(sockets):
+            await manager.connect(socket, f"user{index % 2}")
+        broken = RecordingSocket(fail=True)
+        await manager.connect(broken, "user0")
+        await asyncio.sleep(0)
+
+        first = await manager.broadcast({"type": "announcement", "n": 1})
+        await asyncio.sleep(0.01)
+        # The broken socket failed its write and was removed; later broadcasts skip it
+        second = await manager.broadcast({"type": "announcement", "n": 2})
+        await asyncio.sleep(0.01)
+        return manager, sockets, first, second
+
+    manager, sockets, first, second = asyncio.run(scenario())
+
+    assert first.recipients == 6 and first.failed == 0
+    assert second.recipients == 5 and second.queued == 5
+    assert all(socket.frames == ['{"type": "announcement", "n": 1}', '{"type": "announcement", "n": 2}'] for socket in sockets)
+    # Every socket received the same encoded frame object
+    assert len({id(socket.frames[0]) for socket in sockets}) == 1
+    assert manager.stats()["last_broadcast"]["recipients"] == 5
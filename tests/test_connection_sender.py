@@ -0,0 +1,134 @@
+import asyncio
+
+from src.presentation.websocket.connection_sender import WS_TRY_AGAIN_LATER, ConnectionSender
+
+
+class StalledSocket:
+    """Blocks every send until released"""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.sent = []
+        self.closed_with = None
+
+    async def send_text(self, text):
+        await self.release.wait()
+        self.sent.append(text)
+
+    async def close(self, code=None, reason=None):
+        self.closed_with = code
+
+
+async def _drain():
+    await asyncio.sleep(0.01)
+
+
+def test_coalesce_replaces_superseded_update_in_place():
+    async def scenario():
+        socket = StalledSocket()
+        sender = ConnectionSender(socket, max_queue=4, overflow_policy="coalesce")
+        sender.start()
+        sender.send("first")
+        await _drain()  # writer now blocked on "first"
+        sender.send("job1:processing", coalesce_key="job1")
+        sender.send("other")
+        sender.send("job1:completed", coalesce_key="job1")
+        socket.release.set()
+        await _drain()
+        sender.stop()
+        return socket.sent, sender
+
+    sent, sender = asyncio.run(scenario())
+
+    assert sent == ["first", "job1:completed", "other"]
+    assert sender.coalesced == 1 and sender.dropped == 0
+
+
+def test_full_queue_drops_per_policy():
+    async def scenario(policy):
+        socket = StalledSocket()
+        sender = ConnectionSender(socket, max_queue=2, overflow_policy=policy, max_consecutive_drops=10)
+        sender.start()
+        sender.send("0")
+        await _drain()
+        for text in ("1", "2", "3"):
+            sender.send(text)
+        socket.release.set()
+        await _drain()
+        sender.stop()
+        return socket.sent
+
+    assert asyncio.run(scenario("drop_oldest")) == ["0", "2", "3"]
+    assert asyncio.run(scenario("drop_newest")) == ["0", "1", "2"]
+
+
+def test_slow_consumer_is_disconnected_without_blocking_the_caller():
+    async def scenario():
+        socket = StalledSocket()
+        closed = []
+        sender = ConnectionSender(
+            socket, max_queue=1, overflow_policy="drop_oldest", max_consecutive_drops=3, on_closed=closed.append
+        )
+        sender.start()
+        for text in range(10):
+            sender.send(str(text))  # never awaits the stalled socket
+        await _drain()
+        return socket, sender, closed
+
+    socket, sender, closed = asyncio.run(scenario())
+
+    assert sender.closed and closed == [sender]
+    assert sender.close_reason == "Slow consumer"
+    assert socket.closed_with == WS_TRY_AGAIN_LATER
+
+
+def test_stalled_final_send_times_out_without_further_traffic():
+    async def scenario():
+        socket = StalledSocket()
+        closed = []
+        sender = ConnectionSender(socket, send_timeout_seconds=0.01, on_closed=closed.append)
+        sender.start()
+        sender.send("last")  # nothing is queued after it
+        await asyncio.sleep(0.05)
+        return sender, socket, closed
+
+    sender, socket, closed = asyncio.run(scenario())
+
+    assert sender.closed and closed == [sender] and sender.queued == 0
+    assert sender._task.done()
+    assert sender.close_reason == "Send timeout" and socket.closed_with == WS_TRY_AGAIN_LATER
+
+
+def test_terminal_frames_are_never_evicted():
+    async def scenario(policy, frames):
+        socket = StalledSocket()
+        sender = ConnectionSender(socket, max_queue=3, overflow_policy=policy, max_consecutive_drops=10)
+        sender.start()
+        sender.send("0")
+        await _drain()  # writer now blocked on "0"
+        for text, terminal in frames:
+            sender.send(text, coalesce_key=f"job:{text[0]}", terminal=terminal)
+        await _drain()
+        if not sender.closed:
+            socket.release.set()
+            await _drain()
+            sender.stop()
+        return socket, sender
+
+    # The oldest queued frame is a job's COMPLETED: the next oldest is evicted instead
+    behind = [("a:completed", True), ("b:processing", False), ("c:processing", False), ("d:processing", False)]
+    for policy in ("drop_oldest", "coalesce"):
+        socket, _ = asyncio.run(scenario(policy, behind))
+        assert socket.sent == ["0", "a:completed", "c:processing", "d:processing"]
+
+    # A newer status of the same job does not replace a queued terminal one
+    socket, _ = asyncio.run(scenario("coalesce", [("a:failed", True), ("a:pending", False)]))
+    assert socket.sent == ["0", "a:failed", "a:pending"]
+
+    # drop_newest still queues an incoming terminal frame
+    socket, _ = asyncio.run(scenario("drop_newest", [("a:x", False), ("b:x", False), ("c:x", False), ("d:completed", True)]))
+    assert socket.sent == ["0", "b:x", "c:x", "d:completed"]
+
+    # Nothing left to evict: disconnect so the client reconnects and replays
+    socket, sender = asyncio.run(scenario("drop_oldest", [(f"{n}:completed", True) for n in range(4)]))
+    assert sender.closed and socket.closed_with == WS_TRY_AGAIN_LATER and socket.sent == []
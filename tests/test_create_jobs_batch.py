@@ -0,0 +1,88 @@
+import asyncio
+
+from src.application.dto import JobCreateRequest, JobResponse
+from src.application.use_cases import JobUseCases
+from src.application.use_cases.job_use_cases import ActiveJobExistsError, EnqueueJobError
+from src.domain.entities import Job, JobStatus, JobType
+
+
+class InMemoryJobRepository:
+    """Mimics MongoJobRepository.create_many, including the active-session unique index"""
+
+    def __init__(self, active=None, fail_insert_at=()):
+        self.active = dict(active or {})
+        self.fail_insert_at = set(fail_insert_at)
+        self.jobs = {}
+        self.insert_calls = 0
+
+    async def create_many(self, jobs_data):
+        self.insert_calls += 1
+        out = []
+        for i, data in enumerate(jobs_data):
+            if i in self.fail_insert_at:
+                out.append(RuntimeError("write error"))
+                continue
+            if data.session_id in self.active:
+                out.append(ActiveJobExistsError(str(self.active[data.session_id].id)))
+                continue
+            job = Job(**data.model_dump())
+            self.jobs[str(job.id)] = job
+            if data.session_id:
+                self.active[data.session_id] = job
+            out.append(job)
+        return out
+
+    async def update(self, job_id, job_data, expected_statuses=None):
+        job = self.jobs[job_id].model_copy(update={k: v for k, v in job_data.model_dump().items() if v is not None})
+        self.jobs[job_id] = job
+        return job
+
+
+class FakeQueue:
+    def __init__(self, fail_job_type=None):
+        self.calls = []
+        self.fail_job_type = fail_job_type
+
+    async def enqueue_jobs(self, jobs):
+        self.calls.append(list(jobs))
+        return [data["job_type"] != self.fail_job_type for _, data in jobs]
+
+
+def _req(session_id=None, job_type=JobType.TEXT_GENERATION):
+    return JobCreateRequest(session_id=session_id, job_type=job_type, input_data={"prompt": "p"})
+
+
+def test_create_jobs_uses_one_insert_and_one_enqueue_call():
+    repo, queue = InMemoryJobRepository(), FakeQueue()
+
+    results = asyncio.run(JobUseCases(repo, queue, None).create_jobs("u1", [_req() for _ in range(5)]))
+
+    assert all(isinstance(r, JobResponse) for r in results)
+    assert repo.insert_calls == 1
+    assert len(queue.calls) == 1 and len(queue.calls[0]) == 5
+    assert queue.calls[0][0][1]["user_id"] == "u1"
+
+
+def test_create_jobs_reports_partial_failures_per_item():
+    existing = Job(user_id="u1", session_id="busy", job_type=JobType.TEXT_GENERATION, input_data={})
+    repo = InMemoryJobRepository(active={"busy": existing}, fail_insert_at={1})
+    queue = FakeQueue(fail_job_type=JobType.IMAGE_GENERATION.value)
+    requests = [
+        _req("busy"),                                   # active job already exists
+        _req("s1"),                                     # first to insert -> insert fails
+        _req("s2"),                                     # ok
+        _req("s2"),                                     # second job for s2 in the same batch
+        _req(job_type=JobType.IMAGE_GENERATION),        # enqueue fails
+    ]
+
+    results = asyncio.run(JobUseCases(repo, queue, None).create_jobs("u1", requests))
+
+    assert isinstance(results[0], ActiveJobExistsError) and results[0].existing_job_id == str(existing.id)
+    assert isinstance(results[1], RuntimeError)
+    assert isinstance(results[2], JobResponse)
+    assert isinstance(results[3], ActiveJobExistsError) and results[3].existing_job_id == results[2].id
+    assert isinstance(results[4], EnqueueJobError)
+    failed = [job for job in repo.jobs.values() if job.job_type == JobType.IMAGE_GENERATION]
+    assert failed[0].status == JobStatus.FAILED
+    # Conflicting items are never enqueued
+    assert {job_id for job_id, _ in queue.calls[0]} == {results[2].id, str(failed[0].id)}
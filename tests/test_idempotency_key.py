@@ -0,0 +1,171 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import pytest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.application.dto import JobResponse
+from src.application.use_cases.job_use_cases import ActiveJobExistsError
+from src.infrastructure.cache import (
+    IdempotencyKeyReusedError,
+    IdempotencyRecordError,
+    IdempotencyReservation,
+    IdempotencyStore,
+)
+from src.infrastructure.cache.idempotency_store import _RENEW
+from src.infrastructure.database.redis_client import RedisClient
+from src.presentation.api.job_routes import JobContext, get_idempotency_store, get_job_context, router as job_router
+
+
+class InMemoryIdempotencyStore:
+    """Same contract as IdempotencyStore, without Redis or waiting"""
+
+    def __init__(self):
+        self.records = {}
+
+    async def acquire(self, user_id, key, fingerprint):
+        record = self.records.get((user_id, key))
+        if record is None:
+            self.records[(user_id, key)] = {"fingerprint": fingerprint, "response": None}
+            return IdempotencyReservation(redis_key=f"{user_id}:{key}", token="t")
+        if record["fingerprint"] != fingerprint:
+            raise IdempotencyKeyReusedError("different body")
+        return record["response"]
+
+    async def complete(self, reservation, response):
+        user_id, key = reservation.redis_key.split(":", 1)
+        self.records[(user_id, key)]["response"] = response
+
+    async def release(self, reservation):
+        user_id, key = reservation.redis_key.split(":", 1)
+        del self.records[(user_id, key)]
+
+    @asynccontextmanager
+    async def keep_alive(self, reservation):
+        yield
+
+
+class CountingUseCases:
+    def __init__(self, fail_with=None):
+        self.calls = 0
+        self.fail_with = fail_with
+
+    async def create_job(self, user_id, job_request):
+        self.calls += 1
+        if self.fail_with:
+            raise self.fail_with
+        now = datetime.utcnow()
+        return JobResponse(
+            id=f"job{self.calls}", user_id=user_id, job_type=job_request.job_type, status="pending",
+            input_data=job_request.input_data, created_at=now, updated_at=now,
+        )
+
+
+def _client(use_cases, store):
+    app = FastAPI()
+    app.dependency_overrides[get_job_context] = lambda: JobContext(user_id="user1", use_cases=use_cases)
+    app.dependency_overrides[get_idempotency_store] = lambda: store
+    app.include_router(job_router, prefix="/api/v1")
+    return TestClient(app)
+
+
+BODY = {"job_type": "text_generation", "input_data": {"prompt": "hi"}}
+
+
+def test_retry_with_same_key_replays_original_job():
+    use_cases = CountingUseCases()
+    client = _client(use_cases, InMemoryIdempotencyStore())
+
+    first = client.post("/api/v1/jobs/", json=BODY, headers={"Idempotency-Key": "k1"})
+    retry = client.post("/api/v1/jobs/", json=BODY, headers={"Idempotency-Key": "k1"})
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json()["id"] == first.json()["id"]
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert use_cases.calls == 1
+
+
+def test_key_reused_with_different_body_is_rejected():
+    client = _client(CountingUseCases(), InMemoryIdempotencyStore())
+
+    client.post("/api/v1/jobs/", json=BODY, headers={"Idempotency-Key": "k1"})
+    other = client.post(
+        "/api/v1/jobs/", json={**BODY, "input_data": {"prompt": "bye"}}, headers={"Idempotency-Key": "k1"}
+    )
+
+    assert other.status_code == 422
+    assert other.json()["detail"]["error"] == "idempotency_key_reused"
+
+
+def test_conflict_releases_key_so_retry_runs_again():
+    use_cases, store = CountingUseCases(fail_with=ActiveJobExistsError("busy")), InMemoryIdempotencyStore()
+    client = _client(use_cases, store)
+
+    first = client.post("/api/v1/jobs/", json=BODY, headers={"Idempotency-Key": "k1"})
+    use_cases.fail_with = None
+    retry = client.post("/api/v1/jobs/", json=BODY, headers={"Idempotency-Key": "k1"})
+
+    assert first.status_code == 409 and first.json()["detail"]["existing_job_id"] == "busy"
+    assert retry.status_code == 201
+    assert use_cases.calls == 2
+
+
+class ScriptRedis:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.scripts = []
+
+    def register_script(self, script):
+        async def run(keys=(), args=()):
+            return await self.eval(script, len(keys), *keys, *args)
+        run.registered_client = self
+        return run
+
+    async def eval(self, script, numkeys, *args):
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.scripts.append(script)
+        return 1
+
+
+def _reservation():
+    return IdempotencyReservation(redis_key="ai_backend:idempotency:u1:abc", token="t")
+
+
+def _response():
+    now = datetime.utcnow()
+    return JobResponse(id="job1", user_id="u1", job_type="text_generation", status="pending",
+                       input_data={}, created_at=now, updated_at=now)
+
+
+def test_reservation_is_renewed_while_the_request_runs(monkeypatch):
+    redis = ScriptRedis()
+    monkeypatch.setattr(RedisClient, "get_client", classmethod(lambda cls: redis))
+    store = IdempotencyStore(pending_ttl_seconds=0.15)
+
+    async def slow_create():
+        async with store.keep_alive(_reservation()):
+            await asyncio.sleep(0.35)  # longer than the pending TTL
+
+    asyncio.run(slow_create())
+    assert redis.scripts.count(_RENEW) >= 3
+
+
+def test_failed_record_is_raised_and_the_created_job_still_returned(monkeypatch):
+    monkeypatch.setattr(RedisClient, "get_client", classmethod(lambda cls: ScriptRedis(fail=True)))
+    store = IdempotencyStore(poll_interval_seconds=0)
+
+    with pytest.raises(IdempotencyRecordError):
+        asyncio.run(store.complete(_reservation(), _response()))
+
+    class FailingRecordStore(InMemoryIdempotencyStore):
+        async def complete(self, reservation, response):
+            raise IdempotencyRecordError("redis down")
+
+    created = _client(CountingUseCases(), FailingRecordStore()).post(
+        "/api/v1/jobs/", json=BODY, headers={"Idempotency-Key": "k1"}
+    )
+    assert created.status_code == 201 and created.json()["id"] == "job1"
@@ -0,0 +1,96 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from pymongo.errors import OperationFailure
+
+from src.domain.entities import JobStatus
+from src.infrastructure.repositories.indexes import INDEXES, QUERY_SHAPES, ensure_indexes, plan_problems
+from src.infrastructure.repositories.mongo_job_repository import ACTIVE_STATUSES
+
+
+def test_plan_problems_accepts_index_scan_with_sort_merge():
+    explain = {"queryPlanner": {"winningPlan": {
+        "stage": "LIMIT",
+        "inputStage": {"stage": "SORT_MERGE", "inputStages": [
+            {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "user_id_1_created_at_-1__id_-1"}},
+            {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "user_id_1_created_at_-1__id_-1"}},
+        ]},
+    }}}
+    assert plan_problems(explain) == []
+
+
+def test_plan_problems_flags_collscan_and_blocking_sort():
+    explain = {"queryPlanner": {"winningPlan": {
+        "stage": "SORT",
+        "inputStage": {"stage": "COLLSCAN"},
+    }}}
+    assert plan_problems(explain) == ["SORT (in-memory sort)", "COLLSCAN (collection scan)"]
+
+
+def test_plan_problems_walks_sbe_query_plan():
+    explain = {"queryPlanner": {"winningPlan": {"queryPlan": {"stage": "COLLSCAN"}, "slotBasedPlan": {}}}}
+    assert plan_problems(explain) == ["COLLSCAN (collection scan)"]
+
+
+def test_every_query_shape_targets_a_registered_collection():
+    assert {shape.collection for shape in QUERY_SHAPES} <= set(INDEXES)
+    assert len({shape.name for shape in QUERY_SHAPES}) == len(QUERY_SHAPES)
+
+
+class FakeAggregate:
+    def __init__(self, groups):
+        self.groups = groups
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for group in self.groups:
+            yield group
+
+
+class FakeJobs:
+    def __init__(self, groups=(), fail_unique=False):
+        self.groups = list(groups)
+        self.fail_unique = fail_unique
+        self.updates = []
+        self.created = []
+
+    def aggregate(self, pipeline):
+        return FakeAggregate(self.groups)
+
+    async def update_many(self, query, update):
+        self.updates.append((query, update))
+        return SimpleNamespace(modified_count=len(query["_id"]["$in"]))
+
+    async def create_indexes(self, models):
+        (model,) = models
+        if self.fail_unique and model.document.get("unique"):
+            raise OperationFailure("E11000 duplicate key error")
+        self.created.append(model.document["name"])
+        return [model.document["name"]]
+
+
+class FakeDatabase(dict):
+    def __getattr__(self, name):
+        return self[name]
+
+
+def test_ensure_indexes_fails_duplicate_active_jobs_before_building():
+    jobs = FakeJobs(groups=[{"_id": {"user_id": "u1", "session_id": "s1"}, "ids": ["oldest", "dup1", "dup2"]}])
+    database = FakeDatabase({name: jobs if name == "jobs" else FakeJobs() for name in INDEXES})
+
+    asyncio.run(ensure_indexes(database))
+
+    (query, update), = jobs.updates
+    assert query["_id"] == {"$in": ["dup1", "dup2"]} and query["status"] == {"$in": ACTIVE_STATUSES}
+    assert update["$set"]["status"] == JobStatus.FAILED.value
+    assert len(jobs.created) == len(INDEXES["jobs"])
+
+
+def test_ensure_indexes_raises_when_a_unique_index_cannot_be_built():
+    database = FakeDatabase({name: FakeJobs(fail_unique=True) for name in INDEXES})
+
+    with pytest.raises(OperationFailure):
+        asyncio.run(ensure_indexes(database))
@@ -0,0 +1,94 @@
+import asyncio
+import json
+
+from starlette.datastructures import State
+
+from src.infrastructure.database.redis_client import RedisClient
+from src.infrastructure.events.job_event_log import JobEventLog, stream_key
+from src.presentation.websocket import websocket_routes
+from src.presentation.websocket.connection_sender import ConnectionSender
+
+
+def _key(event_id):
+    ms, seq = event_id.split("-")
+    return int(ms), int(seq)
+
+
+class FakeStreams:
+    """XRANGE over in-memory streams ("-", "+", inclusive and "(" exclusive bounds)"""
+
+    def __init__(self, streams):
+        self.streams = streams
+
+    async def xrange(self, name, min="-", max="+", count=None):
+        entries = []
+        for event_id, fields in self.streams.get(name, []):
+            if min.startswith("("):
+                if _key(event_id) <= _key(min[1:]):
+                    continue
+            elif min != "-" and _key(event_id) < _key(min):
+                continue
+            if max != "+" and _key(event_id) > _key(max):
+                continue
+            entries.append((event_id, fields))
+        return entries[:count]
+
+
+class FakeSocket:
+    def __init__(self):
+        self.state = State()
+        self.sent = []
+
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+
+
+def _event(event_id, job_id, status):
+    return event_id, {"data": json.dumps({"type": "job_status_update", "job_id": job_id, "status": status})}
+
+
+def test_read_after_is_gap_free_only_while_last_event_is_retained(monkeypatch):
+    # "1-0" was trimmed away; "2-0".."5-0" remain
+    fake = FakeStreams({stream_key("u1"): [_event(f"{n}-0", f"j{n}", "COMPLETED") for n in range(2, 6)]})
+    monkeypatch.setattr(RedisClient, "get_client", classmethod(lambda cls: fake))
+    log = JobEventLog(page_size=2)
+
+    events, gap = asyncio.run(log.read_after("u1", "3-0"))
+    assert [event_id for event_id, _ in events] == ["4-0", "5-0"] and not gap
+    assert events[0][1]["job_id"] == "j4"
+
+    events, gap = asyncio.run(log.read_after("u1", "1-0"))
+    assert [event_id for event_id, _ in events] == ["2-0", "3-0", "4-0", "5-0"] and gap
+
+    assert asyncio.run(log.read_after("u1", "not-an-id")) == ([], True)
+
+
+def test_replay_then_held_live_frames_without_duplicates(monkeypatch):
+    fake = FakeStreams({stream_key("u1"): [_event("9-0", "b", "PENDING"), _event("10-0", "a", "PROCESSING"), _event("11-0", "a", "COMPLETED")]})
+    monkeypatch.setattr(RedisClient, "get_client", classmethod(lambda cls: fake))
+    websocket = FakeSocket()
+
+    async def main():
+        sender = ConnectionSender(websocket)
+        websocket.state.sender = sender
+        sender.hold()
+        sender.start()
+        # Published while the replay was being read: one already in the log, one newer
+        sender.send(json.dumps({"type": "job_status_update", "event_id": "11-0"}), "job_status:a", "11-0")
+        sender.send(json.dumps({"type": "job_status_update", "event_id": "12-0"}), "job_status:b", "12-0")
+        await asyncio.sleep(0.01)
+        assert websocket.sent == []
+        await websocket_routes._replay(websocket, "u1", "9-0")
+        await asyncio.sleep(0.01)
+        sender.stop()
+
+    asyncio.run(main())
+
+    assert [(m["type"], m.get("event_id")) for m in websocket.sent] == [
+        ("job_status_update", "10-0"),
+        ("job_status_update", "11-0"),
+        ("replay_complete", None),
+        ("job_status_update", "12-0"),
+    ]
+    assert websocket.sent[2] == {"type": "replay_complete", "last_event_id": "11-0", "replayed": 2, "gap": False}
+    assert websocket.sent[1]["status"] == "COMPLETED"
@@ -0,0 +1,65 @@
+import asyncio
+
+from src.domain.entities import JobType
+from src.infrastructure.events.job_progress_publisher import JobProgressPublisher, merge_partial
+from src.infrastructure.external.fake_ai_service import FakeAIService
+
+
+def test_merge_partial_concatenates_text_and_extends_lists():
+    pending = {}
+    merge_partial(pending, {"text": "Hello", "audio_chunks": ["a"]})
+    merge_partial(pending, {"text": " world", "audio_chunks": ["b"], "stage": "decode"})
+    assert pending == {"text": "Hello world", "audio_chunks": ["a", "b"], "stage": "decode"}
+
+
+def test_publisher_sends_first_event_immediately_then_coalesces():
+    sent = []
+
+    async def publish(progress, partial):
+        sent.append((progress, partial))
+
+    async def main():
+        publisher = JobProgressPublisher(publish, min_interval_seconds=0.05)
+        await publisher.push({"progress": 10, "delta": {"text": "The"}})
+        await asyncio.sleep(0)
+        assert sent == [(10, {"text": "The"})]
+        for i, word in enumerate([" quick", " brown", " fox"]):
+            await publisher.push({"progress": 20 + i * 10, "delta": {"text": word}})
+        await asyncio.sleep(0.1)
+        await publisher.push({"progress": 100, "delta": {"text": "."}})
+        await publisher.close()
+        return publisher
+
+    publisher = asyncio.run(main())
+    assert sent == [(10, {"text": "The"}), (40, {"text": " quick brown fox"}), (100, {"text": "."})]
+    assert publisher.events == 5 and publisher.published == 3
+
+
+def test_close_flushes_pending_tail_without_waiting_for_interval():
+    sent = []
+
+    async def publish(progress, partial):
+        sent.append((progress, partial))
+
+    async def main():
+        publisher = JobProgressPublisher(publish, min_interval_seconds=10)
+        await publisher.push({"progress": 50})
+        await asyncio.sleep(0)
+        await publisher.push({"progress": 90, "delta": {"text": "tail"}})
+        await asyncio.wait_for(publisher.close(), timeout=1)
+
+    asyncio.run(main())
+    assert sent == [(50, None), (90, {"text": "tail"})]
+
+
+def test_fake_stream_yields_partials_then_matching_result():
+    service = FakeAIService(latency_range=(0, 0))
+
+    async def main():
+        return [event async for event in service.generate_stream(JobType.TEXT_GENERATION, {"prompt": "hi"})]
+
+    events = asyncio.run(main())
+    partials, final = events[:-1], events[-1]
+    assert partials and partials[-1]["progress"] == 100
+    text = "".join(event["delta"]["text"] for event in partials)
+    assert final["result"]["output_data"]["generated_text"] == text
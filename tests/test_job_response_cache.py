@@ -0,0 +1,69 @@
+import asyncio
+import time
+from datetime import datetime
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.application.dto import JobResponse
+from src.infrastructure.cache import JobResponseCache
+from src.presentation.api.job_routes import JobContext, get_job_cache, get_job_context, router as job_router
+
+
+def _job(job_id="j1", status="completed"):
+    return JobResponse(
+        id=job_id, user_id="user1", job_type="text_generation", status=status,
+        input_data={"prompt": "hi"}, created_at=datetime.utcnow(), updated_at=datetime.utcnow(),
+    )
+
+
+def test_terminal_jobs_are_served_from_cache_and_active_ones_expire():
+    cache = JobResponseCache(terminal_ttl_seconds=60, active_ttl_seconds=0.05)
+
+    async def main():
+        await cache.put(_job("done", "completed"))
+        await cache.put(_job("running", "processing"))
+        assert (await cache.get("done")).id == "done"
+        assert (await cache.get("running")).id == "running"
+        time.sleep(0.06)
+        return await cache.get("done"), await cache.get("running")
+
+    done, running = asyncio.run(main())
+    assert done is not None and running is None
+    assert cache.stats()["local_hits"] == 3 and cache.stats()["misses"] == 1
+
+
+def test_invalidate_and_lru_bound():
+    cache = JobResponseCache(max_entries=2, active_ttl_seconds=60)
+
+    async def main():
+        await cache.put(_job("a", "pending"))
+        await cache.put(_job("b"))
+        await cache.get("a")               # a becomes most recently used
+        await cache.put(_job("c"))         # evicts b
+        cache.invalidate("a")
+        return [await cache.get(job_id) for job_id in ("a", "b", "c")]
+
+    a, b, c = asyncio.run(main())
+    assert a is None and b is None and c.id == "c"
+
+
+def test_get_job_route_reads_through_cache():
+    calls = []
+
+    class FakeJobUseCases:
+        async def get_job_by_id(self, job_id):
+            calls.append(job_id)
+            return _job(job_id)
+
+    cache = JobResponseCache()
+    app = FastAPI()
+    app.dependency_overrides[get_job_context] = lambda: JobContext(user_id="user1", use_cases=FakeJobUseCases())
+    app.dependency_overrides[get_job_cache] = lambda: cache
+    app.include_router(job_router, prefix="/api/v1")
+    client = TestClient(app)
+
+    responses = [client.get("/api/v1/jobs/j1") for _ in range(5)]
+
+    assert all(r.status_code == 200 and r.json()["id"] == "j1" for r in responses)
+    assert calls == ["j1"]
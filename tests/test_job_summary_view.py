@@ -0,0 +1,58 @@
+from datetime import datetime
+
+from bson import ObjectId
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.application.dto import JobPageResponse, JobResponse, JobSummaryPageResponse, JobSummaryResponse
+from src.domain.entities import JobSummary
+from src.infrastructure.repositories.mongo_job_repository import JOB_SUMMARY_PROJECTION
+from src.presentation.api.job_routes import JobContext, get_job_context, router as job_router
+
+NOW = datetime(2024, 1, 1)
+
+
+class FakeJobUseCases:
+    async def get_user_jobs(self, user_id, limit, cursor):
+        return JobPageResponse(items=[JobResponse(
+            id="j1", user_id=user_id, job_type="text_generation", status="completed",
+            input_data={"prompt": "hi"}, output_data={"generated_text": "hello"},
+            created_at=NOW, updated_at=NOW,
+        )])
+
+    async def get_user_job_summaries(self, user_id, limit, cursor):
+        return JobSummaryPageResponse(items=[JobSummaryResponse(
+            id="j1", user_id=user_id, job_type="text_generation", status="completed",
+            created_at=NOW, updated_at=NOW,
+        )], next_cursor="next")
+
+
+def _client():
+    app = FastAPI()
+    app.dependency_overrides[get_job_context] = lambda: JobContext(user_id="user1", use_cases=FakeJobUseCases())
+    app.include_router(job_router, prefix="/api/v1")
+    return TestClient(app)
+
+
+def test_summary_view_omits_payloads():
+    client = _client()
+
+    full = client.get("/api/v1/jobs/").json()["items"][0]
+    summary = client.get("/api/v1/jobs/", params={"view": "summary"}).json()
+
+    assert full["input_data"] == {"prompt": "hi"}
+    assert "input_data" not in summary["items"][0] and "output_data" not in summary["items"][0]
+    assert summary["items"][0]["status"] == "completed"
+    assert summary["next_cursor"] == "next"
+    assert client.get("/api/v1/jobs/", params={"view": "bogus"}).status_code == 422
+
+
+def test_summary_projection_excludes_payloads_but_keeps_cursor_fields():
+    assert "input_data" not in JOB_SUMMARY_PROJECTION and "output_data" not in JOB_SUMMARY_PROJECTION
+    assert JOB_SUMMARY_PROJECTION["_id"] == 1 and JOB_SUMMARY_PROJECTION["created_at"] == 1
+
+    doc = {k: v for k, v in {
+        "_id": ObjectId(), "user_id": "u1", "job_type": "image_generation", "status": "pending",
+        "created_at": NOW, "updated_at": NOW,
+    }.items() if k in JOB_SUMMARY_PROJECTION}
+    assert JobSummary(**doc).job_type == "image_generation"
@@ -0,0 +1,95 @@
+import asyncio
+
+from src.application.use_cases import JobUseCases
+from src.domain.entities import Job, JobStatus, JobType
+
+
+class InMemoryJobRepository:
+    """Mimics the guarded find_one_and_update semantics of MongoJobRepository.update"""
+
+    def __init__(self, *jobs):
+        self.jobs = {str(job.id): job for job in jobs}
+        self.round_trips = 0
+
+    async def update(self, job_id, job_data, expected_statuses=None):
+        self.round_trips += 1
+        job = self.jobs.get(job_id)
+        if job is None or (expected_statuses is not None and job.status not in expected_statuses):
+            return None
+        updated = job.model_copy(update={k: v for k, v in job_data.model_dump().items() if v is not None})
+        self.jobs[job_id] = updated
+        return updated
+
+
+class FakeAI:
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+
+    async def generate(self, job_type, input_data):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("model exploded")
+        return {"output_data": {"ok": True}, "artifact_url": "https://example.com/a.png"}
+
+
+def _job(status=JobStatus.PENDING):
+    return Job(user_id="u1", job_type=JobType.IMAGE_GENERATION, input_data={"prompt": "x"}, status=status)
+
+
+def test_process_job_claims_and_completes_in_two_round_trips():
+    job = _job()
+    repo, ai = InMemoryJobRepository(job), FakeAI()
+
+    result = asyncio.run(JobUseCases(repo, None, ai).process_job(str(job.id)))
+
+    assert result.status == JobStatus.COMPLETED
+    assert result.output_data == {"ok": True}
+    assert result.started_at is not None and result.completed_at is not None
+    assert repo.round_trips == 2
+
+
+def test_duplicate_delivery_is_a_no_op():
+    job = _job()
+    repo, ai = InMemoryJobRepository(job), FakeAI()
+    use_cases = JobUseCases(repo, None, ai)
+
+    asyncio.run(use_cases.process_job(str(job.id)))
+    again = asyncio.run(use_cases.process_job(str(job.id)))
+
+    assert again is None
+    assert ai.calls == 1
+    assert repo.jobs[str(job.id)].status == JobStatus.COMPLETED
+
+
+def test_failure_is_recorded_and_late_completion_cannot_overwrite_it():
+    job = _job()
+    repo = InMemoryJobRepository(job)
+    use_cases = JobUseCases(repo, None, FakeAI(fail=True))
+
+    result = asyncio.run(use_cases.process_job(str(job.id)))
+    late = asyncio.run(use_cases.update_job_status(str(job.id), JobStatus.COMPLETED, output_data={"late": True}))
+
+    assert result.status == JobStatus.FAILED and result.error_message == "model exploded"
+    assert late is None
+    assert repo.jobs[str(job.id)].output_data is None
+
+
+class RecordingNotifier:
+    def __init__(self):
+        self.events = []
+
+    async def notify_job_status(self, user_id, job_id, status, session_id=None, message=None):
+        self.events.append((job_id, status))
+
+
+def test_processing_is_announced_only_after_a_successful_claim():
+    job = _job()
+    repo, notifier = InMemoryJobRepository(job), RecordingNotifier()
+    use_cases = JobUseCases(repo, None, FakeAI(), None, notifier)
+
+    asyncio.run(use_cases.process_job(str(job.id)))
+    # Redelivery (or a publish that arrived after the enqueue timeout) of a finished job
+    asyncio.run(use_cases.process_job(str(job.id)))
+
+    assert notifier.events == [(str(job.id), "PROCESSING")]
@@ -0,0 +1,103 @@
+import asyncio
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk
+
+from src.config import jwks as jwks_module
+from src.config.jwks import JWKSKeyStore
+
+ISSUER = "https://issuer.test"
+
+
+def make_jwks(*kids):
+    keys = []
+    for kid in kids:
+        private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        pem = private.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        ).decode()
+        keys.append({**jwk.construct(pem, algorithm="RS256").to_dict(), "kid": kid})
+    return {"keys": keys}
+
+
+class FakeIssuer:
+    def __init__(self, jwks, delay=0.0):
+        self.jwks = jwks
+        self.delay = delay
+        self.calls = 0
+        self.fail = False
+
+    async def fetch(self, issuer):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("issuer down")
+        return self.jwks
+
+
+def test_concurrent_cold_lookups_share_one_fetch():
+    issuer = FakeIssuer(make_jwks("k1"), delay=0.05)
+    store = JWKSKeyStore(ISSUER, issuer.fetch)
+
+    async def run():
+        return await asyncio.gather(*(store.get_key("k1", "RS256") for _ in range(50)))
+
+    keys = asyncio.run(run())
+    assert issuer.calls == 1
+    assert all(k is keys[0] for k in keys)
+
+
+def test_unknown_kid_refresh_is_rate_limited():
+    issuer = FakeIssuer(make_jwks("k1"))
+    store = JWKSKeyStore(ISSUER, issuer.fetch, unknown_kid_refresh_interval=30)
+
+    async def run():
+        await store.get_key("k1", "RS256")
+        results = [await store.get_key("unknown", "RS256") for _ in range(20)]
+        return results
+
+    assert asyncio.run(run()) == [None] * 20
+    # Initial fetch + a single forced refresh for the unknown kid
+    assert issuer.calls == 2
+
+
+def test_bogus_kid_does_not_block_a_rotated_key():
+    issuer = FakeIssuer(make_jwks("k1"))
+    store = JWKSKeyStore(ISSUER, issuer.fetch, unknown_kid_refresh_interval=30, unknown_kid_refresh_burst=3)
+
+    async def run():
+        await store.get_key("k1", "RS256")
+        assert await store.get_key("bogus", "RS256") is None
+        # The issuer rotates right after; the new kid still gets its own refresh
+        issuer.jwks = make_jwks("k1", "k2")
+        rotated = await store.get_key("k2", "RS256")
+        # A flood of random kids is capped by the shared burst
+        flood = [await store.get_key(f"random-{n}", "RS256") for n in range(10)]
+        return rotated, flood
+
+    rotated, flood = asyncio.run(run())
+    assert rotated is not None and flood == [None] * 10
+    # Initial fetch + bogus + k2 + one more forced refresh before the burst is spent
+    assert issuer.calls == 4
+
+
+def test_stale_keys_served_while_background_refresh_fails(monkeypatch):
+    issuer = FakeIssuer(make_jwks("k1"))
+    store = JWKSKeyStore(ISSUER, issuer.fetch, ttl_seconds=600, refresh_ahead_seconds=60)
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(jwks_module.time, "monotonic", lambda: clock["now"])
+
+    async def run():
+        first = await store.get_key("k1", "RS256")
+        issuer.fail = True
+        clock["now"] += 700  # past TTL, still within max_stale_seconds
+        stale = await store.get_key("k1", "RS256")
+        await asyncio.sleep(0)  # let the background refresh run and fail
+        await asyncio.sleep(0)
+        return first, stale
+
+    first, stale = asyncio.run(run())
+    assert stale is first
+    assert issuer.calls == 2
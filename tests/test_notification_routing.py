@@ -0,0 +1,117 @@
+import asyncio
+import json
+
+from starlette.datastructures import State
+
+from src.infrastructure.events import simple_job_notifier
+from src.infrastructure.events.job_event_log import stream_key
+from src.infrastructure.events.redis_notification_subscriber import RedisNotificationSubscriber
+from src.infrastructure.events.simple_job_notifier import (
+    JOB_CACHE_INVALIDATION_CHANNEL,
+    SimpleJobNotifier,
+    user_channel,
+)
+from src.presentation.websocket.connection_manager import ConnectionManager
+
+
+class FakeSocket:
+    def __init__(self):
+        self.state = State()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        pass
+
+    async def close(self, code=None, reason=None):
+        pass
+
+
+class FakePubSub:
+    def __init__(self):
+        self.commands = []
+
+    async def subscribe(self, *channels):
+        self.commands.append(("subscribe", channels))
+
+    async def unsubscribe(self, *channels):
+        self.commands.append(("unsubscribe", channels))
+
+
+class FakeRedis:
+    def __init__(self):
+        self.calls = []
+
+    def register_script(self, script):
+        def run(keys=(), args=()):
+            self.calls.append((tuple(keys), tuple(args)))
+        run.registered_client = self
+        return run
+
+
+def test_status_is_published_to_the_user_channel_and_invalidation_channel(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(simple_job_notifier, "_sync_redis", fake)
+
+    SimpleJobNotifier.notify_job_status_sync("user1", "job1", "completed", session_id="s1")
+
+    (keys, args), = fake.calls
+    assert keys == (stream_key("user1"), user_channel("user1"), JOB_CACHE_INVALIDATION_CHANNEL)
+    assert json.loads(args[2])["job_id"] == "job1" and args[3] == "job1"
+
+
+def test_subscriptions_follow_presence_in_batches():
+    manager = ConnectionManager(presence_timeout_seconds=0)
+    subscriber = RedisNotificationSubscriber(connection_manager=manager)
+    pubsub = FakePubSub()
+
+    async def main():
+        manager.add_presence_listener(subscriber._user_online, subscriber._user_offline)
+        sockets = {user_id: FakeSocket() for user_id in ("a", "b", "c")}
+        for user_id, socket in sockets.items():
+            await manager.connect(socket, user_id)
+        # A second socket for a connected user changes nothing
+        await manager.connect(FakeSocket(), "a")
+        await subscriber._sync_once(pubsub)
+
+        manager.disconnect(sockets["b"], "b")
+        manager.disconnect(sockets["a"], "a")  # "a" still has another socket
+        # Connected and gone again before the next sync: never subscribed
+        late = FakeSocket()
+        await manager.connect(late, "d")
+        manager.disconnect(late, "d")
+        await subscriber._sync_once(pubsub)
+        for socket in list(manager.active_connections.get("a", [])) + [sockets["c"]]:
+            socket.state.sender.stop()
+
+    asyncio.run(main())
+
+    assert pubsub.commands == [
+        ("subscribe", (user_channel("a"), user_channel("b"), user_channel("c"))),
+        ("unsubscribe", (user_channel("b"),)),
+    ]
+    assert subscriber._subscribed == {"a", "c"}
+
+
+def test_connect_returns_once_the_user_channel_is_subscribed():
+    manager = ConnectionManager(presence_timeout_seconds=5)
+    subscriber = RedisNotificationSubscriber(connection_manager=manager)
+    pubsub = FakePubSub()
+
+    async def main():
+        manager.add_presence_listener(subscriber._user_online, subscriber._user_offline)
+        socket = FakeSocket()
+        connect = asyncio.create_task(manager.connect(socket, "a"))
+        await asyncio.sleep(0.01)
+        assert not connect.done()
+        await subscriber._sync_once(pubsub)
+        await asyncio.wait_for(connect, 1)
+        # Already subscribed: a second socket does not wait
+        other = FakeSocket()
+        await asyncio.wait_for(manager.connect(other, "a"), 0.1)
+        socket.state.sender.stop()
+        other.state.sender.stop()
+
+    asyncio.run(main())
+    assert pubsub.commands == [("subscribe", (user_channel("a"),))]
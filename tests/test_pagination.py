@@ -0,0 +1,111 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from bson import ObjectId
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.application.dto import JobPageResponse
+from src.domain.entities import InvalidCursorError, PageCursor
+from src.infrastructure.repositories.pagination import KEYSET_SORT, fetch_page, keyset_query
+from src.presentation.api.job_routes import JobContext, get_job_context, router as job_router
+
+
+def test_cursor_round_trips_at_millisecond_precision():
+    oid = str(ObjectId())
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123000)  # naive UTC, as read back from Mongo
+    token = PageCursor(created_at=created_at, id=oid).encode()
+
+    decoded = PageCursor.decode(token)
+
+    assert decoded.id == oid
+    assert decoded.created_at == created_at.replace(tzinfo=timezone.utc)
+    assert "=" not in token
+
+
+@pytest.mark.parametrize("token", ["not-base64!", "e30", "eyJ0IjoieCJ9"])
+def test_invalid_cursor_is_rejected(token):
+    with pytest.raises(InvalidCursorError):
+        PageCursor.decode(token)
+
+
+def test_keyset_query_continues_strictly_after_cursor():
+    oid = ObjectId()
+    cursor = PageCursor(created_at=datetime(2024, 1, 1, tzinfo=timezone.utc), id=str(oid))
+
+    query = keyset_query({"user_id": "u1"}, cursor)
+
+    assert query == {
+        "$and": [
+            {"user_id": "u1"},
+            {"$or": [
+                {"created_at": {"$lt": cursor.created_at}},
+                {"created_at": cursor.created_at, "_id": {"$lt": oid}},
+            ]},
+        ]
+    }
+    assert keyset_query({"user_id": "u1"}, None) == {"user_id": "u1"}
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+        self.sort_spec = None
+        self.limit_n = None
+
+    def sort(self, spec):
+        self.sort_spec = spec
+        return self
+
+    def limit(self, n):
+        self.limit_n = n
+        return self
+
+    async def to_list(self, length):
+        return self.docs[: self.limit_n]
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+        self.cursors = []
+
+    def find(self, query, projection=None):
+        self.queries.append((query, projection))
+        cursor = FakeCursor(self.docs)
+        self.cursors.append(cursor)
+        return cursor
+
+
+def test_fetch_page_reads_one_extra_and_returns_next_cursor():
+    docs = [{"_id": ObjectId(), "created_at": datetime(2024, 1, 1, 0, 0, 3 - i)} for i in range(3)]
+    collection = FakeCollection(docs)
+
+    page = asyncio.run(fetch_page(collection, {}, 2, None, lambda doc: doc["_id"]))
+
+    assert page.items == [docs[0]["_id"], docs[1]["_id"]]
+    assert collection.cursors[0].limit_n == 3
+    assert collection.cursors[0].sort_spec == KEYSET_SORT
+    assert PageCursor.decode(page.next_cursor).id == str(docs[1]["_id"])
+
+    last = asyncio.run(fetch_page(FakeCollection(docs[:1]), {}, 2, None, lambda doc: doc))
+    assert last.next_cursor is None
+
+
+def test_list_jobs_route_rejects_bad_cursor_with_400():
+    class FakeJobUseCases:
+        async def get_user_jobs(self, user_id, limit, cursor):
+            if cursor:
+                PageCursor.decode(cursor)
+            return JobPageResponse(items=[])
+
+    app = FastAPI()
+    app.dependency_overrides[get_job_context] = lambda: JobContext(user_id="user1", use_cases=FakeJobUseCases())
+    app.include_router(job_router, prefix="/api/v1")
+    client = TestClient(app)
+
+    assert client.get("/api/v1/jobs/").json() == {"items": [], "next_cursor": None}
+    resp = client.get("/api/v1/jobs/", params={"cursor": "garbage"})
+    assert resp.status_code == 400
@@ -0,0 +1,65 @@
+import asyncio
+import json
+import time
+
+from src.infrastructure.queue import queue_metrics
+from src.infrastructure.queue.queue_metrics import QueueMetricsCollector
+
+
+class FakePipeline:
+    def __init__(self, data):
+        self.data = data
+        self.ops = []
+
+    def llen(self, key):
+        self.ops.append(len(self.data.get(key, [])))
+
+    def hlen(self, key):
+        self.ops.append(len(self.data.get(key, {})))
+
+    def hgetall(self, key):
+        self.ops.append(dict(self.data.get(key, {})))
+
+    async def execute(self):
+        return self.ops
+
+
+class FakeRedis:
+    def __init__(self, data):
+        self.data = data
+        self.deleted = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self.data)
+
+    async def hdel(self, key, *fields):
+        self.deleted.extend(fields)
+
+
+def test_snapshot_is_served_from_memory_with_age(monkeypatch):
+    now = time.time()
+    fake = FakeRedis({
+        "ai_jobs": ["m1", "m2"],
+        "ai_jobs\x06\x163": ["m3"],
+        "unacked": {"t1": "x"},
+        "ai_backend:worker_heartbeats": {
+            "w1@host": json.dumps({"ts": now, "active": 2, "reserved": 1}),
+            "w2@host": json.dumps({"ts": now - 30, "active": 5, "reserved": 0}),
+            "w3@host": json.dumps({"ts": now - 3600, "active": 0, "reserved": 0}),
+        },
+    })
+    monkeypatch.setattr(queue_metrics.RedisClient, "get_client", classmethod(lambda cls: fake))
+    collector = QueueMetricsCollector("ai_jobs", heartbeat_timeout_seconds=10)
+
+    assert collector.get_snapshot()["snapshot_age_seconds"] is None
+
+    asyncio.run(collector.sample())
+    snapshot = collector.get_snapshot()
+
+    assert snapshot["queued_tasks"] == 3
+    assert snapshot["unacked_tasks"] == 1
+    assert snapshot["active_tasks"] == 2
+    assert snapshot["workers"] == ["w1@host"]
+    assert snapshot["stale_workers"] == ["w2@host", "w3@host"]
+    assert snapshot["snapshot_age_seconds"] >= 0
+    assert fake.deleted == ["w3@host"]
@@ -0,0 +1,139 @@
+import asyncio
+
+import pytest
+
+from src.application.dto import JobCreateRequest
+from src.application.use_cases import JobUseCases
+from src.domain.repositories import ActiveJobExistsError
+from src.domain.entities import Job, JobStatus, JobType
+from src.infrastructure.cache.result_cache import RedisResultCache, result_key
+from tests.test_job_transitions import FakeAI, InMemoryJobRepository, RecordingNotifier
+
+
+class DictResultCache:
+    def __init__(self, entries=None):
+        self.entries = dict(entries or {})
+
+    async def get(self, job_type, input_data):
+        return self.entries.get(result_key(job_type, input_data))
+
+    async def put(self, job_type, input_data, result):
+        self.entries[result_key(job_type, input_data)] = result
+
+    async def stats(self):
+        return {"entries": len(self.entries)}
+
+
+class CreatingRepository(InMemoryJobRepository):
+    async def create(self, job_data):
+        job = Job(**job_data.model_dump())
+        self.jobs[str(job.id)] = job
+        return job
+
+
+class RecordingQueue:
+    def __init__(self):
+        self.enqueued = []
+
+    async def enqueue_job(self, job_id, job_data):
+        self.enqueued.append(job_id)
+        return True
+
+
+def test_result_key_is_canonical():
+    composed, decomposed = "café", "café"
+    assert result_key(JobType.AUDIO_GENERATION, {"text": composed, "voice": "a"}) == \
+        result_key("audio_generation", {"voice": "a", "text": decomposed})
+    assert result_key(JobType.AUDIO_GENERATION, {"text": "hi"}) != result_key(JobType.TEXT_GENERATION, {"text": "hi"})
+    assert result_key(JobType.AUDIO_GENERATION, {"text": "hi"}) != result_key(JobType.AUDIO_GENERATION, {"text": "hi "})
+
+
+def test_only_opted_in_job_types_are_cached():
+    cache = RedisResultCache(["audio_generation"])
+
+    assert cache.caches(JobType.AUDIO_GENERATION)
+    assert not cache.caches(JobType.TEXT_GENERATION)
+    # Not opted in: answered locally without touching Redis
+    assert asyncio.run(cache.get(JobType.TEXT_GENERATION, {"prompt": "x"})) is None
+
+
+def test_process_job_stores_result_then_identical_job_skips_ai():
+    first, second = (Job(user_id="u1", job_type=JobType.IMAGE_GENERATION, input_data={"prompt": "x"}) for _ in range(2))
+    repo, ai, cache = InMemoryJobRepository(first, second), FakeAI(), DictResultCache()
+    use_cases = JobUseCases(repo, None, ai, cache)
+
+    asyncio.run(use_cases.process_job(str(first.id)))
+    result = asyncio.run(use_cases.process_job(str(second.id)))
+
+    assert ai.calls == 1
+    assert result.status == JobStatus.COMPLETED
+    assert result.artifact_url == "https://example.com/a.png"
+
+
+def test_create_job_cache_hit_completes_without_enqueue():
+    request = JobCreateRequest(job_type=JobType.AUDIO_GENERATION, input_data={"text": "hello"})
+    cache = DictResultCache({
+        result_key(request.job_type, request.input_data): {"output_data": {"duration": 1}, "artifact_url": "s3://a.mp3"}
+    })
+    repo, queue, notifier = CreatingRepository(), RecordingQueue(), RecordingNotifier()
+
+    response = asyncio.run(JobUseCases(repo, queue, FakeAI(), cache, notifier).create_job("u1", request))
+
+    assert response.status == JobStatus.COMPLETED
+    assert response.artifact_url == "s3://a.mp3"
+    assert response.started_at is not None and response.completed_at is not None
+    assert queue.enqueued == []
+    # Sockets and the event log hear about it like a worker completion
+    assert notifier.events == [(response.id, "COMPLETED")]
+
+
+def test_create_job_conflict_skips_the_cache_lookup():
+    class ConflictingRepository(CreatingRepository):
+        async def create(self, job_data):
+            raise ActiveJobExistsError("active job exists")
+
+    class CountingCache(DictResultCache):
+        lookups = 0
+
+        async def get(self, job_type, input_data):
+            self.lookups += 1
+            return await super().get(job_type, input_data)
+
+    cache = CountingCache()
+    use_cases = JobUseCases(ConflictingRepository(), RecordingQueue(), FakeAI(), cache)
+
+    with pytest.raises(ActiveJobExistsError):
+        asyncio.run(use_cases.create_job("u1", JobCreateRequest(job_type=JobType.AUDIO_GENERATION, input_data={"text": "x"})))
+    assert cache.lookups == 0
+
+
+def test_scripts_run_by_sha_and_load_once_on_noscript(monkeypatch):
+    from redis.asyncio import Redis
+    from redis.exceptions import NoScriptError
+
+    from src.infrastructure.database.redis_client import RedisClient
+
+    client = Redis.from_url("redis://localhost:6379/0", decode_responses=True)
+    loaded, calls = set(), []
+
+    async def evalsha(sha, numkeys, *args):
+        calls.append(sha)
+        if sha not in loaded:
+            raise NoScriptError("NOSCRIPT")
+        return None
+
+    async def script_load(script):
+        sha = RedisClient.script(script).sha
+        loaded.add(sha)
+        return sha
+
+    monkeypatch.setattr(client, "evalsha", evalsha)
+    monkeypatch.setattr(client, "script_load", script_load)
+    monkeypatch.setattr(RedisClient, "get_client", classmethod(lambda cls: client))
+    cache = RedisResultCache(job_types=[JobType.TEXT_GENERATION], ttl_seconds=60, max_entries=10)
+
+    for _ in range(3):
+        assert asyncio.run(cache.get(JobType.TEXT_GENERATION, {"prompt": "hi"})) is None
+
+    # One NOSCRIPT retry, then the body is never sent again
+    assert len(loaded) == 1 and calls == [next(iter(loaded))] * 4
@@ -0,0 +1,237 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+from pydantic import ValidationError
+
+from src.config.settings import Settings
+from src.domain.entities import JobStatus
+from src.infrastructure.database.mongodb import MongoDB
+from src.infrastructure.database.redis_client import RedisClient
+from src.infrastructure.queue import stale_job_reaper as reaper_module
+from src.infrastructure.queue.stale_job_reaper import StaleJobReaper, plan_reap
+
+NOW = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+CUTOFF = NOW - timedelta(seconds=120)
+
+
+def test_plan_reap_requeues_until_the_limit_then_fails():
+    fresh = {"_id": ObjectId(), "status": "processing"}
+    retried = {"_id": ObjectId(), "status": "processing", "requeue_count": 2}
+
+    operations, requeued, failed = plan_reap([fresh, retried], JobStatus.PROCESSING, CUTOFF, NOW, 2, "stuck")
+
+    assert requeued == [fresh] and failed == [retried]
+    requeue_op, fail_op = (op._doc for op in operations)
+    assert requeue_op["$set"]["status"] == JobStatus.PENDING and requeue_op["$inc"] == {"requeue_count": 1}
+    assert fail_op["$set"]["status"] == JobStatus.FAILED and fail_op["$set"]["error_message"] == "stuck"
+
+
+def test_plan_reap_guards_on_selected_status_and_age():
+    doc = {"_id": ObjectId(), "status": "pending"}
+
+    operations, _, _ = plan_reap([doc], JobStatus.PENDING, CUTOFF, NOW, 2, "stuck")
+
+    assert operations[0]._filter == {"_id": doc["_id"], "status": JobStatus.PENDING, "updated_at": {"$lt": CUTOFF}}
+
+
+class FakeLeaseRedis:
+    """Evaluates the reaper's lease scripts against one key with a millisecond clock"""
+
+    def __init__(self):
+        self.value = None
+        self.expires_at = 0
+        self.now_ms = 0
+
+    def register_script(self, script):
+        async def run(keys=(), args=()):
+            return await self.eval(script, len(keys), *keys, *args)
+        run.registered_client = self
+        return run
+
+    async def eval(self, script, numkeys, key, owner, *args):
+        if self.value is not None and self.now_ms >= self.expires_at:
+            self.value = None
+        if script == reaper_module._RELEASE:
+            if self.value == owner:
+                self.value = None
+                return 1
+            return 0
+        if self.value == owner:
+            self.expires_at = self.now_ms + int(args[0])
+            return 1
+        if self.value is None:
+            self.value, self.expires_at = owner, self.now_ms + int(args[0])
+            return 1
+        return 0
+
+
+def test_lease_is_exclusive_renewed_by_its_holder_and_lost_on_expiry(monkeypatch):
+    redis = FakeLeaseRedis()
+    monkeypatch.setattr(RedisClient, "get_client", classmethod(lambda cls: redis))
+    first, second = (StaleJobReaper(None, interval_seconds=1.0) for _ in range(2))
+
+    async def main():
+        assert await first._acquire_lease()
+        assert not await second._acquire_lease()
+        redis.now_ms = 2500  # within the 3s lease: the holder renews it
+        assert await first._acquire_lease()
+        redis.now_ms = 5000
+        assert not await second._acquire_lease()
+        redis.now_ms = 9000  # holder stalled past its lease: another replica takes over
+        assert await second._acquire_lease()
+        assert not await first._acquire_lease()
+        await first.stop()  # releasing a lease it no longer holds is a no-op
+        assert redis.value == second.instance_id
+
+    asyncio.run(main())
+
+
+def _matches(doc, query):
+    for field, condition in query.items():
+        value = doc.get(field)
+        if isinstance(condition, dict):
+            if "$lt" in condition and not (value is not None and value < condition["$lt"]):
+                return False
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, field, direction):
+        self.docs.sort(key=lambda doc: doc[field], reverse=direction < 0)
+        return self
+
+    def limit(self, count):
+        self.docs = self.docs[:count]
+        return self
+
+    async def to_list(self, length=None):
+        return self.docs
+
+
+class FakeJobsCollection:
+    def __init__(self, docs, before_write=None):
+        self.docs = {doc["_id"]: doc for doc in docs}
+        self.before_write = before_write
+
+    def find(self, query, projection=None):
+        return FakeCursor([dict(doc) for doc in self.docs.values() if _matches(doc, query)])
+
+    async def bulk_write(self, operations, ordered=True):
+        if self.before_write:
+            self.before_write(self)
+        modified = 0
+        for operation in operations:
+            doc = self.docs.get(operation._filter["_id"])
+            if doc is None or not _matches(doc, operation._filter):
+                continue
+            update = operation._doc
+            doc.update(update.get("$set", {}))
+            for field in update.get("$unset", {}):
+                doc.pop(field, None)
+            for field, amount in update.get("$inc", {}).items():
+                doc[field] = doc.get(field, 0) + amount
+            modified += 1
+        return SimpleNamespace(modified_count=modified)
+
+
+class RecordingQueue:
+    def __init__(self):
+        self.enqueued = []
+
+    async def enqueue_jobs(self, jobs):
+        self.enqueued.extend(job_id for job_id, _ in jobs)
+        return [True] * len(jobs)
+
+
+def test_reap_skips_jobs_that_moved_on_and_requeues_and_notifies_the_rest(monkeypatch):
+    old = datetime.now(timezone.utc) - timedelta(hours=1)
+    stuck, finishing, exhausted = (
+        {"_id": ObjectId(), "status": JobStatus.PROCESSING, "updated_at": old, "user_id": "u1",
+         "job_type": "text_generation", "input_data": {}, "requeue_count": count}
+        for count in (0, 0, 2)
+    )
+
+    def worker_completes(collection):
+        # Between the reaper's read and its write the worker finishes one job
+        collection.docs[finishing["_id"]].update(status=JobStatus.COMPLETED, updated_at=datetime.now(timezone.utc))
+
+    collection = FakeJobsCollection([stuck, finishing, exhausted], before_write=worker_completes)
+    monkeypatch.setattr(MongoDB, "get_database", classmethod(lambda cls: SimpleNamespace(jobs=collection)))
+    notified = []
+
+    async def notify_job_status(**kwargs):
+        notified.append((kwargs["job_id"], kwargs["status"]))
+
+    monkeypatch.setattr(reaper_module.SimpleJobNotifier, "notify_job_status", staticmethod(notify_job_status))
+    queue = RecordingQueue()
+    reaper = StaleJobReaper(lambda: queue, processing_timeout_seconds=180)
+
+    totals = asyncio.run(reaper._reap_status(JobStatus.PROCESSING, 180))
+
+    assert totals == (1, 1)
+    assert queue.enqueued == [str(stuck["_id"])]
+    assert sorted(notified) == sorted([(str(stuck["_id"]), "PENDING"), (str(exhausted["_id"]), "FAILED")])
+    assert collection.docs[finishing["_id"]]["status"] == JobStatus.COMPLETED
+    assert collection.docs[stuck["_id"]]["status"] == JobStatus.PENDING
+    assert collection.docs[stuck["_id"]]["requeue_count"] == 1
+
+
+def test_processing_timeout_must_exceed_the_celery_hard_limit():
+    with pytest.raises(ValidationError):
+        Settings(
+            MONGODB_URL="mongodb://localhost", REDIS_URL="redis://localhost", API_PORT=8000,
+            CELERY_TIME_LIMIT=120, PROCESSING_TIMEOUT_SECONDS=120,
+        )
+
+
+def test_pending_job_still_queued_past_the_timeout_is_not_requeued_or_failed(monkeypatch):
+    waiting = {"_id": ObjectId(), "status": JobStatus.PENDING, "updated_at": datetime.now(timezone.utc) - timedelta(hours=1),
+               "user_id": "u1", "job_type": "text_generation", "input_data": {}}
+    collection = FakeJobsCollection([waiting])
+    monkeypatch.setattr(MongoDB, "get_database", classmethod(lambda cls: SimpleNamespace(jobs=collection)))
+
+    async def notify_job_status(**kwargs):
+        pass
+
+    monkeypatch.setattr(reaper_module.SimpleJobNotifier, "notify_job_status", staticmethod(notify_job_status))
+    queue = RecordingQueue()
+    backlog = [40]
+    reaper = StaleJobReaper(lambda: queue, pending_timeout_seconds=300, broker_backlog=lambda: backlog[0])
+
+    async def main():
+        # A backed-up queue (or unknown metrics) defers every pass
+        for depth in (40, 12, None):
+            backlog[0] = depth
+            assert await reaper._reap_status(JobStatus.PENDING, 300) == (0, 0)
+        # Drained but the job is still PENDING: now it is presumed lost, requeued once
+        backlog[0] = 0
+        assert await reaper._reap_status(JobStatus.PENDING, 300) == (1, 0)
+        assert await reaper._reap_status(JobStatus.PENDING, 300) == (0, 0)
+
+    asyncio.run(main())
+
+    assert queue.enqueued == [str(waiting["_id"])]
+    assert collection.docs[waiting["_id"]]["status"] == JobStatus.PENDING
+    assert reaper.pending_deferred == 3
+
+
+def test_broker_backlog_counts_queued_and_prefetched_tasks(monkeypatch):
+    snapshot = {"queued_tasks": 2, "unacked_tasks": 5, "active_tasks": 4, "reserved_tasks": 0, "snapshot_age_seconds": 1.0}
+    monkeypatch.setattr(reaper_module.queue_metrics_collector, "get_snapshot", lambda: snapshot)
+    assert reaper_module._broker_backlog() == 3
+
+    snapshot.update(queued_tasks=0, unacked_tasks=4)
+    assert reaper_module._broker_backlog() == 0
+
+    snapshot["error"] = "redis down"
+    assert reaper_module._broker_backlog() is None
@@ -0,0 +1,68 @@
+import asyncio
+
+from src.infrastructure.events.status_coalescer import StatusCoalescer
+
+
+def _status(job_id, status, n=0):
+    return {"type": "job_status_update", "user_id": "u1", "job_id": job_id, "status": status, "n": n}
+
+
+def _run(window_ms, script):
+    delivered = []
+
+    async def forward(payload):
+        delivered.append((payload["job_id"], payload["status"], payload["n"]))
+
+    async def main():
+        coalescer = StatusCoalescer(forward, window_ms=window_ms)
+        await script(coalescer)
+        coalescer.close()
+        return coalescer
+
+    return asyncio.run(main()), delivered
+
+
+def test_burst_delivers_first_and_latest_per_job():
+    async def script(coalescer):
+        for n in range(50):
+            await coalescer.submit(_status("a", "PROCESSING", n))
+            await coalescer.submit(_status("b", "PROCESSING", n))
+        await asyncio.sleep(0.08)
+
+    coalescer, delivered = _run(50, script)
+
+    assert delivered == [
+        ("a", "PROCESSING", 0), ("b", "PROCESSING", 0),
+        ("a", "PROCESSING", 49), ("b", "PROCESSING", 49),
+    ]
+    assert coalescer.superseded == 96 and coalescer.forwarded == 4
+
+
+def test_terminal_states_are_never_dropped_and_stay_in_order():
+    async def script(coalescer):
+        await coalescer.submit(_status("a", "PROCESSING", 0))
+        await coalescer.submit(_status("a", "PROCESSING", 1))  # held, then superseded by the terminal
+        await coalescer.submit(_status("a", "FAILED", 2))
+        await coalescer.submit(_status("a", "PENDING", 3))  # retry: trails the failure
+        await coalescer.submit(_status("a", "COMPLETED", 4))
+        await coalescer.submit(_status("b", "completed", 5))
+        await asyncio.sleep(0.08)
+
+    _, delivered = _run(50, script)
+
+    assert delivered == [
+        ("a", "PROCESSING", 0),
+        ("a", "FAILED", 2),
+        ("a", "COMPLETED", 4),
+        ("b", "completed", 5),
+    ]
+
+
+def test_zero_window_forwards_everything():
+    async def script(coalescer):
+        for n in range(3):
+            await coalescer.submit(_status("a", "PROCESSING", n))
+
+    _, delivered = _run(0, script)
+
+    assert [n for _, _, n in delivered] == [0, 1, 2]
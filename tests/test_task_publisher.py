@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+
+from src.infrastructure.queue.task_publisher import PublishBufferFull, TaskPublisher
+
+
+class FakeApp:
+    def __init__(self):
+        self.acquired = 0
+
+    @contextmanager
+    def producer_or_acquire(self, producer=None):
+        self.acquired += 1
+        yield object()
+
+
+class FakeResult:
+    def __init__(self, task_id):
+        self.id = task_id
+
+
+class FakeTask:
+    def __init__(self, delay=0.0, fail_on=None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.calls = []
+        self.threads = set()
+
+    def apply_async(self, args, producer=None, **options):
+        self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        if args[0] == self.fail_on:
+            raise ConnectionError("broker down")
+        self.calls.append(args)
+        return FakeResult(f"task-{args[0]}")
+
+
+def test_publish_runs_off_the_event_loop_and_batches():
+    app = FakeApp()
+    task = FakeTask(delay=0.01)
+    publisher = TaskPublisher(app, max_buffer=100, max_batch=50, workers=1)
+
+    async def run():
+        loop_thread = threading.get_ident()
+        ids = await asyncio.gather(*(publisher.publish(task, (n,)) for n in range(20)))
+        await publisher.stop()
+        return loop_thread, ids
+
+    loop_thread, ids = asyncio.run(run())
+    assert ids == [f"task-{n}" for n in range(20)]
+    assert loop_thread not in task.threads
+    # The first request is published alone, the rest share one pooled producer
+    assert app.acquired < 20
+    assert publisher.stats()["published"] == 20
+
+
+def test_publish_failure_is_raised_to_the_caller():
+    publisher = TaskPublisher(FakeApp(), workers=1)
+    task = FakeTask(fail_on=2)
+
+    async def run():
+        results = await publisher.publish_many([(task, (n,), {}) for n in range(3)])
+        await publisher.stop()
+        return results
+
+    results = asyncio.run(run())
+    assert results[:2] == ["task-0", "task-1"]
+    assert isinstance(results[2], ConnectionError)
+
+
+def test_full_buffer_rejects_immediately():
+    publisher = TaskPublisher(FakeApp(), max_buffer=2, workers=1)
+    task = FakeTask()
+
+    async def run():
+        with pytest.raises(PublishBufferFull):
+            await publisher.publish_many([(task, (n,), {}) for n in range(3)])
+        await publisher.stop()
+
+    asyncio.run(run())
+    assert publisher.stats()["rejected"] == 3
+
+
+def test_timed_out_request_is_withdrawn_before_it_is_published():
+    publisher = TaskPublisher(FakeApp(), workers=1)
+    task = FakeTask(delay=0.1)
+
+    async def run():
+        first = asyncio.create_task(publisher.publish(task, (0,)))
+        await asyncio.sleep(0.01)  # job 0 is with the publisher thread, job 1 waits in the buffer
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(publisher.publish(task, (1,)), timeout=0.02)
+        await first
+        await publisher.stop()
+
+    asyncio.run(run())
+    assert task.calls == [(0,)]
+    assert publisher.stats()["withdrawn"] == 1
@@ -0,0 +1,59 @@
+import time
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from src.presentation.websocket import websocket_routes
+from src.presentation.websocket.websocket_routes import router as websocket_router
+
+
+@pytest.fixture
+def client(monkeypatch):
+    calls = []
+
+    async def fake_authenticate(token):
+        calls.append(token)
+        if token == "good":
+            return {"user_id": "user1", "exp": time.time() + 60}
+        if token == "expiring":
+            return {"user_id": "user1", "exp": time.time() + 0.2}
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    monkeypatch.setattr(websocket_routes, "authenticate_token", fake_authenticate)
+    app = FastAPI()
+    app.include_router(websocket_router)
+    test_client = TestClient(app)
+    test_client.auth_calls = calls
+    return test_client
+
+
+def test_valid_token_connects_and_verifies_once(client):
+    with client.websocket_connect("/ws/user1?token=good") as ws:
+        assert ws.receive_json()["type"] == "connection"
+        ws.send_json({"type": "ping", "timestamp": 1})
+        assert ws.receive_json() == {"type": "pong", "timestamp": 1}
+    assert client.auth_calls == ["good"]
+
+
+def test_invalid_token_is_rejected(client):
+    with pytest.raises(WebSocketDisconnect) as exc:
+        with client.websocket_connect("/ws/user1?token=bad") as ws:
+            ws.receive_json()
+    assert exc.value.code == 1008
+
+
+def test_path_user_must_match_token_subject(client):
+    with pytest.raises(WebSocketDisconnect) as exc:
+        with client.websocket_connect("/ws/someone-else?token=good") as ws:
+            ws.receive_json()
+    assert exc.value.code == 1008
+
+
+def test_socket_closed_when_token_expires(client):
+    with client.websocket_connect("/ws/user1?token=expiring") as ws:
+        assert ws.receive_json()["type"] == "connection"
+        message = ws.receive()
+        assert message["type"] == "websocket.close"
+        assert message["code"] == 1008
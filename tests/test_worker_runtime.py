@@ -0,0 +1,143 @@
+import asyncio
+import signal
+import threading
+import time
+
+import pytest
+from celery.exceptions import SoftTimeLimitExceeded
+from pydantic import ValidationError
+
+from src.config.settings import Settings
+
+from src.infrastructure.queue import worker_runtime as runtime_module
+from src.infrastructure.queue.worker_runtime import WorkerRuntime
+
+
+@pytest.fixture
+def runtime(monkeypatch):
+    connects = []
+
+    async def fake_connect(url, name):
+        connects.append(id(asyncio.get_running_loop()))
+
+    async def fake_close():
+        pass
+
+    monkeypatch.setattr(runtime_module.MongoDB, "connect_to_mongo", fake_connect)
+    monkeypatch.setattr(runtime_module.MongoDB, "close_mongo_connection", fake_close)
+    rt = WorkerRuntime()
+    rt.connects = connects
+    yield rt
+    rt.shutdown()
+
+
+def test_tasks_share_one_loop_and_one_connection(runtime):
+    async def current_loop():
+        return id(asyncio.get_running_loop())
+
+    first = runtime.run(current_loop())
+    second = runtime.run(current_loop())
+
+    assert first == second
+    assert runtime.connects == [first]
+
+
+def test_interrupted_task_is_cancelled_before_next_task(runtime):
+    """Celery raises SoftTimeLimitExceeded from a signal handler while the loop waits."""
+    state = {"resumed": False}
+
+    class SoftLimit(Exception):
+        pass
+
+    def on_alarm(signum, frame):
+        raise SoftLimit()
+
+    async def slow():
+        await asyncio.sleep(0.2)
+        state["resumed"] = True
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    try:
+        signal.setitimer(signal.ITIMER_REAL, 0.05)
+        with pytest.raises(SoftLimit):
+            runtime.run(slow())
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+    runtime.run(asyncio.sleep(0.3))
+    assert state["resumed"] is False
+
+
+@pytest.fixture
+def threaded_runtime(monkeypatch):
+    async def noop(*args):
+        pass
+
+    monkeypatch.setattr(runtime_module.MongoDB, "connect_to_mongo", noop)
+    monkeypatch.setattr(runtime_module.MongoDB, "close_mongo_connection", noop)
+    rt = WorkerRuntime(threaded=True, job_type_limits={"image_generation": 2})
+    yield rt
+    rt.shutdown()
+
+
+def _run_in_slots(runtime, count, make_coro, **kwargs):
+    results = [None] * count
+
+    def slot(i):
+        try:
+            results[i] = runtime.run(make_coro(i), **kwargs)
+        except BaseException as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=slot, args=(i,)) for i in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_async_mode_runs_jobs_concurrently_on_one_loop(threaded_runtime):
+    loops = set()
+
+    async def job(i):
+        loops.add(id(asyncio.get_running_loop()))
+        await asyncio.sleep(0.2)
+        return i
+
+    started = time.perf_counter()
+    results = _run_in_slots(threaded_runtime, 20, job)
+    elapsed = time.perf_counter() - started
+
+    assert results == list(range(20))
+    assert len(loops) == 1
+    assert elapsed < 1.0  # 20 x 0.2s sequentially would take 4s
+
+
+def test_async_mode_enforces_job_type_limits(threaded_runtime):
+    state = {"running": 0, "peak": 0}
+
+    async def job(i):
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(0.05)
+        state["running"] -= 1
+
+    _run_in_slots(threaded_runtime, 8, job, job_type="image_generation")
+    assert state["peak"] == 2
+
+
+def test_async_mode_soft_time_limit(threaded_runtime):
+    async def job(i):
+        await asyncio.sleep(5)
+
+    results = _run_in_slots(threaded_runtime, 1, job, timeout=0.05)
+    assert isinstance(results[0], SoftTimeLimitExceeded)
+
+
+def test_unknown_worker_mode_is_rejected():
+    base = dict(MONGODB_URL="mongodb://localhost", REDIS_URL="redis://localhost", API_PORT=8000)
+    assert Settings(**base, WORKER_MODE="async").worker_mode == "async"
+    with pytest.raises(ValidationError):
+        Settings(**base, WORKER_MODE="asycn")